@@ -0,0 +1,25 @@
+"""Add data_version to user table
+
+Revision ID: 3f8c2d1e7a90
+Revises: 26a9b61b4500
+Create Date: 2026-10-19 09:12:41.512034
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8c2d1e7a90'
+down_revision = '26a9b61b4500'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'data_version')
@@ -0,0 +1,25 @@
+"""Add composite index for subscription renewals
+
+Revision ID: 8d41b7c03e52
+Revises: 3f8c2d1e7a90
+Create Date: 2026-10-19 10:02:17.208811
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b7c03e52'
+down_revision = '3f8c2d1e7a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_subscription_status_next_payment_date', 'subscription', ['status', 'next_payment_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_subscription_status_next_payment_date', table_name='subscription')
@@ -0,0 +1,46 @@
+"""Add deletion_job table
+
+Revision ID: b6f4c8e2d931
+Revises: a9d2e6f1c474
+Create Date: 2026-10-19 17:34:12.905318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f4c8e2d931'
+down_revision = 'a9d2e6f1c474'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('deletion_job',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('target_type', sa.Enum('ACCOUNT', 'USER', name='deletiontarget'), nullable=False),
+    sa.Column('target_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='deletionjobstatus'), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=True),
+    sa.Column('deleted_rows', sa.Integer(), nullable=False),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('requested_by', sa.Uuid(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deletion_job_requested_by'), 'deletion_job', ['requested_by'], unique=False)
+    op.create_index(op.f('ix_deletion_job_status'), 'deletion_job', ['status'], unique=False)
+    op.create_index(op.f('ix_deletion_job_target_id'), 'deletion_job', ['target_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_deletion_job_target_id'), table_name='deletion_job')
+    op.drop_index(op.f('ix_deletion_job_status'), table_name='deletion_job')
+    op.drop_index(op.f('ix_deletion_job_requested_by'), table_name='deletion_job')
+    op.drop_table('deletion_job')
+    sa.Enum(name='deletionjobstatus').drop(op.get_bind(), checkfirst=False)
+    sa.Enum(name='deletiontarget').drop(op.get_bind(), checkfirst=False)
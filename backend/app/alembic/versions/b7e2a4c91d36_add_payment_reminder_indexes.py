@@ -0,0 +1,34 @@
+"""Add reminder_at to subscription and payment reminder indexes
+
+Revision ID: b7e2a4c91d36
+Revises: 8d41b7c03e52
+Create Date: 2026-10-19 11:24:05.531907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2a4c91d36'
+down_revision = '8d41b7c03e52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('subscription', sa.Column(
+        'reminder_at',
+        sa.Date(),
+        sa.Computed('next_payment_date - COALESCE(reminder_days, 0)', persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_subscription_status_reminder_at', 'subscription', ['status', 'reminder_at'], unique=False)
+    op.create_index('ix_debt_unpaid_due_date', 'debt', ['due_date'], unique=False, postgresql_where=sa.text('NOT is_paid'))
+
+
+def downgrade():
+    op.drop_index('ix_debt_unpaid_due_date', table_name='debt', postgresql_where=sa.text('NOT is_paid'))
+    op.drop_index('ix_subscription_status_reminder_at', table_name='subscription')
+    op.drop_column('subscription', 'reminder_at')
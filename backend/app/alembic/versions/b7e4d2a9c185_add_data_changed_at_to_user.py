@@ -0,0 +1,24 @@
+"""Add data_changed_at to user table
+
+Revision ID: b7e4d2a9c185
+Revises: e5a1c7d94f3b
+Create Date: 2026-10-21 10:04:18.230917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d2a9c185'
+down_revision = 'e5a1c7d94f3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('data_changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('user', 'data_changed_at')
@@ -0,0 +1,27 @@
+"""Add subscription billing_day
+
+Revision ID: c4e7a9b2d158
+Revises: b6f4c8e2d931
+Create Date: 2026-10-20 09:12:37.104826
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a9b2d158'
+down_revision = 'b6f4c8e2d931'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('subscription', sa.Column('billing_day', sa.Integer(), nullable=True))
+    # Best guess for existing rows: a date already clamped (Feb 29 for the 31st)
+    # keeps its clamped day, as it did before
+    op.execute("UPDATE subscription SET billing_day = EXTRACT(DAY FROM next_payment_date)")
+
+
+def downgrade():
+    op.drop_column('subscription', 'billing_day')
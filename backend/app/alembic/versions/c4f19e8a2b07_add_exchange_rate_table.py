@@ -0,0 +1,39 @@
+"""Add exchange_rate table
+
+Revision ID: c4f19e8a2b07
+Revises: b7e2a4c91d36
+Create Date: 2026-10-19 12:41:33.096214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f19e8a2b07'
+down_revision = 'b7e2a4c91d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('exchange_rate',
+    sa.Column('rate', sa.Float(), nullable=False),
+    sa.Column('rate_date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('base_currency_id', sa.Uuid(), nullable=False),
+    sa.Column('quote_currency_id', sa.Uuid(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['base_currency_id'], ['currency.id'], ),
+    sa.ForeignKeyConstraint(['quote_currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('base_currency_id', 'quote_currency_id', 'rate_date', name='uq_exchange_rate_pair_date')
+    )
+    op.create_index(op.f('ix_exchange_rate_id'), 'exchange_rate', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_exchange_rate_id'), table_name='exchange_rate')
+    op.drop_table('exchange_rate')
@@ -0,0 +1,36 @@
+"""Add transaction description search column and indexes
+
+Revision ID: d5a7c3e9f214
+Revises: c4f19e8a2b07
+Create Date: 2026-10-19 12:38:52.614307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a7c3e9f214'
+down_revision = 'c4f19e8a2b07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('transaction', sa.Column(
+        'description_search',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(description, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_transaction_description_search', 'transaction', ['description_search'], unique=False, postgresql_using='gin')
+    op.create_index('ix_transaction_description_trgm', 'transaction', ['description'], unique=False, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_transaction_description_trgm', table_name='transaction', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+    op.drop_index('ix_transaction_description_search', table_name='transaction', postgresql_using='gin')
+    op.drop_column('transaction', 'description_search')
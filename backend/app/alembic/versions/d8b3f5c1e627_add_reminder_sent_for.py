@@ -0,0 +1,40 @@
+"""Add reminder_sent_for to subscription and debt
+
+Revision ID: d8b3f5c1e627
+Revises: c4e7a9b2d158
+Create Date: 2026-10-20 10:41:05.288913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f5c1e627'
+down_revision = 'c4e7a9b2d158'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('subscription', sa.Column('reminder_sent_for', sa.Date(), nullable=True))
+    op.add_column('debt', sa.Column('reminder_sent_for', sa.Date(), nullable=True))
+    # The job used to send the reminders due today, assume those already went out
+    op.execute(
+        "UPDATE subscription SET reminder_sent_for = next_payment_date "
+        "WHERE reminder_at <= CURRENT_DATE AND next_payment_date >= CURRENT_DATE"
+    )
+    # Debt reminders went out DEBT_REMINDER_DAYS ahead of the due date
+    op.execute(
+        sa.text(
+            "UPDATE debt SET reminder_sent_for = due_date "
+            "WHERE NOT is_paid AND due_date BETWEEN CURRENT_DATE AND CURRENT_DATE + :days"
+        ).bindparams(days=settings.DEBT_REMINDER_DAYS)
+    )
+
+
+def downgrade():
+    op.drop_column('debt', 'reminder_sent_for')
+    op.drop_column('subscription', 'reminder_sent_for')
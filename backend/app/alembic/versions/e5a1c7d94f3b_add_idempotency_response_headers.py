@@ -0,0 +1,24 @@
+"""Add response_headers to idempotency_key
+
+Revision ID: e5a1c7d94f3b
+Revises: d8b3f5c1e627
+Create Date: 2026-10-20 14:12:37.520194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1c7d94f3b'
+down_revision = 'd8b3f5c1e627'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('idempotency_key', sa.Column('response_headers', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('idempotency_key', 'response_headers')
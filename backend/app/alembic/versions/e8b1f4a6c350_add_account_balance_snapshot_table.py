@@ -0,0 +1,38 @@
+"""Add account_balance_snapshot table
+
+Revision ID: e8b1f4a6c350
+Revises: d5a7c3e9f214
+Create Date: 2026-10-19 13:02:17.441086
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b1f4a6c350'
+down_revision = 'd5a7c3e9f214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('account_balance_snapshot',
+    sa.Column('account_id', sa.Uuid(), nullable=False),
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'snapshot_date')
+    )
+    op.create_index(op.f('ix_account_balance_snapshot_user_id'), 'account_balance_snapshot', ['user_id'], unique=False)
+    op.create_index('ix_transaction_account_id_date', 'transaction', ['account_id', 'date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_transaction_account_id_date', table_name='transaction')
+    op.drop_index(op.f('ix_account_balance_snapshot_user_id'), table_name='account_balance_snapshot')
+    op.drop_table('account_balance_snapshot')
@@ -0,0 +1,144 @@
+"""Partition the transaction table by date, one partition per year
+
+Revision ID: f3c8a1d7b962
+Revises: e8b1f4a6c350
+Create Date: 2026-10-19 14:21:06.183552
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8a1d7b962'
+down_revision = 'e8b1f4a6c350'
+branch_labels = None
+depends_on = None
+
+# Older transactions stay in the default partition, until the maintenance job
+# (app/maintain_partitions.py) gives their years a partition of their own
+OLDEST_PARTITION_YEARS = 10
+
+COLUMNS = (
+    'date', 'amount', 'description', 'is_active', 'created_at', 'updated_at', 'user_id',
+    'category_id', 'payment_method_id', 'currency_id', 'account_id', 'subscription_id',
+    'financial_goal_id', 'debt_id', 'transaction_type', 'id',
+)
+BTREE_INDEXES = (
+    ('ix_transaction_account_id', ['account_id']),
+    ('ix_transaction_account_id_date', ['account_id', 'date']),
+    ('ix_transaction_category_id', ['category_id']),
+    ('ix_transaction_currency_id', ['currency_id']),
+    ('ix_transaction_date', ['date']),
+    ('ix_transaction_debt_id', ['debt_id']),
+    ('ix_transaction_financial_goal_id', ['financial_goal_id']),
+    ('ix_transaction_id', ['id']),
+    ('ix_transaction_payment_method_id', ['payment_method_id']),
+    ('ix_transaction_subscription_id', ['subscription_id']),
+    ('ix_transaction_transaction_type', ['transaction_type']),
+    ('ix_transaction_user_id', ['user_id']),
+)
+
+
+def _columns():
+    return [
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('category_id', sa.Uuid(), nullable=False),
+        sa.Column('payment_method_id', sa.Uuid(), nullable=False),
+        sa.Column('currency_id', sa.Uuid(), nullable=False),
+        sa.Column('account_id', sa.Uuid(), nullable=True),
+        sa.Column('subscription_id', sa.Uuid(), nullable=True),
+        sa.Column('financial_goal_id', sa.Uuid(), nullable=True),
+        sa.Column('debt_id', sa.Uuid(), nullable=True),
+        sa.Column('transaction_type', sa.String(length=50), nullable=True),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column(
+            'description_search',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', coalesce(description, ''))", persisted=True),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+        sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+        sa.ForeignKeyConstraint(['debt_id'], ['debt.id'], ),
+        sa.ForeignKeyConstraint(['financial_goal_id'], ['financial_goal.id'], ),
+        sa.ForeignKeyConstraint(['payment_method_id'], ['payment_method.id'], ),
+        sa.ForeignKeyConstraint(['subscription_id'], ['subscription.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    ]
+
+
+def _drop_indexes(table_name):
+    for name, _ in BTREE_INDEXES:
+        op.drop_index(name, table_name=table_name)
+    op.drop_index('ix_transaction_description_search', table_name=table_name, postgresql_using='gin')
+    op.drop_index('ix_transaction_description_trgm', table_name=table_name, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def _create_indexes():
+    for name, columns in BTREE_INDEXES:
+        op.create_index(name, 'transaction', columns, unique=False)
+    op.create_index('ix_transaction_description_search', 'transaction', ['description_search'], unique=False, postgresql_using='gin')
+    op.create_index('ix_transaction_description_trgm', 'transaction', ['description'], unique=False, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def _copy_rows(source):
+    columns = ', '.join(f'"{column}"' for column in COLUMNS)
+    op.execute(f'INSERT INTO "transaction" ({columns}) SELECT {columns} FROM {source}')
+
+
+def upgrade():
+    op.rename_table('transaction', 'transaction_unpartitioned')
+    op.execute('ALTER TABLE transaction_unpartitioned RENAME CONSTRAINT transaction_pkey TO transaction_unpartitioned_pkey')
+    _drop_indexes('transaction_unpartitioned')
+
+    # The partition key has to be part of the primary key
+    op.create_table('transaction',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'date', name='transaction_pkey'),
+    postgresql_partition_by='RANGE (date)',
+    )
+
+    # A partition per year from the oldest transaction through next year; later
+    # years are created ahead of time by crud.partition.ensure_transaction_partitions
+    this_year = date.today().year
+    oldest_year = op.get_bind().execute(
+        sa.text('SELECT extract(year FROM min(date)) FROM transaction_unpartitioned')
+    ).scalar()
+    first_year = max(int(oldest_year or this_year), this_year - OLDEST_PARTITION_YEARS)
+    for year in range(first_year, this_year + 2):
+        op.execute(
+            f'CREATE TABLE transaction_y{year} PARTITION OF "transaction" '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute('CREATE TABLE transaction_default PARTITION OF "transaction" DEFAULT')
+
+    _copy_rows('transaction_unpartitioned')
+    op.drop_table('transaction_unpartitioned')
+    _create_indexes()
+
+
+def downgrade():
+    op.rename_table('transaction', 'transaction_partitioned')
+    op.execute('ALTER TABLE transaction_partitioned RENAME CONSTRAINT transaction_pkey TO transaction_partitioned_pkey')
+    _drop_indexes('transaction_partitioned')
+
+    op.create_table('transaction',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', name='transaction_pkey'),
+    )
+    _copy_rows('transaction_partitioned')
+    # Drops the partitions with it
+    op.drop_table('transaction_partitioned')
+    _create_indexes()
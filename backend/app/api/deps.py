@@ -1,18 +1,19 @@
+import datetime
+import uuid
 from collections.abc import Generator
-from typing import Annotated
+from typing import Annotated, Optional
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jwt.exceptions import InvalidTokenError
-from pydantic import ValidationError
 from sqlmodel import Session
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import engine, replica_engine
+from app.core.read_routing import reads_from_replica
+from app.models.enums import TransactionType
 from app.models.user import User
-from app.schemas.user import TokenPayload
+from app.schemas.transaction import TransactionFilters
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -29,30 +30,88 @@ TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
 def get_current_user(session: SessionDep, token: TokenDep) -> User:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+    user = security.user_from_token(session, token)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+def get_read_db(
+    request: Request, session: SessionDep, current_user: CurrentUser
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: on the replica when one is configured and the
+    user has not written recently (see app.core.read_routing), else on the primary.
+    """
+    if replica_engine is None or not reads_from_replica(
+        request.method, current_user.data_changed_at, request.cookies
+    ):
+        yield session
+        return
+    # The primary only authenticated the user; give its connection back to the pool
+    session.close()
+    with Session(replica_engine) as replica_session:
+        yield replica_session
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_db)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def get_transaction_filters(
+    transaction_type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
+    date_from: Optional[datetime.date] = Query(None, description="First day, inclusive"),
+    date_to: Optional[datetime.date] = Query(None, description="Last day, inclusive"),
+    amount_min: Optional[float] = Query(None, ge=0, description="Minimum amount, inclusive"),
+    amount_max: Optional[float] = Query(None, ge=0, description="Maximum amount, inclusive"),
+    category_id: list[uuid.UUID] = Query([], description="Category IDs, repeat for several"),
+    category_name: Optional[str] = Query(None, description="Filter by category name"),
+    account_id: list[uuid.UUID] = Query([], description="Account IDs, repeat for several"),
+    payment_method_id: list[uuid.UUID] = Query([], description="Payment method IDs, repeat for several"),
+    debt_id: Optional[uuid.UUID] = Query(None, description="Payments of a debt"),
+    subscription_id: Optional[uuid.UUID] = Query(None, description="Charges of a subscription"),
+    financial_goal_id: Optional[uuid.UUID] = Query(None, description="Savings of a financial goal"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    search: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Text to find in descriptions, also matching partial words and typos; best matches first",
+    ),
+) -> TransactionFilters:
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        raise HTTPException(status_code=400, detail="amount_min must not be greater than amount_max")
+    return TransactionFilters(
+        transaction_type=transaction_type,
+        date_from=date_from,
+        date_to=date_to,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        category_ids=category_id,
+        category_name=category_name,
+        account_ids=account_id,
+        payment_method_ids=payment_method_id,
+        debt_id=debt_id,
+        subscription_id=subscription_id,
+        financial_goal_id=financial_goal_id,
+        is_active=is_active,
+        search=search,
+    )
+
+
+TransactionFiltersDep = Annotated[TransactionFilters, Depends(get_transaction_filters)]
@@ -6,6 +6,7 @@ from app.api.routes import (
     users,
     utils,
     currencies,
+    exchange_rates,
     payment_methods,
     categories,
     transactions,
@@ -14,7 +15,8 @@ from app.api.routes import (
     debts,
     accounts,
     budgets,
-    file_upload
+    file_upload,
+    deletion_jobs
 )
 from app.core.config import settings
 
@@ -23,6 +25,7 @@ api_router.include_router(login.router)
 api_router.include_router(users.router)
 api_router.include_router(utils.router)
 api_router.include_router(currencies.router)
+api_router.include_router(exchange_rates.router)
 api_router.include_router(payment_methods.router)
 api_router.include_router(categories.router)
 api_router.include_router(transactions.router)
@@ -32,6 +35,7 @@ api_router.include_router(debts.router)
 api_router.include_router(accounts.router)
 api_router.include_router(budgets.router, prefix="/budgets", tags=["budgets"])
 api_router.include_router(file_upload.router)
+api_router.include_router(deletion_jobs.router)
 
 
 if settings.ENVIRONMENT == "local":
@@ -0,0 +1,116 @@
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(response_type)
+
+
+def model_response(response_type: Any, content: Any, status_code: int = 200) -> Response:
+    """
+    Serialize `content` as `response_type` straight to JSON bytes.
+
+    FastAPI handles a returned object by dumping it to a dict, validating it against
+    the route's response_model, turning it into JSON-compatible Python values and
+    only then encoding it. Returning this Response skips all of that: the content is
+    validated once (ORM objects are read through their attributes; instances of
+    `response_type` are not validated again) and encoded by pydantic-core in one
+    pass. Keep response_model on the route for the OpenAPI schema.
+    """
+    adapter = _adapter(response_type)
+    value = adapter.validate_python(content, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(value),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """Item fields asked for with `?fields=`, and the model attributes they are built from."""
+
+    # Requested fields in the order of the response schema, id included
+    fields: tuple[str, ...]
+    # Requested fields the route computes instead of reading them from the model
+    derived: frozenset[str]
+    # Model attributes to load, to pass to the crud functions
+    load: frozenset[str]
+
+    def wants(self, *names: str) -> bool:
+        return any(name in self.fields for name in names)
+
+    def pick(self, obj: Any) -> dict[str, Any]:
+        """Requested attributes of `obj`, leaving the derived fields to the caller."""
+        return {name: getattr(obj, name) for name in self.fields if name not in self.derived}
+
+
+def sparse_fields(
+    schema: type[BaseModel], derived: Mapping[str, tuple[str, ...]] | None = None
+) -> Callable[..., Optional[Fieldset]]:
+    """
+    Dependency parsing the `fields` query parameter of a list route returning `schema` items.
+
+    `derived` maps the fields that are not model attributes to the attributes they
+    are computed from ({"progress_percentage": ("target_amount", "current_amount")}).
+    The dependency returns None when the parameter is absent, so the route keeps its
+    full response, and answers 400 for fields the schema does not have.
+    """
+    available = tuple(schema.model_fields)
+    derived = dict(derived or {})
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated fields of each item to return (id is always included): {', '.join(available)}",
+        ),
+    ) -> Optional[Fieldset]:
+        requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+        if not requested:
+            return None
+        unknown = sorted(requested - set(available))
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(available)}",
+            )
+        selected = tuple(name for name in available if name in requested or name == "id")
+        load = {attribute for name in selected for attribute in derived.get(name, (name,))}
+        return Fieldset(
+            fields=selected,
+            derived=frozenset(name for name in selected if name in derived),
+            load=frozenset(load),
+        )
+
+    return dependency
+
+
+# Field subsets are chosen by clients, so only the most used models are kept
+SPARSE_MODELS_CACHED = 256
+
+
+@lru_cache(maxsize=SPARSE_MODELS_CACHED)
+def sparse_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """`schema` restricted to `fields`, with their types, defaults and validation."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True, arbitrary_types_allowed=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=SPARSE_MODELS_CACHED)
+def sparse_page_model(page_schema: type[BaseModel], item_model: type[BaseModel]) -> type[BaseModel]:
+    """Paginated `page_schema` whose items are `item_model` (see sparse_model)."""
+    return create_model(
+        f"{page_schema.__name__}{item_model.__name__}",
+        __base__=page_schema,
+        items=(list[item_model], ...),
+    )
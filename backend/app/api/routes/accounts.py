@@ -1,9 +1,12 @@
-from typing import Any, Sequence, List, Dict
+from typing import Any, Sequence, List, Dict, Optional
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlmodel import Session
 
 from app.api import deps
+from app.api.responses import Fieldset, model_response, sparse_fields, sparse_model
+from app.api.routes.deletion_jobs import run_deletion_job_in_background
 from app.models.user import User
 from app.schemas.account import (
     AccountCreate,
@@ -12,7 +15,8 @@ from app.schemas.account import (
     AccountReadWithDetails,
     AccountTypeResponse
 )
-from app.schemas.user import Message
+from app.schemas.balance_snapshot import AccountBalanceHistory
+from app.schemas.deletion_job import DeletionJobRead
 from app.services.account_service import AccountService
 
 router = APIRouter(
@@ -21,6 +25,8 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+account_fields = sparse_fields(AccountRead)
+
 # IMPORTANTE: Definir las rutas específicas ANTES de las rutas con parámetros dinámicos
 @router.get("/types", response_model=List[AccountTypeResponse])
 def get_account_types() -> List[AccountTypeResponse]:
@@ -34,11 +40,19 @@ def get_account_types() -> List[AccountTypeResponse]:
 def get_accounts(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    fieldset: Optional[Fieldset] = Depends(account_fields),
 ) -> Any:
     """
-    Retrieve accounts for the current user.
+    Retrieve accounts for the current user, limited to `fields` when given.
     """
-    return AccountService.get_accounts(db=db, user_id=current_user.id)
+    if fieldset:
+        accounts = AccountService.get_accounts(
+            db=db, user_id=current_user.id, fields=fieldset.load
+        )
+        return model_response(list[sparse_model(AccountRead, fieldset.fields)], accounts)
+    return model_response(
+        list[AccountRead], AccountService.get_accounts(db=db, user_id=current_user.id)
+    )
 
 
 @router.post("/", response_model=AccountRead, status_code=status.HTTP_201_CREATED)
@@ -84,6 +98,41 @@ def get_account(
     return account_with_details
 
 
+@router.get("/{account_id}/balance-history", response_model=AccountBalanceHistory)
+def get_account_balance_history(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+    account_id: uuid.UUID,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Any:
+    """
+    Get the end-of-day balance of an account for each day of a date range
+    (the last 90 days by default).
+    """
+    try:
+        history = AccountService.get_balance_history(
+            db=db,
+            account_id=account_id,
+            user_id=current_user.id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    if not history:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Account not found or permission denied"
+        )
+    
+    return model_response(AccountBalanceHistory, history)
+
+
 @router.patch("/{account_id}", response_model=AccountRead)
 def update_account(
     *,
@@ -114,25 +163,32 @@ def update_account(
         )
 
 
-@router.delete("/{account_id}", response_model=Message)
+@router.delete(
+    "/{account_id}", response_model=DeletionJobRead, status_code=status.HTTP_202_ACCEPTED
+)
 def delete_account(
     *,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
     account_id: uuid.UUID,
-) -> Message:
+    background_tasks: BackgroundTasks,
+) -> DeletionJobRead:
     """
     Delete an account.
+
+    The account and its transactions, debts and subscriptions are deleted in the
+    background; follow the progress at /deletion-jobs/{job_id}.
     """
-    success = AccountService.delete_account(
+    job = AccountService.delete_account(
         db=db, account_id=account_id, user_id=current_user.id
     )
     
-    if not success:
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Account not found or permission denied"
         )
     
-    return Message(message="Account successfully deleted")
+    background_tasks.add_task(run_deletion_job_in_background, job.id)
+    return job
 
@@ -6,13 +6,33 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlmodel import Session
 
 from app import crud, schemas
-from app.api.deps import SessionDep
+from app.api.deps import ReadSessionDep, SessionDep
 from app.api import deps
+from app.api.responses import (
+    Fieldset,
+    model_response,
+    sparse_fields,
+    sparse_model,
+    sparse_page_model,
+)
 from app.models import User
 from app.schemas.budget import PaginatedBudgetResponse
 
 router = APIRouter()
 
+PROGRESS_FIELDS = (
+    "spent_amount", "remaining_amount", "progress_percentage", "currency_symbol", "currency_code"
+)
+budget_fields = sparse_fields(
+    schemas.BudgetReadWithDetails,
+    # The progress is computed from the budget row fetched by get_budget_progress
+    derived={
+        **{name: () for name in PROGRESS_FIELDS},
+        "category_name": ("category",),
+        "user": (),
+    },
+)
+
 
 @router.post("/", response_model=schemas.BudgetRead)
 def create_budget(
@@ -33,15 +53,17 @@ def create_budget(
 @router.get("/", response_model=PaginatedBudgetResponse)
 def read_budgets(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: User = Depends(deps.get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     year: Optional[int] = Query(None, description="Year (defaults to current year)"),
     month: Optional[int] = Query(None, description="Month (defaults to current month)"),
+    fieldset: Optional[Fieldset] = Depends(budget_fields),
 ) -> Any:
     """
     Retrieve budgets with their progress information and overall budget summary.
+    With `fields`, the progress is only computed when one of its fields is requested.
     """
     skip = (page - 1) * page_size
     
@@ -52,7 +74,11 @@ def read_budgets(
     
     # Get budgets with pagination
     budgets = crud.get_budgets(
-        session=session, user_id=current_user.id, skip=skip, limit=page_size
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=page_size,
+        fields=fieldset.load if fieldset else None,
     )
     
     # Get total count for pagination
@@ -66,6 +92,40 @@ def read_budgets(
         month=month
     )
     
+    # Calculate total pages
+    total_pages = (total + page_size - 1) // page_size
+    
+    if fieldset:
+        items = []
+        for budget in budgets:
+            item = fieldset.pick(budget)
+            if fieldset.wants(*PROGRESS_FIELDS):
+                progress = crud.get_budget_progress(
+                    session=session,
+                    budget_id=budget.id,
+                    user_id=current_user.id,
+                    year=year,
+                    month=month
+                )
+                item.update({name: progress[name] for name in PROGRESS_FIELDS if fieldset.wants(name)})
+            if fieldset.wants("category_name") and budget.category:
+                item["category_name"] = budget.category.name
+            if fieldset.wants("user"):
+                item["user"] = current_user.model_dump()
+            items.append(item)
+        item_model = sparse_model(schemas.BudgetReadWithDetails, fieldset.fields)
+        return model_response(
+            sparse_page_model(PaginatedBudgetResponse, item_model),
+            {
+                "items": items,
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": total_pages,
+                "summary": summary,
+            },
+        )
+    
     budget_items = []
     for budget in budgets:
         # Get budget progress
@@ -97,23 +157,23 @@ def read_budgets(
         budget_item = schemas.BudgetReadWithDetails.model_validate(budget_dict)
         budget_items.append(budget_item)
     
-    # Calculate total pages
-    total_pages = (total + page_size - 1) // page_size
-    
-    return PaginatedBudgetResponse(
-        items=budget_items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        summary=summary
+    return model_response(
+        PaginatedBudgetResponse,
+        PaginatedBudgetResponse(
+            items=budget_items,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            summary=summary
+        ),
     )
 
 
 @router.get("/progress", response_model=Dict[str, Any])
 def read_budgets_progress(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: User = Depends(deps.get_current_user),
     year: Optional[int] = Query(None, description="Year (defaults to current year)"),
     month: Optional[int] = Query(None, description="Month (defaults to current month)"),
@@ -1,19 +1,31 @@
 import uuid
-from typing import Any, Sequence
+from typing import Any, List, Optional, Sequence
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.crud import debt as crud_debt
 from app.api.deps import SessionDep, CurrentUser
+from app.api.responses import Fieldset, model_response, sparse_fields, sparse_model
 from app.models.debt import Debt
+from app.models.enums import DebtPayoffStrategy
 from app.models.transaction import Transaction
-from app.schemas.debt import DebtCreate, DebtRead, DebtUpdate, DebtReadWithDetails, DebtAddPayment
+from app.schemas.debt import (
+    DebtAddPayment,
+    DebtAmortizationSchedule,
+    DebtCreate,
+    DebtPayoffPlan,
+    DebtRead,
+    DebtReadWithDetails,
+    DebtUpdate,
+)
 from app.schemas.transaction import TransactionRead
 from app.schemas.user import Message
 
 router = APIRouter(prefix="/debts", tags=["debts"])
 
+debt_fields = sparse_fields(DebtRead)
+
 
 @router.post("/", response_model=DebtRead)
 def create_debt(*, session: SessionDep, current_user: CurrentUser, debt_in: DebtCreate) -> Debt:
@@ -35,17 +47,53 @@ def create_debt(*, session: SessionDep, current_user: CurrentUser, debt_in: Debt
 
 @router.get("/", response_model=Sequence[DebtRead])
 def read_debts(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    fieldset: Optional[Fieldset] = Depends(debt_fields),
 ) -> Any:
     """
-    Retrieve debts for the current user.
+    Retrieve debts for the current user, limited to `fields` when given.
     """
     debts = crud_debt.get_debts_by_user(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        fields=fieldset.load if fieldset else None,
     )
+    if fieldset:
+        return model_response(list[sparse_model(DebtRead, fieldset.fields)], debts)
     return debts
 
 
+@router.get("/payoff-plan", response_model=DebtPayoffPlan)
+def read_debt_payoff_plan(
+    session: SessionDep,
+    current_user: CurrentUser,
+    strategy: DebtPayoffStrategy = DebtPayoffStrategy.AVALANCHE,
+    monthly_budget: Optional[float] = Query(None, gt=0, description="Total paid each month, defaults to the sum of the minimum payments"),
+    order: List[uuid.UUID] = Query([], description="Debt IDs in priority order, for the custom strategy"),
+) -> Any:
+    """
+    Simulate paying off all the unpaid debts of the current user with a monthly budget.
+    Extra payments go first to the highest interest rate (avalanche), the smallest
+    balance (snowball) or in the given `order` (custom).
+    """
+    try:
+        plan = crud_debt.get_debt_payoff_plan(
+            session=session,
+            user_id=current_user.id,
+            strategy=strategy,
+            monthly_budget=monthly_budget,
+            order=order,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(DebtPayoffPlan, plan)
+
+
 @router.get("/{debt_id}", response_model=DebtRead)
 def read_debt_by_id(
     session: SessionDep, current_user: CurrentUser, debt_id: uuid.UUID
@@ -79,6 +127,28 @@ def read_debt_details(
     return debt_with_details
 
 
+@router.get("/{debt_id}/schedule", response_model=DebtAmortizationSchedule)
+def read_debt_schedule(
+    session: SessionDep,
+    current_user: CurrentUser,
+    debt_id: uuid.UUID,
+    monthly_payment: Optional[float] = Query(None, gt=0, description="Defaults to the minimum payment"),
+) -> Any:
+    """
+    Get the month by month amortization schedule of a debt.
+    """
+    debt = crud_debt.get_debt(session=session, debt_id=debt_id, user_id=current_user.id)
+    if not debt:
+        raise HTTPException(status_code=404, detail="Debt not found")
+    try:
+        schedule = crud_debt.get_debt_schedule(
+            session=session, debt=debt, monthly_payment=monthly_payment
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(DebtAmortizationSchedule, schedule)
+
+
 @router.post("/{debt_id}/payments", response_model=TransactionRead)
 def add_payment(
     *,
@@ -0,0 +1,35 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from sqlmodel import Session
+
+from app.api.deps import CurrentUser, SessionDep
+from app.core.db import engine
+from app.crud import deletion as crud_deletion
+from app.schemas.deletion_job import DeletionJobRead
+
+router = APIRouter(prefix="/deletion-jobs", tags=["deletion-jobs"])
+
+
+def run_deletion_job_in_background(job_id: uuid.UUID) -> None:
+    """Background task running a deletion job, in its own session as the request's is closed by then."""
+    with Session(engine) as session:
+        crud_deletion.run_deletion_job(session=session, job_id=job_id)
+
+
+@router.get("/{job_id}", response_model=DeletionJobRead)
+def read_deletion_job(
+    job_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+) -> Any:
+    """
+    Get the status and progress of the deletion of an account or a user.
+    """
+    job = crud_deletion.get_deletion_job(
+        session=session,
+        job_id=job_id,
+        requested_by=None if current_user.is_superuser else current_user.id,
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    return job
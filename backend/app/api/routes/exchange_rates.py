@@ -0,0 +1,65 @@
+import uuid
+from typing import Any, Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.crud import exchange_rate
+from app.api.deps import SessionDep, get_current_active_superuser, get_current_user
+from app.models.exchange_rate import ExchangeRate
+from app.schemas.exchange_rate import ExchangeRateCreate, ExchangeRateRead
+from app.schemas.user import Message
+
+router = APIRouter(prefix="/exchange-rates", tags=["exchange-rates"])
+
+
+@router.get("/", response_model=Sequence[ExchangeRateRead], dependencies=[Depends(get_current_user)])
+def read_exchange_rates(
+    session: SessionDep,
+    base_currency_id: Optional[uuid.UUID] = None,
+    quote_currency_id: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve exchange rates, newest first, optionally filtered by currency pair.
+    """
+    return exchange_rate.get_exchange_rates(
+        session=session,
+        base_currency_id=base_currency_id,
+        quote_currency_id=quote_currency_id,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.put("/", response_model=ExchangeRateRead, dependencies=[Depends(get_current_active_superuser)])
+def upsert_exchange_rate(
+    *, session: SessionDep, rate_in: ExchangeRateCreate
+) -> ExchangeRate:
+    """
+    Create or replace the rate of a currency pair for a date. (Superuser only)
+    """
+    try:
+        return exchange_rate.upsert_exchange_rate(session=session, rate_in=rate_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete(
+    "/{rate_id}",
+    response_model=Message,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def delete_exchange_rate(
+    *,
+    session: SessionDep,
+    rate_id: uuid.UUID,
+) -> Message:
+    """
+    Delete an exchange rate. (Superuser only)
+    """
+    db_rate = session.get(ExchangeRate, rate_id)
+    if not db_rate:
+        raise HTTPException(status_code=404, detail="Exchange rate not found")
+    exchange_rate.delete_exchange_rate(session=session, db_rate=db_rate)
+    return Message(message="Exchange rate deleted successfully")
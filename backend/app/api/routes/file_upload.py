@@ -13,9 +13,13 @@ from app.schemas.user import Message
 
 router = APIRouter(prefix="/file-upload", tags=["file-upload"])
 
-# Create upload directory if it doesn't exist
 UPLOAD_DIR = Path(settings.UPLOAD_DIRECTORY) / "profile_pictures"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def create_upload_directory() -> None:
+    """Create the upload directory if it doesn't exist, at startup (see app.main.lifespan)."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
 
 @router.post("/profile-picture", response_model=Message)
 async def upload_profile_picture(
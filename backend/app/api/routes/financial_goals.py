@@ -1,11 +1,12 @@
 import uuid
-from typing import Any, Sequence, List
+from typing import Any, Sequence, List, Optional
 from decimal import Decimal # For add_saving amount
 
 from fastapi import APIRouter, Depends, HTTPException, Body
 
 from app.crud import financial_goal as crud_goal
 from app.api.deps import SessionDep, CurrentUser
+from app.api.responses import Fieldset, model_response, sparse_fields, sparse_model
 from app.models.financial_goal import FinancialGoal
 from app.schemas.financial_goal import (
     FinancialGoalCreate,
@@ -15,11 +16,21 @@ from app.schemas.financial_goal import (
     FinancialGoalAddSaving,
     format_financial_goal_for_response,
     format_financial_goals_for_response,
+    goal_progress_percentage,
 )
 from app.schemas.user import Message
 
 router = APIRouter(prefix="/financial-goals", tags=["financial_goals"])
 
+goal_fields = sparse_fields(
+    FinancialGoalReadWithDetails,
+    derived={
+        "progress_percentage": ("target_amount", "current_amount"),
+        "savings": (),
+        "user": ("user",),
+    },
+)
+
 
 @router.post("/", response_model=FinancialGoalRead)
 def create_financial_goal(
@@ -39,15 +50,34 @@ def create_financial_goal(
 
 @router.get("/", response_model=List[FinancialGoalReadWithDetails])
 def read_financial_goals(
-    session: SessionDep, current_user: CurrentUser
+    session: SessionDep,
+    current_user: CurrentUser,
+    fieldset: Optional[Fieldset] = Depends(goal_fields),
 ) -> Any:
     """
-    Retrieve financial goals for the current user.
+    Retrieve financial goals for the current user, limited to `fields` when given.
     """
     goals = crud_goal.get_financial_goals_by_user(
-        session=session, user_id=current_user.id
+        session=session,
+        user_id=current_user.id,
+        fields=fieldset.load if fieldset else None,
     )
     
+    if fieldset:
+        items = []
+        for goal in goals:
+            item = fieldset.pick(goal)
+            if fieldset.wants("progress_percentage"):
+                item["progress_percentage"] = goal_progress_percentage(goal)
+            if fieldset.wants("savings"):
+                item["savings"] = []
+            if fieldset.wants("user"):
+                item["user"] = goal.user.model_dump() if goal.user else None
+            items.append(item)
+        return model_response(
+            list[sparse_model(FinancialGoalReadWithDetails, fieldset.fields)], items
+        )
+    
     # Use the utility function to format the goals for response
     return format_financial_goals_for_response(goals)
 
@@ -1,10 +1,11 @@
 import uuid
-from typing import Any, Sequence
+from typing import Any, Optional, Sequence
 
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.crud import subscription as crud_subscription
 from app.api.deps import SessionDep, CurrentUser
+from app.api.responses import Fieldset, model_response, sparse_fields, sparse_model
 from app.models.subscription import Subscription
 from app.schemas.subscription import (
     SubscriptionCreate,
@@ -15,6 +16,8 @@ from app.schemas.user import Message
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
+subscription_fields = sparse_fields(SubscriptionRead)
+
 
 @router.post("/", response_model=SubscriptionRead)
 def create_subscription(
@@ -34,14 +37,22 @@ def create_subscription(
 
 @router.get("/", response_model=Sequence[SubscriptionRead])
 def read_subscriptions(
-    session: SessionDep, current_user: CurrentUser
+    session: SessionDep,
+    current_user: CurrentUser,
+    fieldset: Optional[Fieldset] = Depends(subscription_fields),
 ) -> Any:
     """
-    Retrieve subscriptions for the current user.
+    Retrieve subscriptions for the current user, limited to `fields` when given.
     """
     subscriptions = crud_subscription.get_subscriptions_by_user(
-        session=session, user_id=current_user.id
+        session=session,
+        user_id=current_user.id,
+        fields=fieldset.load if fieldset else None,
     )
+    if fieldset:
+        return model_response(
+            list[sparse_model(SubscriptionRead, fieldset.fields)], subscriptions
+        )
     return subscriptions
 
 
@@ -1,23 +1,46 @@
+import csv
+import io
 import uuid
+from collections.abc import Iterator
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 
 from app.crud import transaction as crud_transaction # Alias to avoid name clash
-from app.api.deps import SessionDep, CurrentUser
+from app.api.deps import ReadSessionDep, SessionDep, CurrentUser, TransactionFiltersDep
+from app.api.responses import (
+    Fieldset,
+    model_response,
+    sparse_fields,
+    sparse_model,
+    sparse_page_model,
+)
 from app.schemas.transaction import (
+    TransactionBulkResult,
+    TransactionBulkUpdate,
     TransactionCreate,
     TransactionRead,
     TransactionReadWithDetails,
+    TransactionSelection,
     TransactionUpdate,
     PaginatedTransactionResponse
 )
-from app.models.enums import TransactionType
 from app.schemas.user import Message
 
 # Create main router
 router = APIRouter()
 
+transaction_fields = sparse_fields(TransactionReadWithDetails)
+
+# Columns of the CSV export, in the order of crud.transaction.iter_transaction_rows
+EXPORT_COLUMNS = (
+    "date", "description", "amount", "transaction_type", "currency",
+    "category", "account", "payment_method", "is_active",
+)
+EXPORT_BATCH_SIZE = 500
+
 # General transactions routes
 @router.post("/transactions", response_model=TransactionRead, tags=["transactions"])
 def create_transaction(
@@ -39,36 +62,23 @@ def create_transaction(
 
 @router.get("/transactions", response_model=PaginatedTransactionResponse, tags=["transactions"])
 def read_transactions(
-    session: SessionDep, 
+    session: ReadSessionDep, 
     current_user: CurrentUser,
+    filters: TransactionFiltersDep,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    transaction_type: Optional[TransactionType] = None,
-    category_name: Optional[str] = None,
-    account_id: Optional[str] = None
+    fieldset: Optional[Fieldset] = Depends(transaction_fields),
 ) -> Any:
     """
     Retrieve transactions (incomes and expenses) for the current user.
-    Supports pagination and filtering by transaction type, category name, and account ID.
+    Supports pagination, filtering (see get_transaction_filters) and searching descriptions.
+    With `fields`, only those columns and relationships are loaded and returned.
     """
     # Get total count for pagination
-    # Safely convert account_id to UUID if provided
-    account_uuid = None
-    if account_id:
-        try:
-            account_uuid = uuid.UUID(account_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid account_id format")
-    
-    # Log the received filters for debugging
-    print(f"Filtering transactions with: type={transaction_type}, category={category_name}, account={account_uuid}")
-    
     total_count = crud_transaction.get_transaction_count(
         session=session, 
         user_id=current_user.id,
-        transaction_type=transaction_type,
-        category_name=category_name,
-        account_id=account_uuid
+        filters=filters
     )
     
     # Calculate pagination values
@@ -82,46 +92,106 @@ def read_transactions(
     transactions = crud_transaction.get_transactions(
         session=session, 
         user_id=current_user.id,
-        transaction_type=transaction_type,
-        category_name=category_name,
-        account_id=account_uuid,
+        filters=filters,
         skip=(page - 1) * page_size,
-        limit=page_size
+        limit=page_size,
+        fields=fieldset.load if fieldset else None,
     )
     
-    # Process transactions to handle nested objects with explicit relationship handling
-    processed_transactions = []
-    for transaction in transactions:
-        # Create a dictionary representation of the transaction
-        tx_dict = {}
-        
-        # Add all direct attributes of the transaction
-        for key, value in transaction.__dict__.items():
-            if not key.startswith('_'):
-                tx_dict[key] = value
-        
-        # Process other relationships similarly
-        for rel in ['category', 'account', 'currency', 'payment_method', 'subscription', 'financial_goal', 'debt']:
-            rel_obj = getattr(transaction, rel, None)
-            if rel_obj:
-                # Convert relationship object to dictionary
-                rel_dict = {}
-                for rel_key, rel_value in rel_obj.__dict__.items():
-                    if not rel_key.startswith('_'):
-                        rel_dict[rel_key] = rel_value
-                # Replace relationship object with dictionary
-                tx_dict[rel] = rel_dict
-        
-        processed_transactions.append(tx_dict)
-    
-    # Return paginated response
-    return {
-        "items": processed_transactions,
-        "total": total_count,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages
-    }
+    if fieldset:
+        item_model = sparse_model(TransactionReadWithDetails, fieldset.fields)
+        return model_response(
+            sparse_page_model(PaginatedTransactionResponse, item_model),
+            {
+                "items": transactions,
+                "total": total_count,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": total_pages,
+            },
+        )
+
+    return model_response(
+        PaginatedTransactionResponse,
+        PaginatedTransactionResponse(
+            items=[TransactionReadWithDetails.model_validate(t) for t in transactions],
+            total=total_count,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+        ),
+    )
+
+
+@router.get("/transactions/export", response_class=StreamingResponse, tags=["transactions"])
+def export_transactions(
+    session: ReadSessionDep, current_user: CurrentUser, filters: TransactionFiltersDep
+) -> StreamingResponse:
+    """
+    Download the transactions of the current user matching the filters as CSV, most recent first.
+    """
+    user_id = current_user.id
+    # Primary or replica, as routed for this request
+    bind = session.get_bind()
+
+    def lines() -> Iterator[str]:
+        # The rows are read while the response is sent, after the request's session is closed
+        with Session(bind) as session:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            rows = crud_transaction.iter_transaction_rows(
+                session=session, user_id=user_id, filters=filters, batch_size=EXPORT_BATCH_SIZE
+            )
+            for count, row in enumerate(rows, start=1):
+                writer.writerow(row)
+                if count % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+
+    return StreamingResponse(
+        lines(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="transactions.csv"'},
+    )
+
+
+@router.post("/transactions/bulk-update", response_model=TransactionBulkResult, tags=["transactions"])
+def bulk_update_transactions(
+    *, session: SessionDep, current_user: CurrentUser, bulk_in: TransactionBulkUpdate
+) -> Any:
+    """
+    Apply the same changes (e.g. a new category) to the transactions of the current
+    user listed in `ids` or matching `filters`, all at once.
+    """
+    try:
+        count = crud_transaction.bulk_update_transactions(
+            session=session,
+            user_id=current_user.id,
+            selection=bulk_in,
+            transaction_in=bulk_in.changes,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TransactionBulkResult(count=count)
+
+
+@router.post("/transactions/bulk-delete", response_model=TransactionBulkResult, tags=["transactions"])
+def bulk_delete_transactions(
+    *, session: SessionDep, current_user: CurrentUser, selection: TransactionSelection
+) -> Any:
+    """
+    Delete the transactions of the current user listed in `ids` or matching `filters`, all at once.
+    """
+    try:
+        count = crud_transaction.bulk_delete_transactions(
+            session=session, user_id=current_user.id, selection=selection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TransactionBulkResult(count=count)
 
 
 @router.get("/transactions/{transaction_id}", response_model=TransactionReadWithDetails, tags=["transactions"])
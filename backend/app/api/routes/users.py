@@ -1,18 +1,24 @@
 import uuid
-from typing import Any, Optional
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlmodel import func, select
 
+from app.crud import deletion as crud_deletion
 from app.crud import user as crud_user
 from app.api.deps import (
     CurrentUser,
+    ReadSessionDep,
     SessionDep,
+    TransactionFiltersDep,
     get_current_active_superuser,
 )
+from app.api.responses import model_response
+from app.api.routes.deletion_jobs import run_deletion_job_in_background
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import User
+from app.schemas.deletion_job import DeletionJobRead
 from app.schemas.user import (
     Message,
     UpdatePassword,
@@ -27,11 +33,22 @@ from app.schemas.user import (
 from app.utils import generate_new_account_email, send_email
 from app.schemas.transaction import PaginatedTransactionResponse # Added
 from app.crud import transaction as crud_transaction # Added
-from app.models.enums import TransactionType # Added
 from fastapi import Query # Added
 import datetime # Add this
 from app.crud import summary as crud_summary # Add this
 from app.schemas.summary import UserExpenseSummaryResponse # Add this
+from app.crud import analytics as crud_analytics
+from app.schemas.analytics import AnalyticsDimension, AnalyticsResponse
+from app.crud import dashboard as crud_dashboard
+from app.crud import forecast as crud_forecast
+from app.schemas.forecast import CashFlowForecastResponse
+from app.crud import balance_snapshot as crud_balance_snapshot
+from app.schemas.balance_snapshot import BalanceInterval, NetWorthSeries
+from app.schemas.dashboard import UserDashboardResponse
+from app.crud import upcoming_payment as crud_upcoming_payment
+from app.schemas.upcoming_payment import UpcomingPaymentsResponse
+from app.crud.exchange_rate import get_exchange_rate
+from app.core.cache import bump_user_data_version
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -99,6 +116,8 @@ def update_user_me(
     user_data = user_in.model_dump(exclude_unset=True)
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
+    # The default currency labels every cached aggregate
+    bump_user_data_version(session=session, user_id=current_user.id)
     session.commit()
     session.refresh(current_user)
     return current_user
@@ -134,7 +153,7 @@ def read_user_me(current_user: CurrentUser) -> Any:
 
 @router.get("/me/summary", response_model=UserFinancialSummaryResponse)
 def read_user_financial_summary(
-    current_user: CurrentUser, session: SessionDep
+    current_user: CurrentUser, session: ReadSessionDep
 ) -> UserFinancialSummaryResponse:
     """
     Retrieve the financial summary for the current user.
@@ -147,12 +166,10 @@ def read_user_financial_summary(
 @router.get("/me/transactions", response_model=PaginatedTransactionResponse)
 async def read_user_transactions(
     current_user: CurrentUser,
-    session: SessionDep,
+    session: ReadSessionDep,
+    filters: TransactionFiltersDep,
     page: int = Query(1, ge=1, description="Page number, 1-indexed"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    transaction_type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
-    category_name: Optional[str] = Query(None, description="Filter by category name"),
-    account_id: Optional[uuid.UUID] = Query(None, description="Filter by account ID")
 ) -> PaginatedTransactionResponse:
     """
     Retrieve paginated transactions for the current user.
@@ -162,9 +179,7 @@ async def read_user_transactions(
         user_id=current_user.id, 
         page=page, 
         page_size=page_size,
-        transaction_type=transaction_type,
-        category_name=category_name,
-        account_id=account_id
+        filters=filters
     )
     return PaginatedTransactionResponse(**transactions_data)
 
@@ -172,7 +187,7 @@ async def read_user_transactions(
 @router.get("/me/expense-summary", response_model=UserExpenseSummaryResponse)
 def read_user_expense_summary(
     current_user: CurrentUser,
-    session: SessionDep,
+    session: ReadSessionDep,
     year: int = Query(None, description="Year for monthly summary. Defaults to current year."),
     days_for_daily: int = Query(7, ge=1, le=365, description="Number of past days for daily summary (e.g., 7 for weekly view).")
 ) -> UserExpenseSummaryResponse:
@@ -205,18 +220,157 @@ def read_user_expense_summary(
     )
 
 
-@router.delete("/me", response_model=Message)
-def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
+@router.get("/me/analytics", response_model=AnalyticsResponse)
+def read_user_analytics(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    filters: TransactionFiltersDep,
+    group_by: List[AnalyticsDimension] = Query([], description="Dimensions to group by, in order"),
+    rollup: bool = Query(False, description="Add subtotal rows for every prefix of group_by and a grand total"),
+) -> Any:
+    """
+    Retrieve income, expense and transaction count of the current user grouped by any
+    combination of category, account, payment method, currency, type and period,
+    e.g. `group_by=payment_method&group_by=quarter`. Accepts the transaction filters.
+    """
+    if len(set(group_by)) != len(group_by):
+        raise HTTPException(status_code=400, detail="Each dimension can only be grouped by once")
+    analytics = crud_analytics.get_spending_analytics(
+        session=session,
+        user_id=current_user.id,
+        group_by=group_by,
+        filters=filters,
+        rollup=rollup,
+    )
+    return model_response(AnalyticsResponse, analytics)
+
+
+@router.get("/me/dashboard", response_model=UserDashboardResponse)
+def read_user_dashboard(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    year: int = Query(None, description="Year for monthly summary. Defaults to current year."),
+    days_for_daily: int = Query(7, ge=1, le=365, description="Number of past days for daily summary (e.g., 7 for weekly view).")
+) -> Any:
+    """
+    Retrieve every home screen widget for the current user in a single call:
+    financial summary, expense summary, budgets progress, accounts, debts,
+    subscriptions and financial goals.
+    """
+    dashboard = crud_dashboard.get_user_dashboard(
+        session=session,
+        user=current_user,
+        year=year,
+        days_for_daily=days_for_daily,
+    )
+    return model_response(UserDashboardResponse, dashboard)
+
+
+@router.get("/me/forecast", response_model=CashFlowForecastResponse)
+def read_user_forecast(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    months: int = Query(3, ge=1, le=24, description="Number of months to project"),
+    history_months: int = Query(3, ge=1, le=24, description="Number of past months usual income and expenses are averaged over"),
+) -> Any:
+    """
+    Retrieve the projected day-by-day balance of each account of the current user,
+    from their subscriptions, debt payments and usual income and expenses.
+    """
+    forecast = crud_forecast.get_cash_flow_forecast(
+        session=session,
+        user_id=current_user.id,
+        months=months,
+        history_months=history_months,
+    )
+    return model_response(CashFlowForecastResponse, forecast)
+
+
+@router.get("/me/net-worth", response_model=NetWorthSeries)
+def read_user_net_worth(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    date_from: Optional[datetime.date] = Query(None, description="Start of the series (defaults to a year before date_to)"),
+    date_to: Optional[datetime.date] = Query(None, description="End of the series (defaults to today)"),
+    interval: BalanceInterval = Query(BalanceInterval.MONTH, description="Spacing of the points"),
+) -> Any:
+    """
+    Retrieve the net worth of the current user at the end of each interval, in
+    their default currency.
+    """
+    date_to = date_to or datetime.date.today()
+    date_from = date_from or date_to - datetime.timedelta(days=365)
+    try:
+        series = crud_balance_snapshot.get_net_worth_series(
+            session=session,
+            user_id=current_user.id,
+            date_from=date_from,
+            date_to=date_to,
+            interval=interval,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(NetWorthSeries, series)
+
+
+@router.get("/me/upcoming-payments", response_model=UpcomingPaymentsResponse)
+def read_user_upcoming_payments(
+    current_user: CurrentUser,
+    session: ReadSessionDep,
+    days: int = Query(30, ge=1, le=365, description="Number of days ahead to look for payment reminders.")
+) -> UpcomingPaymentsResponse:
+    """
+    Retrieve the subscription charges and debt payments of the current user whose
+    reminder falls within the next `days` days, including overdue debts.
+    """
+    payments = crud_upcoming_payment.get_upcoming_payments(
+        session=session, user_id=current_user.id, days=days
+    )
+    # Payments without an exchange rate are counted apart instead of added unconverted
+    today = datetime.date.today()
+    total_amount = 0.0
+    unconverted = 0
+    for payment in payments:
+        rate = (
+            get_exchange_rate(
+                session=session,
+                base_currency_id=payment.currency_id,
+                quote_currency_id=current_user.default_currency_id,
+                on=today,
+            )
+            if current_user.default_currency_id
+            else 1.0
+        )
+        if rate is None:
+            unconverted += 1
+        else:
+            total_amount += payment.amount * rate
+    return UpcomingPaymentsResponse(
+        data=payments,
+        count=len(payments),
+        total_amount=total_amount,
+        unconverted=unconverted,
+    )
+
+
+@router.delete("/me", response_model=DeletionJobRead, status_code=202)
+def delete_user_me(
+    session: SessionDep, current_user: CurrentUser, background_tasks: BackgroundTasks
+) -> Any:
     """
     Delete own user.
+
+    The user is deactivated at once and their data deleted in the background.
     """
     if current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    job = crud_deletion.create_user_deletion_job(
+        session=session, user=current_user, requested_by=current_user.id
+    )
+    background_tasks.add_task(run_deletion_job_in_background, job.id)
+    return job
 
 
 @router.post("/signup", response_model=UserPublic)
@@ -285,12 +439,23 @@ def update_user(
     return db_user
 
 
-@router.delete("/{user_id}", dependencies=[Depends(get_current_active_superuser)])
+@router.delete(
+    "/{user_id}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=DeletionJobRead,
+    status_code=202,
+)
 def delete_user(
-    session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID
-) -> Message:
+    session: SessionDep,
+    current_user: CurrentUser,
+    user_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+) -> Any:
     """
     Delete a user.
+
+    The user is deactivated at once and their data deleted in the background;
+    follow the progress at /deletion-jobs/{job_id}.
     """
     user = session.get(User, user_id)
     if not user:
@@ -299,8 +464,8 @@ def delete_user(
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    job = crud_deletion.create_user_deletion_job(
+        session=session, user=user, requested_by=current_user.id
+    )
+    background_tasks.add_task(run_deletion_job_in_background, job.id)
+    return job
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends
+import os
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.cache import aggregate_cache
+from app.core.profiling import list_profiles, profile_path
 from app.schemas.user import Message
 from app.utils import generate_test_email, send_email
 
@@ -26,6 +32,43 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def cache_stats() -> dict[str, Any]:
+    """
+    Hit/miss statistics of the per-user aggregate cache of the worker serving the request.
+    """
+    return aggregate_cache.stats()
+
+
+@router.get(
+    "/profiles/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def read_profiles() -> list[str]:
+    """
+    Ids of the stored request profiles, newest first.
+    """
+    return list_profiles()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=FileResponse,
+)
+def read_profile(profile_id: str) -> FileResponse:
+    """
+    Download a request profile in the folded stack format (speedscope, flamegraph.pl).
+    """
+    path = profile_path(profile_id)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
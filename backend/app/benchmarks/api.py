@@ -0,0 +1,276 @@
+"""
+Latency, query count and rows scanned of the hot API endpoints at several data volumes.
+
+    python -m app.benchmarks.api --scales 1000 100000 1000000 --output benchmark.json
+    python -m app.benchmarks.api --compare baseline.json benchmark.json
+
+Every scale seeds a synthetic user with that many transactions, replacing the
+test data (see populate_test_data), so only run it against a disposable local
+or staging database. Requests go through the ASGI app in-process.
+"""
+import argparse
+import datetime
+import logging
+import platform
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.benchmarks.report import (
+    compare_reports,
+    load_report,
+    summarize_latencies,
+    write_report,
+)
+from app.core.cache import aggregate_cache
+from app.core.config import settings
+from app.core.query_stats import capture_queries
+from app.core.db import engine
+from app.main import app
+from app.models import Account, Debt, Transaction, User
+from app.populate_test_data import (
+    clear_existing_data,
+    create_test_categories,
+    create_test_currencies,
+    create_test_payment_methods,
+    generate_synthetic_data,
+    is_development_environment,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = [1_000, 100_000, 1_000_000]
+BENCHMARK_USER_EMAIL = "synthetic.user0@example.com"
+BENCHMARK_USER_PASSWORD = "password123"
+# Weekend days are 30% busier in the generator
+_WEEKLY_EXPENSE_FACTOR = (5 + 2 * 1.3) / 7
+
+# Endpoint label -> path builder, given the IDs of the seeded user's rows
+ENDPOINTS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "GET /transactions": lambda ids: "/transactions",
+    "GET /users/me/summary": lambda ids: "/users/me/summary",
+    "GET /users/me/expense-summary": lambda ids: "/users/me/expense-summary",
+    "GET /budgets/": lambda ids: "/budgets/",
+    "GET /budgets/progress": lambda ids: "/budgets/progress",
+    "GET /accounts/{id}": lambda ids: f"/accounts/{ids['account_id']}",
+    "GET /debts/{id}/details": lambda ids: f"/debts/{ids['debt_id']}/details",
+}
+_SCAN_NODES = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan", "Tid Scan"}
+
+
+def rows_scanned(statements: list[tuple[str, Any]]) -> int:
+    """
+    Rows read by the table scans of the read statements, from EXPLAIN ANALYZE.
+
+    Counts the rows returned by every scan node plus the ones it discarded by filter.
+    """
+    total = 0
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            if parameters is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                continue
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+            ).scalar_one()
+            total += _scanned_rows(plan[0]["Plan"])
+        connection.rollback()
+    return total
+
+
+def _scanned_rows(plan: dict[str, Any]) -> int:
+    scanned = 0
+    if plan["Node Type"] in _SCAN_NODES:
+        per_loop = plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)
+        scanned += round(per_loop * plan.get("Actual Loops", 1))
+    for child in plan.get("Plans", []):
+        scanned += _scanned_rows(child)
+    return scanned
+
+
+def seed_scale(transactions_per_user: int, *, years: int, seed: int) -> dict[str, Any]:
+    """Replace the test data with one synthetic user holding about `transactions_per_user` transactions."""
+    today = datetime.date.today()
+    days = (today - today.replace(year=today.year - years, day=1)).days + 1
+    # Salary, rent, debt payments and subscription charges: a handful a month
+    recurring = years * 12 * 6
+    daily_expenses = max(0.05, (transactions_per_user - recurring) / (days * _WEEKLY_EXPENSE_FACTOR))
+
+    with Session(engine) as session:
+        clear_existing_data(session)
+        create_test_currencies(session)
+        create_test_categories(session)
+        create_test_payment_methods(session)
+        generate_synthetic_data(
+            session,
+            users=1,
+            accounts_per_user=3,
+            years=years,
+            seed=seed,
+            daily_expenses=daily_expenses,
+            debt_probability=1.0,
+        )
+        user = session.exec(select(User).where(User.email == BENCHMARK_USER_EMAIL)).one()
+        account = session.exec(
+            select(Account)
+            .where(Account.user_id == user.id, Account.is_default == False)
+            .order_by(Account.name)
+        ).first() or session.exec(select(Account).where(Account.user_id == user.id)).first()
+        debt = session.exec(select(Debt).where(Debt.user_id == user.id)).first()
+        transactions = session.exec(
+            select(func.count()).select_from(Transaction).where(Transaction.user_id == user.id)
+        ).one()
+        ids = {"user_id": user.id, "account_id": account.id, "debt_id": debt.id}
+
+    # Fresh planner statistics, as autovacuum would have them on a live database
+    with engine.connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+
+    return {**ids, "transactions": transactions}
+
+
+def benchmark_endpoint(
+    client: TestClient,
+    headers: dict[str, str],
+    path: str,
+    *,
+    iterations: int,
+    warmup: int,
+    warm_cache: bool,
+) -> dict[str, Any]:
+    """Time `iterations` requests to `path` and profile the queries of one of them."""
+    url = f"{settings.API_V1_STR}{path}"
+    for _ in range(warmup):
+        client.get(url, headers=headers)
+
+    latencies_ms = []
+    status_code = None
+    for _ in range(iterations):
+        if not warm_cache:
+            aggregate_cache.clear()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+        status_code = response.status_code
+
+    if not warm_cache:
+        aggregate_cache.clear()
+    with capture_queries() as stats:
+        response = client.get(url, headers=headers)
+
+    return {
+        **summarize_latencies(latencies_ms),
+        "iterations": iterations,
+        "status_code": status_code,
+        "response_bytes": len(response.content),
+        "queries": stats.count,
+        "rows_scanned": rows_scanned(stats.statements),
+    }
+
+
+def run_benchmarks(
+    *,
+    scales: list[int],
+    iterations: int,
+    warmup: int,
+    years: int,
+    seed: int,
+    warm_cache: bool,
+) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "warm_cache": warm_cache,
+        "seed": seed,
+        "scales": {},
+    }
+    # Endpoint errors end up in the report as a 500 status instead of aborting the run
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for scale in scales:
+            logger.info(f"Seeding {scale} transactions per user...")
+            seeded = seed_scale(scale, years=years, seed=seed)
+            login = client.post(
+                f"{settings.API_V1_STR}/login/access-token",
+                data={"username": BENCHMARK_USER_EMAIL, "password": BENCHMARK_USER_PASSWORD},
+            )
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            results: dict[str, Any] = {}
+            for label, build_path in ENDPOINTS.items():
+                results[label] = benchmark_endpoint(
+                    client,
+                    headers,
+                    build_path(seeded),
+                    iterations=iterations,
+                    warmup=warmup,
+                    warm_cache=warm_cache,
+                )
+                logger.info(
+                    f"[{scale}] {label}: p50 {results[label]['p50_ms']:.1f}ms, "
+                    f"p95 {results[label]['p95_ms']:.1f}ms, {results[label]['queries']} queries, "
+                    f"{results[label]['rows_scanned']} rows scanned"
+                )
+            report["scales"][str(scale)] = results
+            report.setdefault("seeded_transactions", {})[str(scale)] = seeded["transactions"]
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the hot API endpoints.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Transactions per user")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint")
+    parser.add_argument("--years", type=int, default=2, help="Years of history the transactions are spread over")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic data generator")
+    parser.add_argument(
+        "--warm-cache", action="store_true",
+        help="Keep the per-user aggregate cache between requests (cold by default)",
+    )
+    parser.add_argument("--output", default="benchmark-report.json", help="Path of the JSON report")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+        help="Compare two reports instead of running, exiting with 1 on regressions",
+    )
+    parser.add_argument("--max-latency-regression", type=float, default=0.25)
+    parser.add_argument("--max-rows-regression", type=float, default=0.10)
+    parser.add_argument("--force", action="store_true", help="Run outside of local/staging environments")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare_reports(
+            load_report(args.compare[0]),
+            load_report(args.compare[1]),
+            max_latency_regression=args.max_latency_regression,
+            max_rows_regression=args.max_rows_regression,
+        )
+        for regression in regressions:
+            logger.error(regression)
+        if regressions:
+            sys.exit(1)
+        logger.info("No regressions")
+        return
+
+    if not args.force and not is_development_environment():
+        logger.warning("Not in development environment. Skipping benchmarks.")
+        return
+
+    report = run_benchmarks(
+        scales=args.scales,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        years=args.years,
+        seed=args.seed,
+        warm_cache=args.warm_cache,
+    )
+    write_report(report, args.output)
+    logger.info(f"Benchmark report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
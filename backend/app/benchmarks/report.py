@@ -0,0 +1,66 @@
+import json
+import math
+import statistics
+from pathlib import Path
+from typing import Any
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies_ms: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "max_ms": round(max(latencies_ms), 3),
+    }
+
+
+def write_report(report: dict[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    max_latency_regression: float = 0.25,
+    max_rows_regression: float = 0.10,
+) -> list[str]:
+    """
+    List the regressions of `current` against `baseline`.
+
+    Latency (p95) and rows scanned may grow by the given ratios, to absorb noise
+    and data drift; the number of queries per request must not grow at all.
+    Scales or endpoints missing from either report are ignored.
+    """
+    regressions = []
+    for scale, endpoints in current.get("scales", {}).items():
+        baseline_endpoints = baseline.get("scales", {}).get(scale, {})
+        for endpoint, result in endpoints.items():
+            before = baseline_endpoints.get(endpoint)
+            if not before:
+                continue
+            label = f"[{scale}] {endpoint}"
+            if result["p95_ms"] > before["p95_ms"] * (1 + max_latency_regression):
+                regressions.append(
+                    f"{label}: p95 {before['p95_ms']:.1f}ms -> {result['p95_ms']:.1f}ms"
+                )
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{label}: queries per request {before['queries']} -> {result['queries']}"
+                )
+            if result["rows_scanned"] > before["rows_scanned"] * (1 + max_rows_regression):
+                regressions.append(
+                    f"{label}: rows scanned {before['rows_scanned']} -> {result['rows_scanned']}"
+                )
+    return regressions
@@ -0,0 +1,247 @@
+"""
+Serialization cost of the hot list endpoints, per strategy.
+
+    python -m app.benchmarks.serialization --output serialization.json
+
+For every endpoint a synthetic page of the size the frontend asks for is turned
+into response bytes in three ways:
+
+- fastapi_json: what FastAPI did before, validating the returned content against
+  the route's response_model, converting it with jsonable_encoder and encoding
+  it with the standard json module (the former default JSONResponse);
+- fastapi_orjson: the same pipeline with the ORJSONResponse default class;
+- model_dump_json: the endpoint returns app.api.responses.model_response.
+
+No database is needed: only the work done after the endpoint has its rows is timed.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import platform
+import random
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.responses import model_response
+from app.benchmarks.report import summarize_latencies, write_report
+from app.core.config import settings
+from app.main import app
+from app.models.enums import AccountType, CategoryType, PaymentMethodType, TransactionType
+from app.schemas.account import AccountRead
+from app.schemas.budget import BudgetReadWithDetails, BudgetSummary, PaginatedBudgetResponse
+from app.schemas.category import CategoryRead
+from app.schemas.currency import CurrencyRead
+from app.schemas.payment_method import PaymentMethodRead
+from app.schemas.transaction import PaginatedTransactionResponse, TransactionReadWithDetails
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("fastapi_json", "fastapi_orjson", "model_dump_json")
+
+
+def _currency() -> CurrencyRead:
+    return CurrencyRead(id=uuid.uuid4(), code="USD", name="US Dollar", symbol="$")
+
+
+def _category(rng: random.Random) -> CategoryRead:
+    return CategoryRead(
+        id=uuid.uuid4(),
+        name=rng.choice(["Groceries", "Rent", "Transport", "Restaurants", "Utilities"]),
+        description="Synthetic category",
+        category_type=CategoryType.EXPENSE,
+        icon="shopping-cart",
+        color="#4CAF50",
+    )
+
+
+def _account(rng: random.Random, user_id: uuid.UUID, currency_id: uuid.UUID) -> AccountRead:
+    now = datetime.datetime.now()
+    return AccountRead(
+        id=uuid.uuid4(),
+        name=f"Account {rng.randint(1, 999)}",
+        account_type=rng.choice(list(AccountType)),
+        balance=round(rng.uniform(-500, 25_000), 2),
+        institution="Synthetic Bank",
+        user_id=user_id,
+        currency_id=currency_id,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def transactions_page(size: int, seed: int) -> PaginatedTransactionResponse:
+    rng = random.Random(seed)
+    user_id = uuid.uuid4()
+    currency = _currency()
+    categories = [_category(rng) for _ in range(5)]
+    accounts = [_account(rng, user_id, currency.id) for _ in range(3)]
+    payment_method = PaymentMethodRead(
+        id=uuid.uuid4(), name="Card", payment_method_type=PaymentMethodType.CARD
+    )
+    today = datetime.date.today()
+    items = [
+        TransactionReadWithDetails(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            description=f"Synthetic expense {i}",
+            amount=round(rng.uniform(1, 300), 2),
+            transaction_type=TransactionType.EXPENSE,
+            date=today - datetime.timedelta(days=i // 3),
+            currency=currency,
+            category=rng.choice(categories),
+            payment_method=payment_method,
+            account=rng.choice(accounts),
+        )
+        for i in range(size)
+    ]
+    return PaginatedTransactionResponse(
+        items=items, total=size * 50, page=1, page_size=size, total_pages=50
+    )
+
+
+def budgets_page(size: int, seed: int) -> PaginatedBudgetResponse:
+    rng = random.Random(seed)
+    user_id = uuid.uuid4()
+    now = datetime.datetime.now()
+    items = []
+    for i in range(size):
+        category = _category(rng)
+        amount = round(rng.uniform(100, 2_000), 2)
+        spent = round(rng.uniform(0, amount * 1.2), 2)
+        items.append(
+            BudgetReadWithDetails(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                name=f"Budget {i}",
+                amount=amount,
+                category_id=category.id,
+                created_at=now,
+                updated_at=now,
+                user={"id": str(user_id), "email": "synthetic@example.com", "first_name": "Synthetic"},
+                category=category,
+                spent_amount=spent,
+                remaining_amount=amount - spent,
+                progress_percentage=spent / amount * 100,
+                category_name=category.name,
+            )
+        )
+    total_budgeted = sum(item.amount for item in items)
+    total_spent = sum(item.spent_amount for item in items)
+    return PaginatedBudgetResponse(
+        items=items,
+        total=size,
+        page=1,
+        page_size=size,
+        total_pages=1,
+        summary=BudgetSummary(
+            total_budgeted=total_budgeted,
+            total_spent=total_spent,
+            remaining=total_budgeted - total_spent,
+            percentage=total_spent / total_budgeted * 100,
+        ),
+    )
+
+
+def accounts_list(size: int, seed: int) -> list[AccountRead]:
+    rng = random.Random(seed)
+    user_id = uuid.uuid4()
+    currency_id = uuid.uuid4()
+    return [_account(rng, user_id, currency_id) for _ in range(size)]
+
+
+# Endpoint label -> (method, path, response type, payload builder, content FastAPI received before)
+ENDPOINTS: dict[str, tuple[str, str, Any, Callable[[int, int], Any], Callable[[Any], Any]]] = {
+    "GET /transactions": (
+        "GET", "/transactions", PaginatedTransactionResponse, transactions_page,
+        # read_transactions used to hand FastAPI plain dicts copied from the ORM objects
+        lambda payload: payload.model_dump(),
+    ),
+    "GET /budgets/": (
+        "GET", "/budgets/", PaginatedBudgetResponse, budgets_page, lambda payload: payload,
+    ),
+    "GET /accounts/": (
+        "GET", "/accounts/", list[AccountRead], accounts_list, lambda payload: payload,
+    ),
+}
+
+
+def find_route(method: str, path: str) -> APIRoute:
+    full_path = f"{settings.API_V1_STR}{path}"
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == full_path and method in route.methods:
+            return route
+    raise LookupError(f"No route for {method} {full_path}")
+
+
+async def render(strategy: str, route: APIRoute, response_type: Any, payload: Any, content: Any) -> bytes:
+    """Response body of `payload` as produced by `strategy`."""
+    if strategy == "model_dump_json":
+        return model_response(response_type, payload).body
+    value = await serialize_response(field=route.response_field, response_content=content)
+    response_class = JSONResponse if strategy == "fastapi_json" else ORJSONResponse
+    return response_class(value).body
+
+
+async def _time_strategy(
+    strategy: str, route: APIRoute, response_type: Any, payload: Any, content: Any, iterations: int
+) -> list[float]:
+    latencies_ms = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await render(strategy, route, response_type, payload, content)
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+    return latencies_ms
+
+
+def run_benchmarks(*, page_size: int, iterations: int, seed: int) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "page_size": page_size,
+        "endpoints": {},
+    }
+    for label, (method, path, response_type, build, before_content) in ENDPOINTS.items():
+        route = find_route(method, path)
+        payload = build(page_size, seed)
+        content = before_content(payload)
+        results: dict[str, Any] = {}
+        for strategy in STRATEGIES:
+            body = asyncio.run(render(strategy, route, response_type, payload, content))
+            latencies_ms = asyncio.run(
+                _time_strategy(strategy, route, response_type, payload, content, iterations)
+            )
+            results[strategy] = {**summarize_latencies(latencies_ms), "response_bytes": len(body)}
+        baseline = results["fastapi_json"]["p50_ms"]
+        for result in results.values():
+            result["speedup_p50"] = round(baseline / result["p50_ms"], 2) if result["p50_ms"] else None
+        report["endpoints"][label] = results
+        logger.info(
+            f"{label}: "
+            + ", ".join(f"{strategy} p50 {results[strategy]['p50_ms']:.2f}ms" for strategy in STRATEGIES)
+        )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark response serialization strategies.")
+    parser.add_argument("--page-size", type=int, default=100, help="Items per synthetic page")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed renders per strategy")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic payloads")
+    parser.add_argument("--output", default="serialization-report.json", help="Path of the JSON report")
+    args = parser.parse_args()
+
+    report = run_benchmarks(page_size=args.page_size, iterations=args.iterations, seed=args.seed)
+    write_report(report, args.output)
+    logger.info(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
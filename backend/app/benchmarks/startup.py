@@ -0,0 +1,134 @@
+"""
+Startup cost of a worker: importing app.main, running its lifespan and serving the
+first requests, each run in a fresh interpreter.
+
+    python -m app.benchmarks.startup --runs 5 --output startup.json
+    python -m app.benchmarks.startup --budget app/benchmarks/startup_budget.json
+
+The budget is tracked in the repository, with about 50% headroom over a reference
+run so that noise doesn't fail it: the command exits with an error when a phase's
+median exceeds it, or when an optional dependency meant to load lazily
+(LAZY_MODULES) is imported along with the app. The requests go through the ASGI
+app in-process and only read, so any database with the schema will do.
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from app.benchmarks.report import load_report, summarize_latencies, write_report
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = Path(__file__).parent / "startup_budget.json"
+PHASES = ("import_ms", "lifespan_ms", "first_request_ms", "second_request_ms")
+# Heavy optional dependencies that must not load until used
+LAZY_MODULES = ("emails", "jinja2", "numpy", "sentry_sdk")
+FIRST_REQUEST_PATH = "/currencies/"
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def measure_once() -> dict[str, Any]:
+    """
+    Timings of one startup. Only meaningful in a fresh interpreter that has
+    imported nothing of the app yet: see run_child.
+    """
+    started = time.perf_counter()
+    from app.main import app
+
+    result: dict[str, Any] = {"import_ms": _elapsed_ms(started)}
+    result["eager_modules"] = [name for name in LAZY_MODULES if name in sys.modules]
+
+    # Not part of a worker's startup, so imported outside of the timings
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+
+    client = TestClient(app)
+    started = time.perf_counter()
+    with client:
+        result["lifespan_ms"] = _elapsed_ms(started)
+        for phase in ("first_request_ms", "second_request_ms"):
+            started = time.perf_counter()
+            response = client.get(f"{settings.API_V1_STR}{FIRST_REQUEST_PATH}")
+            result[phase] = _elapsed_ms(started)
+            response.raise_for_status()
+    return result
+
+
+def run_child() -> dict[str, Any]:
+    """measure_once in a new interpreter, so no import is already cached."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "app.benchmarks.startup", "--child"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(*, runs: int) -> dict[str, Any]:
+    results = [run_child() for _ in range(runs)]
+    report: dict[str, Any] = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": runs,
+        "phases": {
+            phase: summarize_latencies([result[phase] for result in results]) for phase in PHASES
+        },
+        "eager_modules": sorted({name for result in results for name in result["eager_modules"]}),
+    }
+    for phase, summary in report["phases"].items():
+        logger.info(f"{phase}: p50 {summary['p50_ms']:.1f}ms, max {summary['max_ms']:.1f}ms")
+    return report
+
+
+def check_budget(report: dict[str, Any], budget: dict[str, float]) -> list[str]:
+    """
+    List what the report exceeds of the budget: the median of each budgeted phase,
+    in milliseconds, and the lazy modules that were imported with the app.
+    """
+    violations = [
+        f"{phase}: p50 {report['phases'][phase]['p50_ms']:.1f}ms > budget {limit_ms:.1f}ms"
+        for phase, limit_ms in budget.items()
+        if phase in report["phases"] and report["phases"][phase]["p50_ms"] > limit_ms
+    ]
+    violations.extend(f"{name} is imported at startup" for name in report["eager_modules"])
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the startup of a worker.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--output", default="startup-report.json", help="Path of the JSON report")
+    parser.add_argument("--budget", default=str(DEFAULT_BUDGET), help="Milliseconds allowed per phase (JSON)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return
+
+    report = run_benchmarks(runs=args.runs)
+    write_report(report, args.output)
+    logger.info(f"Report written to {args.output}")
+
+    violations = check_budget(report, load_report(args.budget))
+    for violation in violations:
+        logger.error(violation)
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
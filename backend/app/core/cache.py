@@ -0,0 +1,150 @@
+import datetime
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+T = TypeVar("T")
+
+
+class AggregateCache:
+    """
+    Thread-safe, in-process LRU cache with TTL for per-user aggregates.
+
+    Entries are keyed by (user_id, data_version, kind, period). Every write to a
+    user's data bumps `User.data_version` in the database, so entries computed
+    before the write are never served again, by this worker or any other one;
+    they simply age out through LRU eviction or their TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries above max_entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(
+        self,
+        *,
+        session: Session,
+        user_id: uuid.UUID,
+        kind: str,
+        period: Hashable,
+        compute: Callable[[], T],
+    ) -> T:
+        """
+        Return the cached aggregate for (user_id, kind, period) at the user's current
+        data version, computing and storing it on a miss.
+
+        None results are not cached.
+        """
+        key = (user_id, get_user_data_version(session=session, user_id=user_id), kind, period)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters of this worker process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "miss_rate": self.misses / lookups if lookups else 0.0,
+            }
+
+
+aggregate_cache = AggregateCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+)
+
+
+def get_user_data_version(*, session: Session, user_id: uuid.UUID) -> int:
+    """
+    Current data version of a user.
+
+    The authenticated user is already in the session identity map, so inside a
+    request this does not hit the database.
+    """
+    user = session.get(User, user_id)
+    return user.data_version if user else 0
+
+
+def bump_user_data_version(*, session: Session, user_id: uuid.UUID) -> None:
+    """
+    Invalidate every cached aggregate of a user.
+
+    Call it before committing a write to the user's data so the bump lands in the
+    same database transaction as the write. Also records when the data changed,
+    which keeps the user's reads on the primary database for a while, so a replica
+    lagging behind never hides the write (see app.core.read_routing).
+    """
+    session.exec(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1, data_changed_at=datetime.datetime.now())
+    )
+
+
+def bump_users_data_version(*, session: Session, user_ids: Iterable[uuid.UUID]) -> None:
+    """Bulk variant of bump_user_data_version for set-based writes spanning several users."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    session.exec(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(data_version=User.data_version + 1, data_changed_at=datetime.datetime.now())
+    )
@@ -0,0 +1,194 @@
+import zlib
+from collections.abc import Mapping, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import route_label
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+# Preferred first when the client accepts both with the same weight
+SUPPORTED_ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+# Status codes whose response has no body to compress
+_NO_BODY_STATUSES = {204, 304}
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Best encoding we support among the ones of an Accept-Encoding header
+    ("br;q=1.0, gzip;q=0.8, *;q=0.1"), or None to send the response as is.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        compressed = self._compressor.compress(data)
+        # A sync flush hands every streamed chunk to the client right away
+        return compressed + (
+            self._compressor.flush() if final else self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        compressed = self._compressor.process(data)
+        return compressed + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, as negotiated with Accept-Encoding.
+
+    A response is compressed only if its content type starts with one of
+    `content_types` and its body reaches `minimum_size`: the first chunks are held
+    back until the threshold is reached, so small responses are sent untouched and
+    cost no CPU. Streaming responses (exports, files) are compressed chunk by
+    chunk, each chunk being flushed so the client receives it without waiting for
+    the end of the stream.
+
+    `route_levels` overrides the gzip level / brotli quality per route, keyed by the
+    route unique id (as in the metrics): {"transactions-export": {"gzip": 1, "br": 1}}.
+    A level of 0 turns compression off for that route and encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        content_types: Sequence[str] = ("application/json", "text/"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        route_levels: Mapping[str, Mapping[str, int]] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.default_levels = {GZIP: gzip_level, BROTLI: brotli_quality}
+        self.route_levels = route_levels or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def level(self, scope: Scope, encoding: str) -> int:
+        """Compression level of `encoding` for the route that served the request."""
+        overrides = self.route_levels.get(route_label(scope), {})
+        return overrides.get(encoding, self.default_levels[encoding])
+
+
+class _CompressingResponder:
+    """Send wrapper deciding, from the response start and first body chunks, whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send_downstream = send
+        self.start_message: Message | None = None
+        self.buffer = b""
+        self.compressor: _GzipCompressor | _BrotliCompressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._compressible(message)
+            if self.passthrough:
+                await self.send_downstream(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send_downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            data = self.compressor.compress(body, final=not more_body)
+            if data or not more_body:
+                await self.send_downstream(
+                    {"type": "http.response.body", "body": data, "more_body": more_body}
+                )
+            return
+
+        self.buffer += body
+        if len(self.buffer) < self.middleware.minimum_size:
+            if more_body:
+                return
+            # Whole response below the threshold: not worth compressing
+            assert self.start_message is not None
+            await self.send_downstream(self.start_message)
+            await self.send_downstream({"type": "http.response.body", "body": self.buffer})
+            return
+
+        self.compressor = self._new_compressor()
+        data = self.compressor.compress(self.buffer, final=not more_body)
+        self.buffer = b""
+        assert self.start_message is not None
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(data))
+        await self.send_downstream(self.start_message)
+        await self.send_downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compressible(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] in _NO_BODY_STATUSES or message["status"] < 200:
+            return False
+        if "content-encoding" in headers or self.scope["method"] == "HEAD":
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(self.middleware.content_types):
+            return False
+        return self.middleware.level(self.scope, self.encoding) > 0
+
+    def _new_compressor(self) -> _GzipCompressor | _BrotliCompressor:
+        level = self.middleware.level(self.scope, self.encoding)
+        if self.encoding == BROTLI:
+            return _BrotliCompressor(level)
+        return _GzipCompressor(level)
@@ -1,5 +1,6 @@
 import os
 import secrets
+import tempfile
 import warnings
 from typing import Annotated, Any, Literal
 
@@ -39,6 +40,55 @@ class Settings(BaseSettings):
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     UPLOAD_DIRECTORY: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
+    # Per-user aggregate cache (dashboard snapshot, summaries, budgets progress)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Payment reminders (debts have no per-item reminder_days)
+    DEBT_REMINDER_DAYS: int = 3
+    REMINDER_NOTIFICATION_WORKERS: int = 4
+    # Statements slower than this are logged with the shape of their parameters
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    # Per-request query count and database time in a Server-Timing response header
+    SERVER_TIMING_ENABLED: bool = True
+    # Prometheus metrics (latency, status codes, DB time, pool usage) served on /metrics.
+    # Off by default: they list the routes and the load of the API to whoever asks,
+    # so enable them behind an internal network or with METRICS_TOKEN set, which
+    # scrapes then send as "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str | None = None
+    # Superuser-only request profiling (X-Profile header or ?profile=1), in folded stack
+    # format. Off by default: the middleware checks the token of every request
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5
+    PROFILING_MAX_DURATION_SECONDS: float = 60
+    PROFILING_DIRECTORY: str = os.path.join(tempfile.gettempdir(), "spendmila-profiles")
+    PROFILING_MAX_STORED: int = 100
+    # Brotli/gzip response compression, negotiated with Accept-Encoding
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "image/svg+xml",
+        "text/",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Per-route overrides keyed by route unique id, e.g. {"users-read_user_dashboard": {"gzip": 9, "br": 6}}
+    COMPRESSION_ROUTE_LEVELS: dict[str, dict[str, int]] = {}
+    # Responses to mutating requests sent with an Idempotency-Key header are kept
+    # this long, and replayed to retries instead of running them again
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 60 * 60 * 24
+    # A running request renews its claim on the key every third of this; a retry
+    # meanwhile gets a 409, and once the claim lapses this long (e.g. the worker
+    # died) the first request is deemed lost and the retry runs
+    IDEMPOTENCY_PENDING_SECONDS: int = 60
+    # Rows removed per database transaction by the background deletion of accounts and users
+    DELETION_BATCH_SIZE: int = 1000
+    # In-process cache of exchange rates used for conversions done in Python
+    EXCHANGE_RATE_CACHE_TTL_SECONDS: int = 3600
+    EXCHANGE_RATE_CACHE_MAX_ENTRIES: int = 10_000
 
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
@@ -71,6 +121,32 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional replica serving the read-only GET endpoints (see app.core.read_routing),
+    # with the user and password of the primary. For local testing it can be a second
+    # database on the same server: POSTGRES_REPLICA_SERVER=localhost POSTGRES_REPLICA_DB=app_replica
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None  # Defaults to POSTGRES_PORT
+    POSTGRES_REPLICA_DB: str | None = None  # Defaults to POSTGRES_DB
+    # Seconds a user's reads stay on the primary after they write, to cover replication lag
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Connections each engine opens at startup (FastAPI lifespan), so the first
+    # requests of a worker don't pay for connecting; 0 to connect on demand
+    DB_PREWARM_CONNECTIONS: int = 2
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+psycopg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_REPLICA_DB or self.POSTGRES_DB,
+        )
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
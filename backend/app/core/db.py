@@ -1,12 +1,28 @@
 from sqlmodel import Session, create_engine, select
+from sqlalchemy.exc import OperationalError
 import logging
 
 from app import crud
 from app.core.config import settings
+from app.core.metrics import instrument_pool
+from app.core.query_stats import instrument_engine
 from app.models import User
 from app.schemas.user import UserCreate
 
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+instrument_engine(engine)
+instrument_pool(engine)
+
+# Optional read replica, used by the read-only endpoints through deps.ReadSessionDep.
+# Its connections are read-only, so a write routed there by mistake fails loudly.
+replica_engine = None
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    replica_engine = create_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI),
+        execution_options={"postgresql_readonly": True},
+    )
+    instrument_engine(replica_engine)
+    instrument_pool(replica_engine)
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
@@ -14,6 +30,30 @@ engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 
 logger = logging.getLogger(__name__)
 
+
+def prewarm_connections(count: int = settings.DB_PREWARM_CONNECTIONS) -> None:
+    """
+    Fill the pools of the primary (and replica) engine with `count` open connections,
+    at most the pool size, so the first requests of a worker don't wait on connecting.
+
+    Run at startup; an unreachable database is logged and left to the requests to report.
+    """
+    for db_engine in (engine, replica_engine):
+        if db_engine is None:
+            continue
+        connections = []
+        try:
+            # Held together so each one is a distinct new connection
+            for _ in range(min(count, db_engine.pool.size())):
+                connection = db_engine.connect()
+                connections.append(connection)
+                connection.exec_driver_sql("SELECT 1")
+        except OperationalError as e:
+            logger.warning(f"Could not pre-warm connections to {db_engine.url.host}: {e}")
+        finally:
+            for connection in connections:
+                connection.close()
+
 def init_db(session: Session) -> None:
     # Tables should be created with Alembic migrations
     # But if you don't want to use migrations, create
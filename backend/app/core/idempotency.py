@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import uuid
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.read_routing import SAFE_METHODS
+from app.core.security import user_from_token
+from app.crud.idempotency import (
+    claim_idempotency_key,
+    extend_idempotency_claim,
+    release_idempotency_key,
+    save_idempotent_response,
+)
+from app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# Set on responses replayed from a previous request with the same key
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Computed again for the replayed body
+UNSTORED_HEADERS = {"content-length"}
+
+
+def request_hash(scope: Scope, body: bytes) -> str:
+    """Fingerprint of a request, telling a retry apart from another request reusing its key."""
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _current_user_id(scope: Scope) -> uuid.UUID | None:
+    """ID of the user authenticated by the request's bearer token, as get_current_user checks it."""
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    with Session(engine) as session:
+        user = user_from_token(session, token)
+        return user.id if user else None
+
+
+def _claim(user_id: uuid.UUID, key: str, hashed: str) -> IdempotencyKey | None:
+    with Session(engine) as session:
+        return claim_idempotency_key(session=session, user_id=user_id, key=key, request_hash=hashed)
+
+
+def _extend(user_id: uuid.UUID, key: str, hashed: str) -> None:
+    with Session(engine) as session:
+        extend_idempotency_claim(session=session, user_id=user_id, key=key, request_hash=hashed)
+
+
+async def _keep_claimed(user_id: uuid.UUID, key: str, hashed: str) -> None:
+    """Renew the claim on a key until cancelled, once the request is done."""
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_PENDING_SECONDS / 3)
+        await run_in_threadpool(_extend, user_id, key, hashed)
+
+
+def _save(
+    user_id: uuid.UUID, key: str, status_code: int, headers: list[list[str]], body: bytes
+) -> None:
+    content_type = next((value for name, value in headers if name == "content-type"), None)
+    with Session(engine) as session:
+        save_idempotent_response(
+            session=session,
+            user_id=user_id,
+            key=key,
+            status_code=status_code,
+            content_type=content_type,
+            headers=headers,
+            body=body,
+        )
+
+
+def _release(user_id: uuid.UUID, key: str) -> None:
+    with Session(engine) as session:
+        release_idempotency_key(session=session, user_id=user_id, key=key)
+
+
+def _stored_response(stored: IdempotencyKey, hashed: str) -> Response:
+    if stored.request_hash != hashed:
+        return JSONResponse(
+            {"detail": f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request"},
+            status_code=422,
+        )
+    if stored.status_code is None:
+        return JSONResponse(
+            {"detail": f"A request with this {IDEMPOTENCY_KEY_HEADER} is still being processed"},
+            status_code=409,
+        )
+    if stored.response_headers is None:
+        # Stored before the headers were
+        return Response(
+            stored.response_body,
+            status_code=stored.status_code,
+            headers={REPLAYED_HEADER: "true"},
+            media_type=stored.content_type,
+        )
+    response = Response(stored.response_body, status_code=stored.status_code)
+    response.raw_headers += [
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.response_headers
+    ]
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+class IdempotencyMiddleware:
+    """
+    Run a mutating request sent with an `Idempotency-Key` header at most once per
+    user and key: a retry with the same key gets the stored response back, headers
+    included, plus an `Idempotent-Replayed: true` header, instead of running the
+    endpoint again.
+
+    A key reused for a different request (method, path, query or body) gets a 422,
+    a retry while the first request is still running a 409: the request renews its
+    claim on the key for as long as it runs. Responses with a 5xx
+    status are not stored, so those requests can be retried. Unauthenticated
+    requests are let through untouched, the endpoint rejects them.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = Headers(scope=scope).get(IDEMPOTENCY_KEY_HEADER) if scope["type"] == "http" else None
+        if key is None or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"{IDEMPOTENCY_KEY_HEADER} must have 1 to {MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+        user_id = await run_in_threadpool(_current_user_id, scope)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        hashed = request_hash(scope, body)
+
+        stored = await run_in_threadpool(_claim, user_id, key, hashed)
+        if stored is not None:
+            await _stored_response(stored, hashed)(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        headers: list[list[str]] = []
+        chunks: list[bytes] = []
+        completed = False
+
+        async def send_and_record(message: Message) -> None:
+            nonlocal status_code, completed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers.extend(
+                    [name, value]
+                    for name, value in Headers(raw=message["headers"]).items()
+                    if name not in UNSTORED_HEADERS
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                completed = not message.get("more_body", False)
+            await send(message)
+
+        keep_claimed = asyncio.create_task(_keep_claimed(user_id, key, hashed))
+        try:
+            await self.app(scope, receive_body, send_and_record)
+        finally:
+            keep_claimed.cancel()
+            if completed and status_code < 500:
+                await run_in_threadpool(_save, user_id, key, status_code, headers, b"".join(chunks))
+            else:
+                await run_in_threadpool(_release, user_id, key)
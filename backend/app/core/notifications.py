@@ -0,0 +1,77 @@
+import logging
+import queue
+import threading
+from types import TracebackType
+from typing import Any
+
+from app.utils import EmailData, send_email
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class NotificationQueue:
+    """
+    Bounded queue of outgoing emails delivered by a pool of worker threads.
+
+    Producers (e.g. a job paging through the database) only wait on SMTP when the
+    queue is full. Use it as a context manager: leaving the block waits until
+    every queued email has been delivered (or has failed) and stops the workers.
+    The keys given to enqueue of the delivered emails are then in `delivered`.
+    """
+
+    def __init__(self, workers: int = 4, maxsize: int = 1000) -> None:
+        self.workers = workers
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.delivered: list[Any] = []
+
+    def __enter__(self) -> "NotificationQueue":
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"notification-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def enqueue(self, *, email_to: str, email_data: EmailData, key: Any = None) -> None:
+        self._queue.put((email_to, email_data, key))
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            email_to, email_data, key = item
+            try:
+                send_email(
+                    email_to=email_to,
+                    subject=email_data.subject,
+                    html_content=email_data.html_content,
+                )
+            except Exception:
+                logger.exception(f"Failed to send notification to {email_to}")
+                with self._lock:
+                    self.failed += 1
+            else:
+                with self._lock:
+                    self.sent += 1
+                    if key is not None:
+                        self.delivered.append(key)
@@ -0,0 +1,212 @@
+import datetime
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from contextvars import Context, ContextVar
+from types import FrameType
+from urllib.parse import parse_qs
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import user_from_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SUFFIX = ".folded"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+# Profile being collected for the current request; copied into the threadpool
+# threads running the sync dependencies and endpoints of the request
+_active_profile: ContextVar["RequestProfiler | None"] = ContextVar("active_profile", default=None)
+
+
+def frame_label(frame: FrameType) -> str:
+    """module:function name of a frame, without the characters reserved by the folded format."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}".replace(";", ":").replace(" ", "_")
+
+
+def fold_stacks(stacks: Iterable[tuple[str, ...]]) -> str:
+    """
+    Render sampled stacks (outermost frame first) in the folded format read by
+    flamegraph.pl, speedscope and inferno: one "frame;frame;frame count" line per stack.
+    """
+    counts = Counter(stacks)
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(counts.items()))
+
+
+class RequestProfiler:
+    """
+    Sampling profiler for a single request.
+
+    A background thread snapshots the stacks of the threads working for the request
+    every PROFILING_SAMPLE_INTERVAL_MS: the event loop thread while the request's
+    coroutine is running on it, and the threadpool threads whose copied context
+    carries this profiler (sync dependencies and endpoints). Other requests served
+    concurrently by the worker are left out.
+    """
+
+    def __init__(self, interval_seconds: float, max_duration_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_duration_seconds = max_duration_seconds
+        self.stacks: list[tuple[str, ...]] = []
+        self._loop_frame: FrameType | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self, loop_frame: FrameType) -> None:
+        self._loop_frame = loop_frame
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_duration_seconds
+        own_thread_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds) and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack = self._request_stack(frame)
+                if stack:
+                    self.stacks.append(stack)
+
+    def _request_stack(self, frame: FrameType) -> tuple[str, ...] | None:
+        """Stack of the thread (outermost frame first) if it is working for this request."""
+        frames: list[FrameType] = []
+        belongs_to_request = False
+        current: FrameType | None = frame
+        while current is not None:
+            frames.append(current)
+            if current is self._loop_frame or self._runs_in_context(current):
+                belongs_to_request = True
+            current = current.f_back
+        if not belongs_to_request:
+            return None
+        return tuple(frame_label(f) for f in reversed(frames))
+
+    def _runs_in_context(self, frame: FrameType) -> bool:
+        # anyio's worker threads run each call through context.run() on the
+        # context copied from the request
+        if not frame.f_globals.get("__name__", "").startswith("anyio"):
+            return False
+        context = frame.f_locals.get("context")
+        return isinstance(context, Context) and context.get(_active_profile) is self
+
+
+def _requested(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER.encode() and value.strip() not in (b"", b"0", b"false"):
+            return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get(PROFILE_QUERY_PARAM, ["0"])[-1] not in ("", "0", "false")
+
+
+def _is_superuser(scope: Scope) -> bool:
+    """Same check as the get_current_active_superuser dependency, on the request's bearer token."""
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    with Session(engine) as session:
+        user = user_from_token(session, token)
+        return user is not None and user.is_superuser
+
+
+def new_profile_id() -> str:
+    return f"{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def profile_path(profile_id: str) -> str | None:
+    """File of a stored profile, or None if the id is malformed."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return os.path.join(settings.PROFILING_DIRECTORY, profile_id + PROFILE_SUFFIX)
+
+
+def list_profiles() -> list[str]:
+    """Ids of the stored profiles, newest first."""
+    if not os.path.isdir(settings.PROFILING_DIRECTORY):
+        return []
+    return sorted(
+        (
+            name.removesuffix(PROFILE_SUFFIX)
+            for name in os.listdir(settings.PROFILING_DIRECTORY)
+            if name.endswith(PROFILE_SUFFIX)
+        ),
+        reverse=True,
+    )
+
+
+def _store_profile(profile_id: str, scope: Scope, profiler: RequestProfiler) -> None:
+    os.makedirs(settings.PROFILING_DIRECTORY, exist_ok=True)
+    path = profile_path(profile_id)
+    assert path is not None
+    with open(path, "w") as f:
+        f.write(f"# {scope['method']} {scope['path']} {len(profiler.stacks)} samples\n")
+        f.write(fold_stacks(profiler.stacks))
+    for stale in list_profiles()[settings.PROFILING_MAX_STORED:]:
+        stale_path = profile_path(stale)
+        if stale_path:
+            os.remove(stale_path)
+    logger.info(f"Stored profile {profile_id} of {scope['method']} {scope['path']}")
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests of superusers that ask for it with an `X-Profile: 1` header or a
+    `?profile=1` query flag; the flag is ignored for anybody else.
+
+    The profile is stored in PROFILING_DIRECTORY in the folded stack format and its
+    id returned in an X-Profile-Id header; download it from GET /utils/profiles/{id}
+    and open it in speedscope or flamegraph.pl. Sampling every few milliseconds has
+    a low enough overhead to leave the mode available in production.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not _requested(scope)
+            or not await run_in_threadpool(_is_superuser, scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        profiler = RequestProfiler(
+            interval_seconds=settings.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+            max_duration_seconds=settings.PROFILING_MAX_DURATION_SECONDS,
+        )
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        token = _active_profile.set(profiler)
+        profiler.start(sys._getframe())
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            _active_profile.reset(token)
+            await run_in_threadpool(_store_profile, profile_id, scope, profiler)
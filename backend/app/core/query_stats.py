@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Number of statements and database time of a unit of work (a request, a test block)."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+    record_statements: bool = False
+    statements: list[tuple[str, Any]] = field(default_factory=list)
+
+    def add(self, statement: str, parameters: Any, executemany: bool, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        if self.record_statements:
+            self.statements.append((statement, None if executemany else parameters))
+
+
+# Stats of the request being served; copied into the threadpool running sync endpoints
+_request_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+# Process-wide collectors opened by capture_queries(), whatever the thread
+_captures: list[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of bound parameters, without their values (which may be personal data)."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        if parameters and isinstance(parameters[0], dict | list | tuple):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement run on `engine`, logging the slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        duration_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.add(statement, parameters, executemany, duration_ms)
+        if _captures:
+            with _captures_lock:
+                for capture in _captures:
+                    capture.add(statement, parameters, executemany, duration_ms)
+
+        if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning(
+                f"Slow query ({duration_ms:.1f}ms): {' '.join(statement.split())} "
+                f"parameters={parameter_shape(parameters)}"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):  # type: ignore[no-untyped-def]
+        # A failed statement never reaches after_cursor_execute: drop its start time,
+        # which would otherwise stay on the pooled connection
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
+def current_request_stats() -> QueryStats | None:
+    return _request_stats.get()
+
+
+@contextmanager
+def request_query_stats() -> Iterator[QueryStats]:
+    """Stats of the current request, starting them if no outer middleware did."""
+    stats = _request_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = QueryStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def capture_queries(record_statements: bool = True) -> Iterator[QueryStats]:
+    """
+    Collect every statement run in the process while the block runs, from any thread.
+
+    Meant for tests and benchmarks, where the requests run in another thread than
+    the caller (e.g. TestClient).
+    """
+    stats = QueryStats(record_statements=record_statements)
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+class QueryStatsMiddleware:
+    """
+    Track the queries of each HTTP request and report them in a Server-Timing header:
+
+        Server-Timing: db;dur=12.4;desc="5 queries", app;dur=31.0
+
+    Queries run after the response headers are sent (e.g. while streaming the
+    body) are not part of the header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                app_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            _request_stats.reset(token)
+            logger.debug(
+                f"{scope['method']} {scope['path']}: {stats.count} queries, {stats.duration_ms:.1f}ms in database"
+            )
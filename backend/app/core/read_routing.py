@@ -0,0 +1,68 @@
+import datetime
+import time
+from collections.abc import Mapping
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Methods that never write, the only ones whose reads may go to a replica
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Set on the responses to writes: until the timestamp it holds, reads go to the primary,
+# also after writes that leave User.data_changed_at alone
+PRIMARY_PIN_COOKIE = "read_primary_until"
+
+
+def reads_from_replica(
+    method: str, data_changed_at: datetime.datetime | None, cookies: Mapping[str, str]
+) -> bool:
+    """
+    Whether the reads of a request can be served by the replica.
+
+    `data_changed_at` is when the user's data was last written (User.data_changed_at),
+    loaded from the primary with the authenticated user. Writes through any worker
+    keep the user's reads on the primary for READ_YOUR_WRITES_SECONDS, the replication
+    lag the replica is allowed, whether the client keeps cookies or not.
+    """
+    if method not in SAFE_METHODS:
+        return False
+    if data_changed_at is not None and datetime.datetime.now() - data_changed_at < datetime.timedelta(
+        seconds=settings.READ_YOUR_WRITES_SECONDS
+    ):
+        return False
+    try:
+        pinned_until = float(cookies.get(PRIMARY_PIN_COOKIE, 0))
+    except ValueError:
+        pinned_until = 0
+    return pinned_until <= time.time()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin the client to the primary database after a successful write, with a cookie
+    holding the time until which its reads skip the replica:
+
+        Set-Cookie: read_primary_until=1760886000.5; Max-Age=5; Path=/; HttpOnly; SameSite=lax
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                ttl = settings.READ_YOUR_WRITES_SECONDS
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + ttl:.1f}; Max-Age={int(ttl) + 1}; "
+                    "Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,9 +2,14 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import jwt
+from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
+from pydantic import ValidationError
+from sqlmodel import Session
 
 from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import TokenPayload
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -25,3 +30,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def user_from_token(session: Session, token: str) -> User | None:
+    """
+    Active user an access token was issued to, or None when the token is invalid
+    or expired or the user is gone or inactive. Backs the get_current_user
+    dependency and the middlewares that run before the dependencies.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        token_data = TokenPayload(**payload)
+    except (InvalidTokenError, ValidationError):
+        return None
+    user = session.get(User, token_data.sub)
+    if not user or not user.is_active:
+        return None
+    return user
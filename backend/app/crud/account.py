@@ -1,9 +1,12 @@
 import uuid
 import datetime
 
-from typing import List, Optional, Dict, Any
+from typing import Collection, List, Optional, Dict, Any
 from sqlmodel import select, Session
 
+from app.core.cache import bump_user_data_version
+from app.core.config import settings
+from app.crud.projection import projection_options
 from app.models.account import Account
 from app.schemas.account import AccountCreate, AccountUpdate
 
@@ -21,13 +24,13 @@ def get_account_by_name(db: Session, user_id: uuid.UUID, name: str) -> Optional[
 
 
 def get_accounts(
-    db: Session, user_id: uuid.UUID
+    db: Session, user_id: uuid.UUID, fields: Optional[Collection[str]] = None
 ) -> List[Account]:
-    """Get all accounts for a user"""
-    return db.exec(
-        select(Account)
-        .where(Account.user_id == user_id)
-    ).all()
+    """Get all accounts for a user, loading only `fields` when given"""
+    statement = select(Account).where(Account.user_id == user_id)
+    if fields is not None:
+        statement = statement.options(*projection_options(Account, fields))
+    return db.exec(statement).all()
 
 
 def calculate_account_balance(db: Session, account_id: uuid.UUID) -> float:
@@ -60,8 +63,12 @@ def update_account_balance(db: Session, account_id: uuid.UUID) -> None:
     account = get_account(db, account_id)
     if account:
         balance = calculate_account_balance(db, account_id)
+        # Skip the write (and the cache invalidation) when the stored balance is current
+        if account.balance == balance:
+            return
         account.balance = balance
         db.add(account)
+        bump_user_data_version(session=db, user_id=account.user_id)
         db.commit()
         db.refresh(account)
 
@@ -78,6 +85,7 @@ def create_account(db: Session, account: AccountCreate, user_id: uuid.UUID) -> A
     db_account = Account(**account_data)
     
     db.add(db_account)
+    bump_user_data_version(session=db, user_id=user_id)
     db.commit()
     db.refresh(db_account)
     return db_account
@@ -107,36 +115,33 @@ def update_account(
     db_account.balance = current_balance
     
     db.add(db_account)
+    bump_user_data_version(session=db, user_id=db_account.user_id)
     db.commit()
     db.refresh(db_account)
     return db_account
 
 
 def delete_account(db: Session, account_id: uuid.UUID) -> bool:
-    """Delete an account and all its associated entities: transactions, debts, and subscriptions"""
-    from app.models.transaction import Transaction
-    from app.models.debt import Debt
-    from app.models.subscription import Subscription
-    from sqlalchemy import delete
+    """Delete an account and all its associated entities right away, in bounded batches
+
+    The API schedules a deletion job instead (see app.crud.deletion), which runs the
+    same steps in the background and reports its progress.
+    """
+    from app.crud.deletion import account_deletion_steps, has_rows, run_step_batch
     
     db_account = get_account(db, account_id)
     if not db_account:
         return False
+    user_id = db_account.user_id
     
-    # Eliminar todas las transacciones asociadas a la cuenta
-    delete_transactions_stmt = delete(Transaction).where(Transaction.account_id == account_id)
-    db.execute(delete_transactions_stmt)
-    
-    # Eliminar todas las deudas asociadas a la cuenta
-    delete_debts_stmt = delete(Debt).where(Debt.account_id == account_id)
-    db.execute(delete_debts_stmt)
+    # Transacciones, snapshots, deudas, suscripciones y finalmente la cuenta,
+    # cada paso por lotes para no bloquear muchas filas a la vez
+    for step in account_deletion_steps(account_id):
+        while has_rows(session=db, step=step):
+            run_step_batch(session=db, step=step, batch_size=settings.DELETION_BATCH_SIZE)
+            db.commit()
     
-    # Eliminar todas las suscripciones asociadas a la cuenta
-    delete_subscriptions_stmt = delete(Subscription).where(Subscription.account_id == account_id)
-    db.execute(delete_subscriptions_stmt)
-    
-    # Finalmente, eliminar la cuenta
-    db.delete(db_account)
+    bump_user_data_version(session=db, user_id=user_id)
     db.commit()
     return True
 
@@ -156,7 +161,7 @@ def get_account_with_details(
         account_dict["user"] = {
             "id": db_account.user.id,
             "email": db_account.user.email,
-            "full_name": db_account.user.full_name,
+            "full_name": f"{db_account.user.first_name} {db_account.user.last_name}",
         }
     
     # Add currency details
@@ -196,13 +201,20 @@ def has_related_entities(db: Session, account_id: uuid.UUID) -> bool:
     Note: Transactions are now handled automatically and deleted in cascade when
     an account is deleted, so they are no longer considered a restriction for deletion.
     """
-    account = get_account(db, account_id)
-    if not account:
-        return False
+    from app.models.debt import Debt
+    from app.models.subscription import Subscription
+    from sqlalchemy import exists, or_
     
-    # Solo verificamos deudas y suscripciones, ya que las transacciones se eliminan automáticamente
-    return (len(account.debts) > 0 or 
-            len(account.subscriptions) > 0)
+    # Solo verificamos deudas y suscripciones, ya que las transacciones se eliminan automáticamente.
+    # EXISTS se detiene en la primera fila, sin cargar las relaciones de la cuenta
+    return db.exec(
+        select(
+            or_(
+                exists().where(Debt.account_id == account_id),
+                exists().where(Subscription.account_id == account_id),
+            )
+        )
+    ).one()
 
 
 def get_transaction_count(db: Session, account_id: uuid.UUID) -> int:
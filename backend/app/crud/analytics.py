@@ -0,0 +1,156 @@
+import uuid
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Date, cast, tuple_
+from sqlmodel import Session, func, select
+
+from app.core.cache import aggregate_cache
+from app.crud.exchange_rate import converted_amount, get_user_currency_id, missing_rate
+from app.crud.transaction import transaction_conditions
+from app.models import Account, Category, Currency, PaymentMethod, Transaction
+from app.models.enums import TransactionType
+from app.schemas.analytics import AnalyticsDimension, AnalyticsResponse
+from app.schemas.transaction import TransactionFilters
+
+# Dimensions naming a row of another table: (transaction column, table, label column)
+_ENTITY_DIMENSIONS = {
+    AnalyticsDimension.CATEGORY: (Transaction.category_id, Category, Category.name),
+    AnalyticsDimension.ACCOUNT: (Transaction.account_id, Account, Account.name),
+    AnalyticsDimension.PAYMENT_METHOD: (Transaction.payment_method_id, PaymentMethod, PaymentMethod.name),
+    AnalyticsDimension.CURRENCY: (Transaction.currency_id, Currency, Currency.code),
+}
+# Periods, as date_trunc units
+_PERIOD_DIMENSIONS = {
+    AnalyticsDimension.WEEK: "week",
+    AnalyticsDimension.MONTH: "month",
+    AnalyticsDimension.QUARTER: "quarter",
+    AnalyticsDimension.YEAR: "year",
+}
+
+
+def get_spending_analytics(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    group_by: Sequence[AnalyticsDimension],
+    filters: Optional[TransactionFilters] = None,
+    rollup: bool = False,
+) -> AnalyticsResponse:
+    """
+    Income, expense and number of transactions of a user per combination of the
+    `group_by` dimensions, computed by the database in a single GROUP BY query.
+
+    The result is cached per user and data version, like the other aggregates.
+
+    Args:
+        session: Database session
+        user_id: User ID to filter by
+        group_by: Dimensions to group by, in order (none for a single total row)
+        filters: Optional filters, see transaction_conditions
+        rollup: Whether to add the subtotal rows of GROUP BY ROLLUP
+
+    Returns:
+        The breakdown in columnar form, see AnalyticsResponse
+    """
+    group_by = tuple(group_by)
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="spending_analytics",
+        period=(group_by, rollup, filters.model_dump_json() if filters else None),
+        compute=lambda: _compute_spending_analytics(session, user_id, group_by, filters, rollup),
+    )
+
+
+def _compute_spending_analytics(
+    session: Session,
+    user_id: uuid.UUID,
+    group_by: Sequence[AnalyticsDimension],
+    filters: Optional[TransactionFilters],
+    rollup: bool,
+) -> AnalyticsResponse:
+    target_currency_id = get_user_currency_id(session=session, user_id=user_id)
+    amount = converted_amount(
+        amount=Transaction.amount,
+        currency_id=Transaction.currency_id,
+        on=Transaction.date,
+        target_currency_id=target_currency_id,
+    )
+    rollup = rollup and bool(group_by)
+
+    columns: List[Any] = []
+    # One element per dimension, as listed in GROUP BY / ROLLUP
+    group_elements: List[Any] = []
+    # One expression per dimension, telling GROUPING() whether it was rolled up
+    grouping_keys: List[Any] = []
+    order_by: List[Any] = []
+    joins = []
+    for dimension in group_by:
+        if dimension in _ENTITY_DIMENSIONS:
+            key, table, label = _ENTITY_DIMENSIONS[dimension]
+            columns += [key.label(f"{dimension.value}_id"), label.label(dimension.value)]
+            group_elements.append(tuple_(key, label) if rollup else key)
+            if not rollup:
+                group_elements.append(label)
+            joins.append((table, key == table.id))
+            value = label
+        else:
+            if dimension in _PERIOD_DIMENSIONS:
+                key = cast(func.date_trunc(_PERIOD_DIMENSIONS[dimension], Transaction.date), Date)
+            elif dimension == AnalyticsDimension.DAY:
+                key = Transaction.date
+            else:
+                key = Transaction.transaction_type
+            columns.append(key.label(dimension.value))
+            group_elements.append(key)
+            value = key
+        grouping_keys.append(key)
+        # Subtotal rows come right after the rows they add up
+        if rollup:
+            order_by.append(func.grouping(key))
+        order_by.append(value)
+
+    if rollup:
+        columns.append(func.grouping(*grouping_keys).label("grouping"))
+    columns += [
+        func.coalesce(
+            func.sum(amount).filter(Transaction.transaction_type == TransactionType.INCOME), 0
+        ).label("income"),
+        func.coalesce(
+            func.sum(amount).filter(Transaction.transaction_type == TransactionType.EXPENSE), 0
+        ).label("expense"),
+        func.count(Transaction.id).label("count"),
+        # Left out of income and expense for lack of an exchange rate
+        func.count(Transaction.id).filter(
+            missing_rate(
+                currency_id=Transaction.currency_id,
+                on=Transaction.date,
+                target_currency_id=target_currency_id,
+            )
+        ).label("unconverted"),
+    ]
+
+    statement = select(*columns).select_from(Transaction)
+    for table, on in joins:
+        statement = statement.outerjoin(table, on)
+    statement = statement.where(*transaction_conditions(user_id=user_id, filters=filters))
+    if rollup:
+        statement = statement.group_by(func.rollup(*group_elements))
+    elif group_elements:
+        statement = statement.group_by(*group_elements)
+    statement = statement.order_by(*order_by)
+
+    rows = session.exec(statement).all()
+    names = [column.name for column in columns]
+    data = {name: [row[index] for row in rows] for index, name in enumerate(names)}
+    for measure in ("income", "expense"):
+        data[measure] = [float(value) for value in data[measure]]
+
+    return AnalyticsResponse(
+        group_by=list(group_by),
+        rollup=rollup,
+        currency_id=target_currency_id,
+        columns=names,
+        data=data,
+        row_count=len(rows),
+    )
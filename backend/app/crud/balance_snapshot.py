@@ -0,0 +1,436 @@
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Date, and_, bindparam, case, cast, column, delete, insert, literal, literal_column, true, update, values,
+)
+from sqlmodel import Session, func, or_, select
+
+from app.core.cache import aggregate_cache
+from app.crud.exchange_rate import converted_amount, get_user_currency_id
+from app.models.account import Account
+from app.models.account_balance_snapshot import AccountBalanceSnapshot
+from app.models.enums import TransactionType
+from app.models.transaction import Transaction
+from app.schemas.balance_snapshot import AccountBalanceHistory, BalanceInterval, NetWorthSeries
+
+# Application-wide key of the advisory lock serializing snapshot refreshes across workers
+SNAPSHOT_ADVISORY_LOCK_ID = 730252
+# Longest balance series served, in points
+MAX_SERIES_POINTS = 3660
+
+# Effect of a transaction on the balance of its account, as in calculate_account_balance
+signed_amount = case(
+    (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+    (Transaction.transaction_type == TransactionType.EXPENSE, -Transaction.amount),
+    else_=0.0,
+)
+
+
+def balance_change(transaction: Transaction) -> float:
+    """Effect of a transaction on the balance of its account: income adds, expenses subtract."""
+    if not transaction.is_active or not transaction.account_id:
+        return 0.0
+    if transaction.transaction_type == TransactionType.INCOME:
+        return transaction.amount
+    if transaction.transaction_type == TransactionType.EXPENSE:
+        return -transaction.amount
+    return 0.0
+
+
+def apply_balance_changes(
+    *, session: Session, changes: Iterable[Tuple[Optional[uuid.UUID], date, float]]
+) -> None:
+    """
+    Add (account_id, date, amount) changes to the snapshots taken on or after their
+    date, in the caller's database transaction.
+
+    Every write to a transaction calls this before committing, so the snapshots stay
+    in step with the transactions they sum up. Changes are merged per account and
+    date and sent as one executemany UPDATE.
+    """
+    merged: Dict[Tuple[uuid.UUID, date], float] = defaultdict(float)
+    for account_id, on, amount in changes:
+        if account_id and amount:
+            merged[(account_id, on)] += amount
+    if not merged:
+        return
+
+    snapshot_table = AccountBalanceSnapshot.__table__
+    session.execute(
+        update(snapshot_table)
+        .where(
+            snapshot_table.c.account_id == bindparam("b_account_id"),
+            snapshot_table.c.snapshot_date >= bindparam("b_on"),
+        )
+        .values(
+            balance=snapshot_table.c.balance + bindparam("b_amount"),
+            updated_at=datetime.now(),
+        ),
+        [
+            {"b_account_id": account_id, "b_on": on, "b_amount": amount}
+            for (account_id, on), amount in merged.items()
+        ],
+    )
+
+
+def last_closed_month_end(as_of: Optional[date] = None) -> date:
+    """Last day of the month before the one `as_of` (defaults to today) falls in."""
+    return (as_of or date.today()).replace(day=1) - timedelta(days=1)
+
+
+def backfill_balance_snapshots(
+    *,
+    session: Session,
+    through: Optional[date] = None,
+    account_ids: Optional[Collection[uuid.UUID]] = None,
+) -> int:
+    """
+    Rebuild the month-end snapshots of accounts from their transactions, in a single
+    INSERT ... SELECT: the net of each account per month, one row per month from its
+    first transaction through `through`, and a running SUM() OVER the months.
+
+    Existing snapshots of the accounts are replaced. Does not commit.
+
+    Args:
+        session: Database session
+        through: Last snapshot date (defaults to the end of the last closed month)
+        account_ids: Accounts to rebuild (all of them when None)
+
+    Returns:
+        Number of snapshots written
+    """
+    through = through or last_closed_month_end()
+    account_filter = [] if account_ids is None else [Transaction.account_id.in_(list(account_ids))]
+
+    delete_statement = delete(AccountBalanceSnapshot)
+    if account_ids is not None:
+        delete_statement = delete_statement.where(
+            AccountBalanceSnapshot.account_id.in_(list(account_ids))
+        )
+    session.execute(delete_statement)
+
+    month = cast(func.date_trunc("month", Transaction.date), Date)
+    monthly = (
+        select(
+            Transaction.account_id,
+            month.label("month"),
+            func.sum(signed_amount).label("net"),
+        )
+        .where(
+            Transaction.account_id.is_not(None),
+            Transaction.is_active == True,
+            Transaction.date <= through,
+            *account_filter,
+        )
+        .group_by(Transaction.account_id, month)
+        .cte("monthly")
+    )
+    first_months = (
+        select(monthly.c.account_id, func.min(monthly.c.month).label("first_month"))
+        .group_by(monthly.c.account_id)
+        .cte("first_months")
+    )
+    month_start = func.generate_series(
+        first_months.c.first_month, through.replace(day=1), literal_column("interval '1 month'")
+    ).table_valued("month_start").render_derived(name="month_starts")
+    months = (
+        select(first_months.c.account_id, cast(month_start.c.month_start, Date).label("month"))
+        .select_from(first_months)
+        .join(month_start, true())
+        .cte("months")
+    )
+    snapshots = (
+        select(
+            months.c.account_id,
+            cast(months.c.month + literal_column("interval '1 month - 1 day'"), Date),
+            func.sum(func.coalesce(monthly.c.net, 0)).over(
+                partition_by=months.c.account_id, order_by=months.c.month
+            ),
+            literal(datetime.now(), AccountBalanceSnapshot.__table__.c.updated_at.type),
+            Account.user_id,
+        )
+        .select_from(months)
+        .join(Account, Account.id == months.c.account_id)
+        .outerjoin(
+            monthly,
+            and_(monthly.c.account_id == months.c.account_id, monthly.c.month == months.c.month),
+        )
+    )
+    snapshot_table = AccountBalanceSnapshot.__table__
+    inserted = (
+        insert(snapshot_table)
+        .from_select(["account_id", "snapshot_date", "balance", "updated_at", "user_id"], snapshots)
+        .returning(snapshot_table.c.account_id)
+        .cte("inserted")
+    )
+    return session.exec(select(func.count()).select_from(inserted)).one()
+
+
+def refresh_balance_snapshots(*, session: Session, as_of: Optional[date] = None) -> int:
+    """
+    Nightly job: rebuild the snapshots of the accounts that are behind.
+
+    An account is behind when it has active transactions up to the end of the last closed
+    month but no snapshot for that month yet, or when one of them was changed after
+    its snapshots were (a write that did not go through apply_balance_changes).
+    Runs in one database transaction, guarded by a transaction-level advisory lock:
+    when another worker holds it, this run does nothing.
+
+    Args:
+        session: Database session
+        as_of: Reference date (defaults to today)
+
+    Returns:
+        Number of snapshots written
+    """
+    through = last_closed_month_end(as_of)
+    acquired = session.exec(select(func.pg_try_advisory_xact_lock(SNAPSHOT_ADVISORY_LOCK_ID))).one()
+    if not acquired:
+        session.rollback()
+        return 0
+
+    latest = (
+        select(
+            AccountBalanceSnapshot.account_id,
+            func.max(AccountBalanceSnapshot.snapshot_date).label("snapshot_date"),
+            func.max(AccountBalanceSnapshot.updated_at).label("updated_at"),
+        )
+        .group_by(AccountBalanceSnapshot.account_id)
+        .subquery()
+    )
+    stale_account_ids = session.exec(
+        select(Transaction.account_id)
+        .distinct()
+        .outerjoin(latest, latest.c.account_id == Transaction.account_id)
+        .where(
+            Transaction.account_id.is_not(None),
+            Transaction.is_active == True,
+            Transaction.date <= through,
+            or_(
+                latest.c.account_id.is_(None),
+                latest.c.snapshot_date < through,
+                Transaction.updated_at > latest.c.updated_at,
+            ),
+        )
+    ).all()
+
+    written = 0
+    if stale_account_ids:
+        written = backfill_balance_snapshots(
+            session=session, through=through, account_ids=stale_account_ids
+        )
+    session.commit()
+    return written
+
+
+def get_balance_on(*, session: Session, account_id: uuid.UUID, on: date) -> float:
+    """
+    Balance of an account at the end of a day: its latest snapshot on or before
+    that day plus the transactions after the snapshot.
+    """
+    snapshot = session.exec(
+        select(AccountBalanceSnapshot.snapshot_date, AccountBalanceSnapshot.balance)
+        .where(
+            AccountBalanceSnapshot.account_id == account_id,
+            AccountBalanceSnapshot.snapshot_date <= on,
+        )
+        .order_by(AccountBalanceSnapshot.snapshot_date.desc())
+        .limit(1)
+    ).first()
+    conditions = [
+        Transaction.account_id == account_id,
+        Transaction.is_active == True,
+        Transaction.date <= on,
+    ]
+    if snapshot:
+        conditions.append(Transaction.date > snapshot.snapshot_date)
+    delta = session.exec(select(func.coalesce(func.sum(signed_amount), 0)).where(*conditions)).one()
+    return (snapshot.balance if snapshot else 0.0) + float(delta)
+
+
+def get_balance_history(
+    *, session: Session, account: Account, date_from: date, date_to: date
+) -> AccountBalanceHistory:
+    """
+    End-of-day balance of an account for every day from `date_from` to `date_to`.
+
+    The opening balance comes from the snapshots (see get_balance_on), the days
+    after it from the transactions of the range. The result is cached per user
+    and data version, like the other aggregates.
+
+    Args:
+        session: Database session
+        account: The account
+        date_from: First day
+        date_to: Last day
+
+    Returns:
+        The balances, one per day
+    """
+    _check_range(date_from, date_to, (date_to - date_from).days + 1)
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=account.user_id,
+        kind="balance_history",
+        period=(account.id, date_from, date_to),
+        compute=lambda: _compute_balance_history(session, account, date_from, date_to),
+    )
+
+
+def get_net_worth_series(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    date_from: date,
+    date_to: date,
+    interval: BalanceInterval = BalanceInterval.MONTH,
+) -> NetWorthSeries:
+    """
+    Net worth of a user at the end of each `interval` from `date_from` to `date_to`
+    (the last point being `date_to`), in their default currency.
+
+    Each point is answered from the latest snapshot of every account on or before
+    it plus the transactions since, converted at the rate in force on that date, in
+    a single query. The result is cached per user and data version.
+
+    Args:
+        session: Database session
+        user_id: ID of the user
+        date_from: Start of the series
+        date_to: End of the series
+        interval: Spacing of the points
+
+    Returns:
+        The series, one value per point
+    """
+    points = _series_points(date_from, date_to, interval)
+    _check_range(date_from, date_to, len(points))
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="net_worth",
+        period=(date_from, date_to, interval),
+        compute=lambda: _compute_net_worth_series(session, user_id, points, interval),
+    )
+
+
+def _check_range(date_from: date, date_to: date, points: int) -> None:
+    if date_from > date_to:
+        raise ValueError("date_from must be on or before date_to")
+    if points > MAX_SERIES_POINTS:
+        raise ValueError(f"The series cannot have more than {MAX_SERIES_POINTS} points")
+
+
+def _series_points(date_from: date, date_to: date, interval: BalanceInterval) -> List[date]:
+    """Last day of each period (ISO week, month) between the dates, and `date_to`."""
+    if interval == BalanceInterval.DAY:
+        first = date_from
+    elif interval == BalanceInterval.WEEK:
+        first = date_from + timedelta(days=6 - date_from.weekday())
+    else:
+        first = last_closed_month_end(date_from.replace(day=28) + timedelta(days=4))
+    points = []
+    day = first
+    while day < date_to and len(points) <= MAX_SERIES_POINTS:
+        points.append(day)
+        day = _next_series_point(day, interval)
+    points.append(date_to)
+    return points
+
+
+def _next_series_point(day: date, interval: BalanceInterval) -> date:
+    """Last day of the period after the one `day` ends."""
+    if interval == BalanceInterval.DAY:
+        return day + timedelta(days=1)
+    if interval == BalanceInterval.WEEK:
+        return day + timedelta(days=7)
+    return last_closed_month_end(day + timedelta(days=32))
+
+
+def _compute_balance_history(
+    session: Session, account: Account, date_from: date, date_to: date
+) -> AccountBalanceHistory:
+    opening_balance = get_balance_on(
+        session=session, account_id=account.id, on=date_from - timedelta(days=1)
+    )
+    daily = dict(
+        session.exec(
+            select(Transaction.date, func.sum(signed_amount))
+            .where(
+                Transaction.account_id == account.id,
+                Transaction.is_active == True,
+                Transaction.date >= date_from,
+                Transaction.date <= date_to,
+            )
+            .group_by(Transaction.date)
+        ).all()
+    )
+    dates = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    balances = accumulate((daily.get(day, 0.0) for day in dates), initial=opening_balance)
+    return AccountBalanceHistory(
+        account_id=account.id,
+        currency_id=account.currency_id,
+        date_from=date_from,
+        date_to=date_to,
+        opening_balance=opening_balance,
+        dates=dates,
+        balances=[round(balance, 2) for balance in list(balances)[1:]],
+    )
+
+
+def _compute_net_worth_series(
+    session: Session, user_id: uuid.UUID, points: List[date], interval: BalanceInterval
+) -> NetWorthSeries:
+    target_currency_id = get_user_currency_id(session=session, user_id=user_id)
+    series = values(column("point_date", Date), name="points").data([(point,) for point in points])
+
+    snapshot = (
+        select(AccountBalanceSnapshot.snapshot_date, AccountBalanceSnapshot.balance)
+        .where(
+            AccountBalanceSnapshot.account_id == Account.id,
+            AccountBalanceSnapshot.snapshot_date <= series.c.point_date,
+        )
+        .order_by(AccountBalanceSnapshot.snapshot_date.desc())
+        .limit(1)
+        .lateral("snapshot")
+    )
+    delta = (
+        select(func.coalesce(func.sum(signed_amount), 0))
+        .where(
+            Transaction.account_id == Account.id,
+            Transaction.is_active == True,
+            Transaction.date <= series.c.point_date,
+            Transaction.date > func.coalesce(snapshot.c.snapshot_date, date.min),
+        )
+        .scalar_subquery()
+    )
+    balance = func.coalesce(snapshot.c.balance, 0) + delta
+    net_worth = func.coalesce(
+        func.sum(
+            converted_amount(
+                amount=balance,
+                currency_id=Account.currency_id,
+                on=series.c.point_date,
+                target_currency_id=target_currency_id,
+            )
+        ),
+        0,
+    )
+    rows = session.exec(
+        select(series.c.point_date, net_worth)
+        .select_from(series)
+        .outerjoin(Account, Account.user_id == user_id)
+        .outerjoin(snapshot, true())
+        .group_by(series.c.point_date)
+        .order_by(series.c.point_date)
+    ).all()
+    return NetWorthSeries(
+        currency_id=target_currency_id,
+        interval=interval,
+        dates=[row[0] for row in rows],
+        net_worth=[round(float(row[1]), 2) for row in rows],
+    )
@@ -1,11 +1,10 @@
 import uuid
 import calendar
 from datetime import datetime, date
-from typing import Sequence, Optional, Dict, Any, List, Tuple, Union
+from typing import Collection, Sequence, Optional, Dict, Any, List, Tuple, Union
 from decimal import Decimal
 
 from sqlmodel import Session, select, func, and_
-from sqlalchemy import extract
 from sqlalchemy.orm import selectinload
 
 from app.models.budget import Budget
@@ -13,7 +12,12 @@ from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.currency import Currency
 from app.models.enums import TransactionType
+from app.core.cache import aggregate_cache, bump_user_data_version
+from app.crud.exchange_rate import converted_amount, get_user_currency_id
+from app.crud.projection import projection_options
+from app.crud.transaction import transaction_conditions
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetSummary
+from app.schemas.transaction import TransactionFilters
 
 
 def get_budget(
@@ -27,7 +31,12 @@ def get_budget(
 
 
 def get_budgets(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Collection[str]] = None,
 ) -> Sequence[Budget]:
     """
     Get multiple budgets for a specific user with pagination.
@@ -37,6 +46,7 @@ def get_budgets(
         user_id: User ID to filter by
         skip: Number of records to skip (for pagination)
         limit: Maximum number of records to return
+        fields: Optional attributes to load (all when None), see projection_options
     
     Returns:
         A sequence of Budget objects
@@ -46,10 +56,13 @@ def get_budgets(
         select(Budget)
         .where(Budget.user_id == user_id)
         .order_by(Budget.created_at.desc())
-        .options(selectinload(Budget.category))
         .offset(skip)
         .limit(limit)
     )
+    if fields is None:
+        statement = statement.options(selectinload(Budget.category))
+    else:
+        statement = statement.options(*projection_options(Budget, fields))
     
     # Execute the query and get the results
     budgets = session.exec(statement).all()
@@ -91,6 +104,7 @@ def create_budget(
     db_budget = Budget.model_validate(budget_data)
     
     session.add(db_budget)
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(db_budget)
     
@@ -119,6 +133,7 @@ def update_budget(
         setattr(db_budget, key, value)
     
     session.add(db_budget)
+    bump_user_data_version(session=session, user_id=db_budget.user_id)
     session.commit()
     session.refresh(db_budget)
     
@@ -130,6 +145,7 @@ def delete_budget(
 ) -> None:
     """Delete a budget."""
     session.delete(db_budget)
+    bump_user_data_version(session=session, user_id=db_budget.user_id)
     session.commit()
 
 
@@ -185,6 +201,20 @@ def get_budget_progress(
     year = year or today.year
     month = month or today.month
     
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="budget_progress",
+        period=(budget_id, year, month),
+        compute=lambda: _compute_budget_progress(
+            session=session, budget_id=budget_id, user_id=user_id, year=year, month=month
+        ),
+    )
+
+
+def _compute_budget_progress(
+    *, session: Session, budget_id: uuid.UUID, user_id: uuid.UUID, year: int, month: int
+) -> Optional[Dict[str, Any]]:
     # Get the budget
     budget = get_budget(session=session, budget_id=budget_id, user_id=user_id)
     if not budget or not budget.category_id:
@@ -195,13 +225,10 @@ def get_budget_progress(
     
     # Calculate total spent amount for the specified month for transactions associated with this budget's category
     statement = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(_amount_in_user_currency(session=session, user_id=user_id)))
         .where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
+            *month_expense_conditions(user_id=user_id, year=year, month=month),
             Transaction.category_id == budget.category_id,
-            extract('year', Transaction.date) == year,
-            extract('month', Transaction.date) == month
         )
     )
     
@@ -251,32 +278,42 @@ def get_all_budgets_progress(
     year = year or today.year
     month = month or today.month
     
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="all_budgets_progress",
+        period=(year, month),
+        compute=lambda: _compute_all_budgets_progress(
+            session=session, user_id=user_id, year=year, month=month
+        ),
+    )
+
+
+def _compute_all_budgets_progress(
+    *, session: Session, user_id: uuid.UUID, year: int, month: int
+) -> List[Dict[str, Any]]:
     # Get all budgets for the user
     budgets = get_budgets(session=session, user_id=user_id, limit=1000)
     
     # Get the user's currency information
     currency_info = get_user_currency(session=session, user_id=user_id)
     
-    # Get all expense transactions for the user for the specified month
-    transactions_statement = (
-        select(Transaction.amount, Transaction.category_id) # Select only needed fields
+    # Total spent per category for the specified month, in the user's currency
+    spent_statement = (
+        select(
+            Transaction.category_id,
+            func.sum(_amount_in_user_currency(session=session, user_id=user_id)),
+        )
         .where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
+            *month_expense_conditions(user_id=user_id, year=year, month=month),
             Transaction.category_id.isnot(None), # Ensure transactions have a category to be counted
-            extract('year', Transaction.date) == year,
-            extract('month', Transaction.date) == month
         )
+        .group_by(Transaction.category_id)
     )
-    monthly_transactions = session.exec(transactions_statement).all()
-    
-    # Calculate total spent amount per category_id for the specified month
-    spent_per_category: Dict[uuid.UUID, Decimal] = {}
-    for amount, category_id_val in monthly_transactions:
-        if category_id_val: # Should always be true due to the .where clause
-            # Ensure amount is Decimal, though it should be from the model
-            current_amount = Decimal(amount) if not isinstance(amount, Decimal) else amount
-            spent_per_category[category_id_val] = spent_per_category.get(category_id_val, Decimal(0)) + current_amount
+    spent_per_category: Dict[uuid.UUID, Decimal] = {
+        category_id_val: Decimal(total or 0)
+        for category_id_val, total in session.exec(spent_statement).all()
+    }
     
     # Calculate progress for each budget
     results = []
@@ -335,6 +372,20 @@ def get_budget_summary(
     year = year or today.year
     month = month or today.month
     
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="budget_summary",
+        period=(year, month),
+        compute=lambda: _compute_budget_summary(
+            session=session, user_id=user_id, year=year, month=month
+        ),
+    )
+
+
+def _compute_budget_summary(
+    *, session: Session, user_id: uuid.UUID, year: int, month: int
+) -> BudgetSummary:
     # Get the user's currency information
     currency_info = get_user_currency(session=session, user_id=user_id)
     
@@ -358,13 +409,10 @@ def get_budget_summary(
     total_spent = Decimal(0)
     if active_budget_category_ids:
         transaction_sum_statement = (
-            select(func.sum(Transaction.amount))
+            select(func.sum(_amount_in_user_currency(session=session, user_id=user_id)))
             .where(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == TransactionType.EXPENSE,
-                Transaction.category_id.in_(active_budget_category_ids), 
-                extract('year', Transaction.date) == year,
-                extract('month', Transaction.date) == month
+                *month_expense_conditions(user_id=user_id, year=year, month=month),
+                Transaction.category_id.in_(active_budget_category_ids),
             )
         )
         total_spent = Decimal(session.exec(transaction_sum_statement).one_or_none() or 0)
@@ -387,3 +435,38 @@ def get_budget_summary(
         currency_symbol=currency_info["currency_symbol"],
         currency_code=currency_info["currency_code"]
     )
+
+
+def _amount_in_user_currency(*, session: Session, user_id: uuid.UUID) -> Any:
+    """Transaction amount converted to the user's default currency at the rate of its date."""
+    return converted_amount(
+        amount=Transaction.amount,
+        currency_id=Transaction.currency_id,
+        on=Transaction.date,
+        target_currency_id=get_user_currency_id(session=session, user_id=user_id),
+    )
+
+
+def month_expense_conditions(*, user_id: uuid.UUID, year: int, month: int) -> List[Any]:
+    """
+    WHERE conditions selecting a user's expenses of a month.
+
+    The month is a range on the transaction date rather than its extracted year
+    and month, so the date index applies and only that year's partition is scanned.
+
+    Args:
+        user_id: User ID to filter by
+        year: Year of the month
+        month: Month number (1-12)
+
+    Returns:
+        The conditions to pass to the statement's where()
+    """
+    return transaction_conditions(
+        user_id=user_id,
+        filters=TransactionFilters(
+            transaction_type=TransactionType.EXPENSE,
+            date_from=date(year, month, 1),
+            date_to=date(year, month, calendar.monthrange(year, month)[1]),
+        ),
+    )
@@ -0,0 +1,102 @@
+import datetime
+from typing import Any, Dict, Optional
+
+from sqlmodel import Session
+
+from app.core.cache import aggregate_cache
+from app.crud import account as crud_account
+from app.crud import budget as crud_budget
+from app.crud import debt as crud_debt
+from app.crud import financial_goal as crud_goal
+from app.crud import subscription as crud_subscription
+from app.crud import summary as crud_summary
+from app.crud import user as crud_user
+from app.models.user import User
+from app.schemas.dashboard import UserDashboardResponse
+from app.schemas.financial_goal import format_financial_goals_for_response
+from app.schemas.summary import UserExpenseSummaryResponse
+
+
+def get_user_dashboard(
+    *,
+    session: Session,
+    user: User,
+    year: Optional[int] = None,
+    days_for_daily: int = 7,
+) -> UserDashboardResponse:
+    """
+    Build the home screen snapshot for a user.
+
+    Every widget is computed with the same session (one connection checkout and one
+    authentication for the whole screen). The result is cached per user and data
+    version, so it is never served after one of the user's rows is written.
+
+    Args:
+        session: Database session
+        user: The authenticated user
+        year: Year for the monthly expense breakdown (defaults to current year)
+        days_for_daily: Number of past days for the daily expense breakdown
+
+    Returns:
+        UserDashboardResponse with every home widget
+    """
+    today = datetime.date.today()
+    year = year or today.year
+
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user.id,
+        kind="dashboard",
+        period=(year, days_for_daily, today),
+        compute=lambda: UserDashboardResponse.model_validate(
+            _build_dashboard(
+                session=session, user=user, year=year, days_for_daily=days_for_daily, today=today
+            )
+        ),
+    )
+
+
+def _build_dashboard(
+    *,
+    session: Session,
+    user: User,
+    year: int,
+    days_for_daily: int,
+    today: datetime.date,
+) -> Dict[str, Any]:
+    """Run the aggregates behind each home widget and assemble the raw payload."""
+    financial_summary = crud_user.get_user_financial_summary(session=session, user=user)
+
+    monthly_summary = crud_summary.get_monthly_expense_summary(
+        db=session, user_id=user.id, year=year
+    )
+    daily_summary = crud_summary.get_daily_expense_summary_for_period(
+        db=session,
+        user_id=user.id,
+        start_date=today - datetime.timedelta(days=days_for_daily - 1),
+        end_date=today,
+    )
+
+    budgets_progress = crud_budget.get_all_budgets_progress(
+        session=session, user_id=user.id, year=today.year, month=today.month
+    )
+    budget_summary = crud_budget.get_budget_summary(
+        session=session, user_id=user.id, year=today.year, month=today.month
+    )
+
+    goals = crud_goal.get_financial_goals_by_user(session=session, user_id=user.id)
+
+    return {
+        "financial_summary": financial_summary,
+        "expense_summary": UserExpenseSummaryResponse(
+            monthly_summary=monthly_summary, daily_summary=daily_summary
+        ),
+        "budgets_progress": {"budgets": budgets_progress, "summary": budget_summary},
+        "accounts": crud_account.get_accounts(db=session, user_id=user.id),
+        "debts": crud_debt.get_debts_by_user(session=session, user_id=user.id),
+        "subscriptions": crud_subscription.get_subscriptions_by_user(
+            session=session, user_id=user.id
+        ),
+        "financial_goals": format_financial_goals_for_response(goals),
+        "generated_at": datetime.datetime.now(),
+    }
@@ -1,13 +1,29 @@
 import uuid
-from typing import Sequence, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Collection, Sequence, Dict, List, Optional, Tuple
 from datetime import date, datetime
 
 from sqlmodel import Session, select, func, col
 
 from app.models.debt import Debt
+from app.models.enums import DebtPayoffStrategy
 from app.models.transaction import Transaction
 from app.models.user import User
-from app.schemas.debt import DebtCreate, DebtUpdate, DebtPayment, DebtReadWithDetails
+from app.core.cache import aggregate_cache, bump_user_data_version
+from app.crud.balance_snapshot import apply_balance_changes, balance_change
+from app.crud.forecast import recurring_dates
+from app.crud.projection import projection_options
+from app.schemas.debt import (
+    DebtAmortizationSchedule,
+    DebtCreate,
+    DebtPayment,
+    DebtPayoffPlan,
+    DebtReadWithDetails,
+    DebtUpdate,
+)
+from app.services.debt_service import PayoffSimulation, simulate_payoff
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def get_debt(
@@ -19,12 +35,19 @@ def get_debt(
 
 
 def get_debts_by_user(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Collection[str]] = None,
 ) -> Sequence[Debt]:
-    """Get multiple debts for a specific user."""
+    """Get multiple debts for a specific user, loading only `fields` when given."""
     statement = (
         select(Debt).where(Debt.user_id == user_id).offset(skip).limit(limit)
     )
+    if fields is not None:
+        statement = statement.options(*projection_options(Debt, fields))
     return session.exec(statement).all()
 
 
@@ -108,7 +131,10 @@ def get_debt_with_details(
     
     # Get debt details
     details = calculate_debt_details(session=session, debt=debt)
-    
+
+    # calculate_debt_details may mark the debt paid and commit, which expires it
+    session.refresh(debt)
+
     # Create the response with debt and payment details
     debt_dict = debt.model_dump()
     debt_dict.update(details)
@@ -147,6 +173,7 @@ def create_debt(
     
     db_debt = Debt.model_validate(debt_data)
     session.add(db_debt)
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(db_debt)
     return db_debt
@@ -170,6 +197,7 @@ def update_debt(
     
     db_debt.sqlmodel_update(update_data)
     session.add(db_debt)
+    bump_user_data_version(session=session, user_id=db_debt.user_id)
     session.commit()
     session.refresh(db_debt)
     return db_debt
@@ -178,6 +206,7 @@ def update_debt(
 def delete_debt(*, session: Session, db_debt: Debt) -> None:
     """Delete a debt."""
     session.delete(db_debt)
+    bump_user_data_version(session=session, user_id=db_debt.user_id)
     session.commit()
 
 
@@ -219,6 +248,10 @@ def add_debt_payment(
     
     transaction = Transaction.model_validate(transaction_data)
     session.add(transaction)
+    apply_balance_changes(
+        session=session,
+        changes=[(transaction.account_id, transaction.date, balance_change(transaction))],
+    )
     
     # Check if debt is now fully paid
     details = calculate_debt_details(session=session, debt=debt)
@@ -226,8 +259,190 @@ def add_debt_payment(
         debt.is_paid = True
         session.add(debt)
     
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(debt)
     session.refresh(transaction)
     
-    return debt, transaction
\ No newline at end of file
+    return debt, transaction
+
+
+def get_debt_payoff_plan(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    strategy: DebtPayoffStrategy = DebtPayoffStrategy.AVALANCHE,
+    monthly_budget: Optional[float] = None,
+    order: Optional[Sequence[uuid.UUID]] = None,
+    start_date: Optional[date] = None,
+) -> DebtPayoffPlan:
+    """
+    Simulate paying off all the unpaid debts of a user together, see simulate_payoff.
+    
+    Extra payments go first to the highest interest rate (avalanche), the smallest
+    balance (snowball) or the debts listed in `order` (custom), the unlisted ones
+    following in avalanche order. The plan is cached per user and data version, so
+    it is recomputed after any change to a debt or a payment.
+    
+    Args:
+        session: Database session
+        user_id: ID of the user
+        strategy: Order in which extra payments go to the debts
+        monthly_budget: Total paid each month (defaults to the sum of the minimum payments)
+        order: Debt IDs in priority order, for the custom strategy
+        start_date: Reference date (defaults to today), payments start a month later
+    
+    Returns:
+        The plan with the amortization schedule of every debt
+    
+    Raises:
+        ValueError: If the budget does not cover the minimum payments or `order`
+            holds a debt that is not an unpaid debt of the user
+    """
+    start_date = start_date or date.today()
+    order = tuple(order or ()) if strategy == DebtPayoffStrategy.CUSTOM else ()
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="debt_payoff_plan",
+        period=(strategy, monthly_budget, order, start_date),
+        compute=lambda: _compute_debt_payoff_plan(
+            session, user_id, strategy, monthly_budget, order, start_date
+        ),
+    )
+
+
+def get_debt_schedule(
+    *,
+    session: Session,
+    debt: Debt,
+    monthly_payment: Optional[float] = None,
+    start_date: Optional[date] = None,
+) -> DebtAmortizationSchedule:
+    """
+    Amortization schedule of a single debt paid `monthly_payment` a month (defaults
+    to its minimum payment), cached until the debt or its payments change.
+    
+    Raises:
+        ValueError: If the payment is below the debt's minimum payment, or the debt
+            has no minimum payment and no payment is given
+    """
+    start_date = start_date or date.today()
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=debt.user_id,
+        kind="debt_schedule",
+        period=(debt.id, monthly_payment, start_date),
+        compute=lambda: _compute_debt_schedule(debt, monthly_payment, start_date),
+    )
+
+
+def _payoff_inputs(debts: Sequence[Debt]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Balance, annual interest rate and minimum payment of each debt."""
+    import numpy as np
+    balances = np.array([max(0.0, debt.amount - (debt.paid_amount or 0)) for debt in debts], dtype=float)
+    rates = np.array([debt.interest_rate or 0 for debt in debts], dtype=float)
+    minimums = np.array([debt.minimum_payment or 0 for debt in debts], dtype=float)
+    return balances, rates, minimums
+
+
+def _compute_debt_payoff_plan(
+    session: Session,
+    user_id: uuid.UUID,
+    strategy: DebtPayoffStrategy,
+    monthly_budget: Optional[float],
+    order: Tuple[uuid.UUID, ...],
+    start_date: date,
+) -> DebtPayoffPlan:
+    import numpy as np
+    debts = session.exec(
+        select(Debt)
+        .where(
+            Debt.user_id == user_id,
+            Debt.is_paid == False,
+            Debt.amount > func.coalesce(Debt.paid_amount, 0),
+        )
+        .order_by(Debt.created_at)
+    ).all()
+    balances, rates, minimums = _payoff_inputs(debts)
+    budget = float(minimums.sum()) if monthly_budget is None else monthly_budget
+    if debts and budget <= 0:
+        raise ValueError("A monthly budget is required when the debts have no minimum payment")
+
+    # Avalanche order, ties going to the smallest balance
+    priority = np.lexsort((balances, -rates))
+    if strategy == DebtPayoffStrategy.SNOWBALL:
+        priority = np.lexsort((-rates, balances))
+    elif strategy == DebtPayoffStrategy.CUSTOM:
+        positions = {debt.id: index for index, debt in enumerate(debts)}
+        unknown = [str(debt_id) for debt_id in order if debt_id not in positions]
+        if unknown:
+            raise ValueError(f"Not an unpaid debt of the user: {', '.join(unknown)}")
+        listed = [positions[debt_id] for debt_id in dict.fromkeys(order)]
+        priority = np.array(
+            listed + [index for index in priority if index not in listed], dtype=np.int64
+        )
+
+    simulation = simulate_payoff(balances, rates, minimums, priority, budget)
+    dates = _payment_dates(start_date, len(simulation.payments))
+    months = len(simulation.payments)
+    return DebtPayoffPlan(
+        strategy=strategy,
+        monthly_budget=budget,
+        order=[debts[index].id for index in priority],
+        paid_off=simulation.paid_off,
+        months_to_payoff=months if simulation.paid_off else None,
+        payoff_date=dates[-1] if simulation.paid_off and months else None,
+        total_interest=round(float(simulation.interest.sum()), 2),
+        total_paid=round(float(simulation.payments.sum()), 2),
+        debts=[
+            _amortization_schedule(debt, column, simulation, dates)
+            for column, debt in enumerate(debts)
+        ],
+    )
+
+
+def _compute_debt_schedule(
+    debt: Debt, monthly_payment: Optional[float], start_date: date
+) -> DebtAmortizationSchedule:
+    import numpy as np
+    balances, rates, minimums = _payoff_inputs([debt])
+    payment = float(minimums[0]) if monthly_payment is None else monthly_payment
+    if payment <= 0:
+        raise ValueError("A monthly payment is required when the debt has no minimum payment")
+    simulation = simulate_payoff(balances, rates, minimums, np.array([0]), payment)
+    return _amortization_schedule(
+        debt, 0, simulation, _payment_dates(start_date, len(simulation.payments))
+    )
+
+
+def _payment_dates(start_date: date, months: int) -> List[date]:
+    """Monthly payment dates after `start_date`, on the same day of month."""
+    import numpy as np
+    return recurring_dates(np.array([start_date]), np.array([1]), months + 1)[0, 1:].tolist()
+
+
+def _amortization_schedule(
+    debt: Debt, column: int, simulation: PayoffSimulation, dates: List[date]
+) -> DebtAmortizationSchedule:
+    """Schedule of the debt in `column` of the simulation, up to the month it is paid off."""
+    import numpy as np
+    payments = simulation.payments[:, column]
+    interest = simulation.interest[:, column]
+    balances = simulation.balances[:, column]
+    paid_off_months = np.flatnonzero(balances <= 0)
+    months = int(paid_off_months[0]) + 1 if paid_off_months.size else len(balances)
+    return DebtAmortizationSchedule(
+        debt_id=debt.id,
+        creditor_name=debt.creditor_name,
+        starting_balance=max(0.0, debt.amount - (debt.paid_amount or 0)),
+        interest_rate=debt.interest_rate or 0,
+        minimum_payment=debt.minimum_payment or 0,
+        payoff_date=dates[months - 1] if paid_off_months.size else None,
+        total_interest=round(float(interest[:months].sum()), 2),
+        total_paid=round(float(payments[:months].sum()), 2),
+        dates=dates[:months],
+        payments=np.round(payments[:months], 2).tolist(),
+        interest=np.round(interest[:months], 2).tolist(),
+        balances=np.round(balances[:months], 2).tolist(),
+    )
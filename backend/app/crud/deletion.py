@@ -0,0 +1,303 @@
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import ColumnElement, and_, delete, exists, or_, tuple_, update
+from sqlmodel import Session, SQLModel, func, select
+
+from app.core.cache import bump_user_data_version
+from app.core.config import settings
+from app.models.account import Account
+from app.models.account_balance_snapshot import AccountBalanceSnapshot
+from app.models.budget import Budget
+from app.models.debt import Debt
+from app.models.deletion_job import DeletionJob
+from app.models.enums import DeletionJobStatus, DeletionTarget
+from app.models.financial_goal import FinancialGoal
+from app.models.subscription import Subscription
+from app.models.transaction import Transaction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# A running job not heard from for this long is deemed dead (e.g. its worker
+# restarted) and taken over by resume_deletion_jobs
+STALE_JOB_AFTER = timedelta(minutes=10)
+UNFINISHED_STATUSES = (DeletionJobStatus.PENDING, DeletionJobStatus.RUNNING)
+
+
+@dataclass(frozen=True)
+class DeletionStep:
+    """Rows of `model` matching `condition`, deleted or, with `values`, updated with them."""
+
+    model: Type[SQLModel]
+    condition: ColumnElement[bool]
+    values: Dict[str, Any] = field(default_factory=dict)
+
+
+def account_deletion_steps(account_id: uuid.UUID) -> List[DeletionStep]:
+    """
+    What deleting an account removes: its transactions, balance snapshots, debts
+    and subscriptions, in foreign key order. Transactions of other accounts paying
+    one of those debts or subscriptions are kept, unlinked from them.
+    """
+    account_debts = select(Debt.id).where(Debt.account_id == account_id)
+    account_subscriptions = select(Subscription.id).where(Subscription.account_id == account_id)
+    other_accounts = or_(Transaction.account_id.is_(None), Transaction.account_id != account_id)
+    return [
+        DeletionStep(
+            Transaction,
+            and_(other_accounts, Transaction.debt_id.in_(account_debts)),
+            {"debt_id": None},
+        ),
+        DeletionStep(
+            Transaction,
+            and_(other_accounts, Transaction.subscription_id.in_(account_subscriptions)),
+            {"subscription_id": None},
+        ),
+        DeletionStep(Transaction, Transaction.account_id == account_id),
+        DeletionStep(AccountBalanceSnapshot, AccountBalanceSnapshot.account_id == account_id),
+        DeletionStep(Debt, Debt.account_id == account_id),
+        DeletionStep(Subscription, Subscription.account_id == account_id),
+        DeletionStep(Account, Account.id == account_id),
+    ]
+
+
+def user_deletion_steps(user_id: uuid.UUID) -> List[DeletionStep]:
+    """What deleting a user removes: every row they own, in foreign key order, then the user."""
+    return [
+        DeletionStep(AccountBalanceSnapshot, AccountBalanceSnapshot.user_id == user_id),
+        DeletionStep(Transaction, Transaction.user_id == user_id),
+        DeletionStep(Budget, Budget.user_id == user_id),
+        DeletionStep(Subscription, Subscription.user_id == user_id),
+        DeletionStep(Debt, Debt.user_id == user_id),
+        DeletionStep(FinancialGoal, FinancialGoal.user_id == user_id),
+        DeletionStep(Account, Account.user_id == user_id),
+        # Idempotency keys go with the user (ON DELETE CASCADE)
+        DeletionStep(User, User.id == user_id),
+    ]
+
+
+def _steps(job: DeletionJob) -> List[DeletionStep]:
+    if job.target_type == DeletionTarget.ACCOUNT:
+        return account_deletion_steps(job.target_id)
+    return user_deletion_steps(job.target_id)
+
+
+def has_rows(*, session: Session, step: DeletionStep) -> bool:
+    """Whether any row is left for a step, with an EXISTS that stops at the first one."""
+    return session.exec(select(exists().where(step.condition))).one()
+
+
+def run_step_batch(*, session: Session, step: DeletionStep, batch_size: int) -> int:
+    """
+    Delete (or update) at most `batch_size` rows of a step, without committing.
+
+    The rows are picked by primary key in a LIMITed subquery, so each batch locks
+    a bounded number of rows and never loads them into the session.
+
+    Returns:
+        Number of rows deleted or updated
+    """
+    primary_key = tuple_(*step.model.__table__.primary_key.columns)
+    batch = primary_key.in_(
+        select(*step.model.__table__.primary_key.columns).where(step.condition).limit(batch_size)
+    )
+    if step.values:
+        statement = update(step.model).where(batch).values(**step.values)
+    else:
+        statement = delete(step.model).where(batch)
+    return session.exec(statement.execution_options(synchronize_session=False)).rowcount
+
+
+def _unfinished_job(
+    *, session: Session, target_type: DeletionTarget, target_id: uuid.UUID
+) -> Optional[DeletionJob]:
+    return session.exec(
+        select(DeletionJob).where(
+            DeletionJob.target_type == target_type,
+            DeletionJob.target_id == target_id,
+            DeletionJob.status.in_(UNFINISHED_STATUSES),
+        )
+    ).first()
+
+
+def create_account_deletion_job(
+    *, session: Session, account: Account, requested_by: uuid.UUID
+) -> DeletionJob:
+    """
+    Schedule the deletion of an account, see account_deletion_steps. Asking again
+    while the account is being deleted returns the job already scheduled.
+
+    Args:
+        session: Database session
+        account: Account to delete
+        requested_by: ID of the user asking for the deletion
+
+    Returns:
+        The job to pass to run_deletion_job, e.g. from a background task
+    """
+    job = _unfinished_job(session=session, target_type=DeletionTarget.ACCOUNT, target_id=account.id)
+    if job:
+        return job
+    job = DeletionJob(
+        target_type=DeletionTarget.ACCOUNT, target_id=account.id, requested_by=requested_by
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def create_user_deletion_job(
+    *, session: Session, user: User, requested_by: uuid.UUID
+) -> DeletionJob:
+    """
+    Schedule the deletion of a user, see user_deletion_steps. The user is
+    deactivated right away, so they can no longer sign in or use their tokens
+    while their data is being deleted.
+
+    Args:
+        session: Database session
+        user: User to delete
+        requested_by: ID of the user asking for the deletion (the user or a superuser)
+
+    Returns:
+        The job to pass to run_deletion_job, e.g. from a background task
+    """
+    job = _unfinished_job(session=session, target_type=DeletionTarget.USER, target_id=user.id)
+    if job:
+        return job
+    job = DeletionJob(target_type=DeletionTarget.USER, target_id=user.id, requested_by=requested_by)
+    user.is_active = False
+    session.add_all([job, user])
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_deletion_job(
+    *, session: Session, job_id: uuid.UUID, requested_by: Optional[uuid.UUID] = None
+) -> Optional[DeletionJob]:
+    """Get a deletion job, only when asked for by `requested_by` if given."""
+    job = session.get(DeletionJob, job_id)
+    if job and requested_by and job.requested_by != requested_by:
+        return None
+    return job
+
+
+def _claim(*, session: Session, job_id: uuid.UUID) -> bool:
+    """Mark a pending (or stale running) job as running; False when another worker has it."""
+    now = datetime.now()
+    claimed = session.exec(
+        update(DeletionJob)
+        .where(
+            DeletionJob.id == job_id,
+            or_(
+                DeletionJob.status == DeletionJobStatus.PENDING,
+                and_(
+                    DeletionJob.status == DeletionJobStatus.RUNNING,
+                    DeletionJob.updated_at < now - STALE_JOB_AFTER,
+                ),
+            ),
+        )
+        .values(status=DeletionJobStatus.RUNNING, updated_at=now)
+        .returning(DeletionJob.id)
+    ).first()
+    session.commit()
+    return claimed is not None
+
+
+def run_deletion_job(
+    *, session: Session, job_id: uuid.UUID, batch_size: Optional[int] = None
+) -> Optional[DeletionJob]:
+    """
+    Run a deletion job: every step removes its rows DELETION_BATCH_SIZE at a time,
+    committing after each batch together with the job's progress, so no batch
+    holds its locks for long nor loads the rows into memory.
+
+    Steps are idempotent, so a job interrupted midway (e.g. by a restart) starts
+    over from the first step that still has rows when it is resumed. A job already
+    run by another worker is left alone.
+
+    Args:
+        session: Database session
+        job_id: ID of the job
+        batch_size: Rows per batch (defaults to DELETION_BATCH_SIZE)
+
+    Returns:
+        The job once finished, or None when another worker runs it
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    if not _claim(session=session, job_id=job_id):
+        return None
+    job = session.get(DeletionJob, job_id)
+    steps = _steps(job)
+    owner_id = None
+    if job.target_type == DeletionTarget.ACCOUNT:
+        owner_id = session.exec(select(Account.user_id).where(Account.id == job.target_id)).first()
+
+    try:
+        if job.total_rows is None:
+            job.total_rows = sum(
+                session.exec(select(func.count()).where(step.condition)).one() for step in steps
+            )
+            session.add(job)
+            session.commit()
+
+        for step in steps:
+            while has_rows(session=session, step=step):
+                job.deleted_rows += run_step_batch(session=session, step=step, batch_size=batch_size)
+                job.updated_at = datetime.now()
+                session.add(job)
+                session.commit()
+            logger.info(
+                f"Deletion job {job.id}: {job.deleted_rows}/{job.total_rows} rows, "
+                f"{step.model.__tablename__} done"
+            )
+
+        if owner_id:
+            bump_user_data_version(session=session, user_id=owner_id)
+        job.status = DeletionJobStatus.COMPLETED
+        job.finished_at = datetime.now()
+    except Exception as e:
+        logger.exception(f"Deletion job {job_id} failed")
+        session.rollback()
+        job = session.get(DeletionJob, job_id)
+        job.status = DeletionJobStatus.FAILED
+        job.error = str(e)[:255]
+    job.updated_at = datetime.now()
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def resume_deletion_jobs(*, session: Session) -> int:
+    """
+    Run the deletion jobs left pending or abandoned midway, e.g. by a worker
+    restarting before its background task ran or finished.
+
+    Returns:
+        Number of jobs run to completion
+    """
+    stale = datetime.now() - STALE_JOB_AFTER
+    job_ids = session.exec(
+        select(DeletionJob.id)
+        .where(
+            or_(
+                DeletionJob.status == DeletionJobStatus.PENDING,
+                DeletionJob.status == DeletionJobStatus.RUNNING,
+            ),
+            DeletionJob.updated_at < stale,
+        )
+        .order_by(DeletionJob.created_at)
+    ).all()
+    completed = 0
+    for job_id in job_ids:
+        job = run_deletion_job(session=session, job_id=job_id)
+        if job and job.status == DeletionJobStatus.COMPLETED:
+            completed += 1
+    return completed
@@ -0,0 +1,167 @@
+import uuid
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import case, false
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.core.cache import AggregateCache, aggregate_cache
+from app.core.config import settings
+from app.models.exchange_rate import ExchangeRate
+from app.models.user import User
+from app.schemas.exchange_rate import ExchangeRateCreate
+
+# In-process cache of (base, quote, date) -> rate for conversions done in Python
+rate_cache = AggregateCache(
+    ttl_seconds=settings.EXCHANGE_RATE_CACHE_TTL_SECONDS,
+    max_entries=settings.EXCHANGE_RATE_CACHE_MAX_ENTRIES,
+)
+
+
+def get_exchange_rates(
+    *,
+    session: Session,
+    base_currency_id: Optional[uuid.UUID] = None,
+    quote_currency_id: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Sequence[ExchangeRate]:
+    """Get exchange rates, newest first, optionally for a single currency pair."""
+    statement = select(ExchangeRate)
+    if base_currency_id:
+        statement = statement.where(ExchangeRate.base_currency_id == base_currency_id)
+    if quote_currency_id:
+        statement = statement.where(ExchangeRate.quote_currency_id == quote_currency_id)
+    statement = statement.order_by(ExchangeRate.rate_date.desc()).offset(skip).limit(limit)
+    return session.exec(statement).all()
+
+
+def upsert_exchange_rate(*, session: Session, rate_in: ExchangeRateCreate) -> ExchangeRate:
+    """
+    Create the rate of a currency pair for a date, or replace the existing one.
+
+    Aggregates cached by other workers pick the new rate up once their entries
+    expire (USER_CACHE_TTL_SECONDS); this worker drops its caches right away.
+    """
+    if rate_in.base_currency_id == rate_in.quote_currency_id:
+        raise ValueError("Base and quote currencies must be different.")
+
+    now = datetime.now()
+    statement = (
+        insert(ExchangeRate)
+        .values(id=uuid.uuid4(), created_at=now, updated_at=now, **rate_in.model_dump())
+        .on_conflict_do_update(
+            constraint="uq_exchange_rate_pair_date",
+            set_={"rate": rate_in.rate, "updated_at": now},
+        )
+        .returning(ExchangeRate.id)
+    )
+    rate_id = session.execute(statement).scalar_one()
+    session.commit()
+
+    rate_cache.clear()
+    aggregate_cache.clear()
+    return session.get(ExchangeRate, rate_id, populate_existing=True)
+
+
+def delete_exchange_rate(*, session: Session, db_rate: ExchangeRate) -> None:
+    """Delete an exchange rate."""
+    session.delete(db_rate)
+    session.commit()
+    rate_cache.clear()
+    aggregate_cache.clear()
+
+
+def get_exchange_rate(
+    *,
+    session: Session,
+    base_currency_id: uuid.UUID,
+    quote_currency_id: uuid.UUID,
+    on: date,
+) -> Optional[float]:
+    """
+    Get the rate converting base into quote on a date, using the latest rate dated
+    on or before it (or the inverse of the opposite pair). Cached in process.
+
+    Returns:
+        The rate, or None if the pair has no rate up to that date
+    """
+    if base_currency_id == quote_currency_id:
+        return 1.0
+
+    key = (base_currency_id, quote_currency_id, on)
+    rate = rate_cache.get(key)
+    if rate is None:
+        rate = session.exec(
+            select(_rate_expression(base_currency_id, quote_currency_id, on))
+        ).one()
+        if rate is not None:
+            rate_cache.set(key, rate)
+    return rate
+
+
+def converted_amount(
+    *, amount: Any, currency_id: Any, on: Any, target_currency_id: Optional[uuid.UUID]
+) -> Any:
+    """
+    SQL expression converting `amount` from `currency_id` into the target currency
+    at the rate in force on `on`, for use inside aggregates, e.g.
+    func.sum(converted_amount(amount=Transaction.amount, ...)).
+
+    The rate lookup is correlated with each row and resolved through the unique
+    (base, quote, rate_date) index; rows already in the target currency skip it.
+    Rows without a known rate are NULL, so aggregates leave them out instead of
+    adding amounts in another currency; count them with missing_rate to report them.
+    """
+    if not target_currency_id:
+        return amount
+    return amount * _target_rate(currency_id, target_currency_id, on)
+
+
+def missing_rate(*, currency_id: Any, on: Any, target_currency_id: Optional[uuid.UUID]) -> Any:
+    """SQL condition matching the rows converted_amount leaves out for lack of a rate."""
+    if not target_currency_id:
+        return false()
+    return _target_rate(currency_id, target_currency_id, on).is_(None)
+
+
+def get_user_currency_id(*, session: Session, user_id: uuid.UUID) -> Optional[uuid.UUID]:
+    """Default currency of a user, in which their aggregates are reported."""
+    user = session.get(User, user_id)
+    return user.default_currency_id if user else None
+
+
+def _target_rate(currency_id: Any, target_currency_id: uuid.UUID, on: Any) -> Any:
+    """Rate converting `currency_id` into the target currency on `on`, NULL if unknown."""
+    return case(
+        (currency_id == target_currency_id, 1.0),
+        else_=_rate_expression(currency_id, target_currency_id, on),
+    )
+
+
+def _rate_expression(base_currency_id: Any, quote_currency_id: Any, on: Any) -> Any:
+    """Latest direct rate of the pair on or before `on`, else the inverse of the opposite pair."""
+    direct = (
+        select(ExchangeRate.rate)
+        .where(
+            ExchangeRate.base_currency_id == base_currency_id,
+            ExchangeRate.quote_currency_id == quote_currency_id,
+            ExchangeRate.rate_date <= on,
+        )
+        .order_by(ExchangeRate.rate_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    inverse = (
+        select(1.0 / ExchangeRate.rate)
+        .where(
+            ExchangeRate.base_currency_id == quote_currency_id,
+            ExchangeRate.quote_currency_id == base_currency_id,
+            ExchangeRate.rate_date <= on,
+        )
+        .order_by(ExchangeRate.rate_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return func.coalesce(direct, inverse)
@@ -1,8 +1,10 @@
 import uuid
-from typing import Sequence
+from typing import Collection, Optional, Sequence
 
 from sqlmodel import Session, select
 
+from app.core.cache import bump_user_data_version
+from app.crud.projection import projection_options
 from app.models.financial_goal import FinancialGoal
 from app.schemas.financial_goal import FinancialGoalCreate, FinancialGoalUpdate
 
@@ -18,13 +20,15 @@ def get_financial_goal(
 
 
 def get_financial_goals_by_user(
-    *, session: Session, user_id: uuid.UUID
+    *, session: Session, user_id: uuid.UUID, fields: Optional[Collection[str]] = None
 ) -> Sequence[FinancialGoal]:
-    """Get multiple financial goals for a specific user."""
+    """Get multiple financial goals for a specific user, loading only `fields` when given."""
     statement = (
         select(FinancialGoal)
         .where(FinancialGoal.user_id == user_id)
     )
+    if fields is not None:
+        statement = statement.options(*projection_options(FinancialGoal, fields))
     return session.exec(statement).all()
 
 
@@ -43,6 +47,7 @@ def create_financial_goal(
 
     db_goal = FinancialGoal.model_validate(goal_data)
     session.add(db_goal)
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(db_goal)
     return db_goal
@@ -62,6 +67,7 @@ def update_financial_goal(
         
     db_goal.sqlmodel_update(update_data)
     session.add(db_goal)
+    bump_user_data_version(session=session, user_id=db_goal.user_id)
     session.commit()
     session.refresh(db_goal)
     return db_goal
@@ -77,6 +83,7 @@ def add_saving_to_goal(
 
     db_goal.current_amount += amount
     session.add(db_goal)
+    bump_user_data_version(session=session, user_id=db_goal.user_id)
     session.commit()
     session.refresh(db_goal)
     return db_goal
@@ -85,4 +92,5 @@ def add_saving_to_goal(
 def delete_financial_goal(*, session: Session, db_goal: FinancialGoal) -> None:
     """Delete a financial goal."""
     session.delete(db_goal)
+    bump_user_data_version(session=session, user_id=db_goal.user_id)
     session.commit() 
\ No newline at end of file
@@ -0,0 +1,283 @@
+import uuid
+from datetime import date
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from sqlalchemy import extract
+from sqlmodel import Session, func, select
+
+from app.core.cache import aggregate_cache
+from app.crud.subscription import RENEWABLE_STATUSES
+from app.models import Account, Debt, Subscription, Transaction
+from app.models.enums import SubscriptionFrequency, TransactionType
+from app.schemas.forecast import AccountForecast, CashFlowForecastResponse
+from app.services.subscription_service import FREQUENCY_MONTHS
+
+# numpy is imported by the functions using it, so importing the app doesn't load it
+# (see LAZY_MODULES in app.benchmarks.startup)
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def get_cash_flow_forecast(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    months: int = 3,
+    history_months: int = 3,
+    today: Optional[date] = None,
+) -> CashFlowForecastResponse:
+    """
+    Project the end-of-day balance of every account of a user for the next `months` months.
+
+    Starting from the current balances, each day adds:
+    - the charges of active subscriptions, on their payment dates;
+    - the minimum payments of unpaid debts, monthly from their due date until the
+      remaining amount (or the remaining installments) is paid;
+    - the income and expenses the account usually has on that day of the month,
+      averaged over the last `history_months` months of transactions that are not
+      subscription charges or debt payments.
+
+    Subscriptions and debts without an account are charged to the default account.
+    Amounts are taken in the currency of the account they are charged to. The
+    result is cached per user and data version, like the other aggregates.
+
+    Args:
+        session: Database session
+        user_id: ID of the user
+        months: Number of months to project
+        history_months: Number of past months the usual income and expenses are averaged over
+        today: Reference date (defaults to today), the forecast starts the day after
+
+    Returns:
+        The projected balances, one per account and date
+    """
+    today = today or date.today()
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user_id,
+        kind="cash_flow_forecast",
+        period=(today, months, history_months),
+        compute=lambda: _compute_cash_flow_forecast(session, user_id, today, months, history_months),
+    )
+
+
+def recurring_dates(
+    anchors: "np.ndarray",
+    step_months: "np.ndarray",
+    count: int,
+    days_of_month: Optional["np.ndarray"] = None,
+) -> "np.ndarray":
+    """
+    The first `count` dates of recurring items, as an (items, count) datetime64[D] array.
+
+    Item i falls on anchors[i] and then every step_months[i] months on the same day
+    of month, clamped to the length of shorter months (a payment on the 31st falls
+    on Feb 28/29 and is back on the 31st in March). With `days_of_month`, item i
+    falls on day days_of_month[i] of the anchor's month and the following ones
+    instead, so an anchor already clamped (Feb 29 for the 31st) is followed by Mar 31.
+    """
+    import numpy as np
+    anchors = np.asarray(anchors, dtype="datetime64[D]")
+    anchor_months = anchors.astype("datetime64[M]")
+    if days_of_month is None:
+        days = (anchors - anchor_months.astype("datetime64[D]")).astype(np.int64)
+    else:
+        days = np.asarray(days_of_month, dtype=np.int64) - 1
+    offsets = (np.asarray(step_months)[:, None] * np.arange(count)).astype("timedelta64[M]")
+    months = anchor_months[:, None] + offsets
+    month_starts = months.astype("datetime64[D]")
+    month_lengths = ((months + 1).astype("datetime64[D]") - month_starts).astype(np.int64)
+    return month_starts + np.minimum(days[:, None], month_lengths - 1)
+
+
+def _monthly_count(anchors: "np.ndarray", end: "np.datetime64") -> int:
+    """Number of monthly dates from the earliest of `anchors` (overdue ones included) through `end`."""
+    import numpy as np
+    months = (end.astype("datetime64[M]") - anchors.min().astype("datetime64[M]")).astype(np.int64)
+    return max(int(months) + 1, 1)
+
+
+def _add_flows(
+    flows: "np.ndarray",
+    start: "np.datetime64",
+    account_rows: "np.ndarray",
+    dates: "np.ndarray",
+    amounts: "np.ndarray",
+) -> None:
+    """Add the (items, count) `amounts` falling on `dates` to the (accounts, days) `flows` from `start`."""
+    import numpy as np
+    offsets = (dates - start).astype(np.int64)
+    in_window = (offsets >= 0) & (offsets < flows.shape[1]) & (amounts != 0)
+    rows = np.broadcast_to(account_rows[:, None], offsets.shape)
+    np.add.at(flows, (rows[in_window], offsets[in_window]), amounts[in_window])
+
+
+def _compute_cash_flow_forecast(
+    session: Session,
+    user_id: uuid.UUID,
+    today: date,
+    months: int,
+    history_months: int,
+) -> CashFlowForecastResponse:
+    import numpy as np
+    today_day = np.datetime64(today, "D")
+    start = today_day + 1
+    end, history_start = recurring_dates(
+        np.array([today_day, today_day]), np.array([months, -history_months]), 2
+    )[:, 1]
+    dates = np.arange(start, end + 1)
+
+    accounts: Sequence[Account] = session.exec(
+        select(Account)
+        .where(Account.user_id == user_id)
+        .order_by(Account.is_default.desc(), Account.created_at)
+    ).all()
+    response = CashFlowForecastResponse(
+        start_date=start.item(),
+        end_date=end.item(),
+        months=months,
+        history_months=history_months,
+        dates=dates.tolist(),
+        accounts=[],
+    )
+    if not accounts:
+        return response
+
+    # Accounts are rows, the first one being the default account
+    account_rows = {account.id: row for row, account in enumerate(accounts)}
+    income = np.zeros((len(accounts), len(dates)))
+    expenses = np.zeros((len(accounts), len(dates)))
+
+    subscriptions = session.exec(
+        select(
+            Subscription.account_id,
+            Subscription.amount,
+            Subscription.frequency,
+            Subscription.next_payment_date,
+            Subscription.billing_day,
+        ).where(
+            Subscription.user_id == user_id,
+            Subscription.status.in_(RENEWABLE_STATUSES),
+        )
+    ).all()
+    if subscriptions:
+        next_payment_dates = np.array(
+            [s.next_payment_date for s in subscriptions], dtype="datetime64[D]"
+        )
+        payment_dates = recurring_dates(
+            next_payment_dates,
+            np.array([FREQUENCY_MONTHS[SubscriptionFrequency(s.frequency)] for s in subscriptions]),
+            _monthly_count(next_payment_dates, end),
+            # Billed on the same days as renew_due_subscriptions charges them
+            np.array([s.billing_day or s.next_payment_date.day for s in subscriptions]),
+        )
+        amounts = np.array([s.amount for s in subscriptions], dtype=float)
+        _add_flows(
+            expenses,
+            start,
+            np.array([account_rows.get(s.account_id, 0) for s in subscriptions]),
+            payment_dates,
+            np.broadcast_to(amounts[:, None], payment_dates.shape),
+        )
+
+    debts = session.exec(
+        select(
+            Debt.account_id,
+            Debt.minimum_payment,
+            Debt.remaining_amount,
+            Debt.due_date,
+            Debt.is_installment,
+            Debt.remaining_installments,
+        ).where(
+            Debt.user_id == user_id,
+            Debt.is_paid == False,
+            Debt.minimum_payment > 0,
+            Debt.due_date.is_not(None),
+        )
+    ).all()
+    if debts:
+        due_dates = np.array([d.due_date for d in debts], dtype="datetime64[D]")
+        payment_dates = recurring_dates(
+            due_dates, np.ones(len(debts), dtype=np.int64), _monthly_count(due_dates, end)
+        )
+        minimum = np.array([d.minimum_payment for d in debts], dtype=float)[:, None]
+        remaining = np.array([d.remaining_amount for d in debts], dtype=float)[:, None]
+        # Number of the payment among the ones in the window: 0, 1, 2...
+        in_window = payment_dates >= start
+        payment_number = np.cumsum(in_window, axis=1) - 1
+        amounts = np.clip(remaining - payment_number * minimum, 0, minimum)
+        installments = np.array(
+            [
+                d.remaining_installments if d.is_installment and d.remaining_installments is not None else -1
+                for d in debts
+            ]
+        )[:, None]
+        amounts = np.where((installments < 0) | (payment_number < installments), amounts, 0)
+        _add_flows(
+            expenses,
+            start,
+            np.array([account_rows.get(d.account_id, 0) for d in debts]),
+            payment_dates,
+            np.where(in_window, amounts, 0),
+        )
+
+    # Usual income and expenses of each account per day of the month (1-31)
+    history = session.exec(
+        select(
+            Transaction.account_id,
+            Transaction.transaction_type,
+            extract("day", Transaction.date).label("day"),
+            func.sum(Transaction.amount).label("total"),
+        )
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.account_id.in_(list(account_rows)),
+            Transaction.is_active == True,
+            Transaction.subscription_id.is_(None),
+            Transaction.debt_id.is_(None),
+            Transaction.transaction_type.in_([TransactionType.INCOME, TransactionType.EXPENSE]),
+            Transaction.date >= history_start.item(),
+            Transaction.date <= today,
+        )
+        .group_by(Transaction.account_id, Transaction.transaction_type, extract("day", Transaction.date))
+    ).all()
+    if history:
+        profiles = np.zeros((2, len(accounts), 31))
+        np.add.at(
+            profiles,
+            (
+                np.array([int(h.transaction_type == TransactionType.EXPENSE) for h in history]),
+                np.array([account_rows[h.account_id] for h in history]),
+                np.array([int(h.day) - 1 for h in history]),
+            ),
+            np.array([h.total for h in history], dtype=float) / history_months,
+        )
+        month_starts = dates.astype("datetime64[M]")
+        days = (dates - month_starts.astype("datetime64[D]")).astype(np.int64)
+        month_lengths = (
+            (month_starts + 1).astype("datetime64[D]") - month_starts.astype("datetime64[D]")
+        ).astype(np.int64)
+        # The last day of a short month also gets the days it lacks (29-31)
+        tails = np.cumsum(profiles[:, :, ::-1], axis=2)[:, :, ::-1]
+        projected = np.where(days + 1 == month_lengths, tails[:, :, days], profiles[:, :, days])
+        income += projected[0]
+        expenses += projected[1]
+
+    starting_balances = np.array([account.balance for account in accounts], dtype=float)
+    balances = starting_balances[:, None] + np.cumsum(income - expenses, axis=1)
+    lowest = balances.argmin(axis=1)
+    response.accounts = [
+        AccountForecast(
+            account_id=account.id,
+            name=account.name,
+            currency_id=account.currency_id,
+            starting_balance=float(starting_balances[row]),
+            balances=np.round(balances[row], 2).tolist(),
+            projected_income=round(float(income[row].sum()), 2),
+            projected_expenses=round(float(expenses[row].sum()), 2),
+            lowest_balance=round(float(balances[row, lowest[row]]), 2),
+            lowest_balance_date=dates[lowest[row]].item(),
+        )
+        for row, account in enumerate(accounts)
+    ]
+    return response
@@ -0,0 +1,149 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+PURGE_BATCH_SIZE = 5000
+
+
+def claim_idempotency_key(
+    *, session: Session, user_id: uuid.UUID, key: str, request_hash: str
+) -> Optional[IdempotencyKey]:
+    """
+    Record that a request with an idempotency key started, unless the key is in use.
+
+    A single INSERT ... ON CONFLICT, so of concurrent requests with the same key
+    exactly one claims it. An expired key is claimed again, as is one whose request
+    stopped extending its claim (see extend_idempotency_claim) for
+    IDEMPOTENCY_PENDING_SECONDS without completing, e.g. because the worker died.
+
+    Args:
+        session: Database session
+        user_id: ID of the user sending the request
+        key: Value of the Idempotency-Key header
+        request_hash: Hash of the request, see IdempotencyKey.request_hash
+
+    Returns:
+        None when the key was claimed for this request, else the stored key: the
+        request is a retry (or reuses the key for another request) and must not run
+    """
+    now = datetime.now()
+    statement = (
+        insert(IdempotencyKey)
+        .values(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_PENDING_SECONDS),
+        )
+        .on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "request_hash": request_hash,
+                "status_code": None,
+                "content_type": None,
+                "response_headers": None,
+                "response_body": None,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_PENDING_SECONDS),
+            },
+            where=IdempotencyKey.expires_at <= now,
+        )
+        .returning(IdempotencyKey.key)
+    )
+    claimed = session.execute(statement).first() is not None
+    session.commit()
+    if claimed:
+        return None
+    return session.exec(
+        select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    ).one()
+
+
+def extend_idempotency_claim(
+    *, session: Session, user_id: uuid.UUID, key: str, request_hash: str
+) -> None:
+    """
+    Keep the claim of a request still running for another IDEMPOTENCY_PENDING_SECONDS,
+    so a retry of a long request gets a 409 instead of claiming the key again.
+    """
+    session.exec(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.request_hash == request_hash,
+            IdempotencyKey.status_code.is_(None),
+        )
+        .values(expires_at=datetime.now() + timedelta(seconds=settings.IDEMPOTENCY_PENDING_SECONDS))
+    )
+    session.commit()
+
+
+def save_idempotent_response(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    key: str,
+    status_code: int,
+    content_type: Optional[str],
+    headers: List[List[str]],
+    body: bytes,
+) -> None:
+    """Store the response of the request that claimed a key, for IDEMPOTENCY_KEY_TTL_SECONDS."""
+    db_key = session.get(IdempotencyKey, (user_id, key))
+    if not db_key:
+        return
+    db_key.status_code = status_code
+    db_key.content_type = content_type
+    db_key.response_headers = headers
+    db_key.response_body = body
+    db_key.expires_at = datetime.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+    session.add(db_key)
+    session.commit()
+
+
+def release_idempotency_key(*, session: Session, user_id: uuid.UUID, key: str) -> None:
+    """Forget a key whose request failed, so a retry runs it again."""
+    session.exec(
+        delete(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    )
+    session.commit()
+
+
+def purge_expired_idempotency_keys(*, session: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete the expired idempotency keys, `batch_size` rows per transaction so the
+    purge never holds many row locks at once.
+
+    Args:
+        session: Database session
+        batch_size: Number of keys deleted per transaction
+
+    Returns:
+        Number of keys deleted
+    """
+    now = datetime.now()
+    deleted = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= now)
+            .limit(batch_size)
+        )
+        result = session.exec(
+            delete(IdempotencyKey).where(
+                tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+            )
+        )
+        session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
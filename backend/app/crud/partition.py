@@ -0,0 +1,118 @@
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session, func, select
+
+from app.models.transaction import Transaction
+
+# Application-wide key of the advisory lock serializing partition maintenance across workers
+PARTITION_ADVISORY_LOCK_ID = 730253
+# Catches the transactions dated outside every yearly partition
+DEFAULT_PARTITION = "transaction_default"
+# Names of the partitions of the transaction table, which are not in the models' metadata
+PARTITION_NAME_PATTERN = re.compile(r"^transaction_(y\d{4}|default)$")
+
+
+def transaction_partition_name(year: int) -> str:
+    """Name of the partition holding the transactions of a year."""
+    return f"transaction_y{year}"
+
+
+def get_transaction_partitions(*, session: Session) -> List[str]:
+    """Names of the partitions of the transaction table, default partition included."""
+    return list(
+        session.exec(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'transaction'::regclass ORDER BY c.relname"
+            )
+        ).scalars()
+    )
+
+
+def ensure_transaction_partitions(*, session: Session, through: Optional[date] = None) -> List[str]:
+    """
+    Create the missing yearly partitions of the transaction table: every year from
+    the current one through `through` (defaults to a year from today), and every
+    earlier year that has rows in the default partition, which are moved to it.
+
+    Meant to run ahead of time (on deploy and from a scheduled job), so inserts
+    never land in the default partition for the years in use. Runs in one database
+    transaction, guarded by a transaction-level advisory lock: when another worker
+    holds it, this run does nothing.
+
+    Args:
+        session: Database session
+        through: Create partitions up to the year of this date
+
+    Returns:
+        Names of the partitions created
+    """
+    today = date.today()
+    through = through or today.replace(year=today.year + 1)
+    acquired = session.exec(select(func.pg_try_advisory_xact_lock(PARTITION_ADVISORY_LOCK_ID))).one()
+    if not acquired:
+        session.rollback()
+        return []
+
+    existing = set(get_transaction_partitions(session=session))
+    years = set(range(today.year, through.year + 1))
+    if DEFAULT_PARTITION in existing:
+        years.update(
+            int(year)
+            for year in session.exec(
+                text(
+                    f"SELECT DISTINCT extract(year FROM date) FROM {DEFAULT_PARTITION} "
+                    "WHERE date < :end"
+                ),
+                params={"end": date(through.year + 1, 1, 1)},
+            ).scalars()
+        )
+
+    created = []
+    for year in sorted(years):
+        name = transaction_partition_name(year)
+        if name not in existing:
+            _create_partition(session, name, year, DEFAULT_PARTITION in existing)
+            created.append(name)
+    session.commit()
+    return created
+
+
+def _create_partition(session: Session, name: str, year: int, has_default: bool) -> None:
+    """Create the partition of a year, moving its rows out of the default partition first."""
+    bounds = {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)}
+    # Every stored column but the generated one, which the database recomputes
+    columns = ", ".join(
+        f'"{column.name}"' for column in Transaction.__table__.columns if column.computed is None
+    )
+    moving = has_default and session.exec(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE date >= :start AND date < :end)"
+        ),
+        params=bounds,
+    ).one()[0]
+    if moving:
+        session.exec(
+            text(
+                f"CREATE TEMPORARY TABLE transaction_moving ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"
+            ),
+            params=bounds,
+        )
+        session.exec(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"),
+            params=bounds,
+        )
+    session.exec(
+        text(
+            f"CREATE TABLE {name} PARTITION OF \"transaction\" "
+            f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+        )
+    )
+    if moving:
+        session.exec(text(f'INSERT INTO "transaction" ({columns}) SELECT {columns} FROM transaction_moving'))
+        session.exec(text("DROP TABLE transaction_moving"))
@@ -0,0 +1,37 @@
+from collections.abc import Collection
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+
+def projection_options(model: Any, fields: Collection[str]) -> list[LoaderOption]:
+    """
+    Loader options restricting a query on `model` to the attributes in `fields`.
+
+    Columns are loaded with load_only (the primary key always is), relationships
+    with a selectinload, together with the foreign keys they are joined on. Names
+    that are not mapped on the model are ignored, so a response's derived fields
+    can be passed as well.
+
+    Args:
+        model: Mapped model class the query selects
+        fields: Attribute names to load
+
+    Returns:
+        Options to pass to the statement's options()
+    """
+    mapper = inspect(model)
+    columns = {mapper.get_property_by_column(column).key for column in mapper.primary_key}
+    relationships = []
+    for name in fields:
+        if name in mapper.column_attrs:
+            columns.add(name)
+        elif name in mapper.relationships:
+            relationship = mapper.relationships[name]
+            columns.update(
+                mapper.get_property_by_column(column).key for column in relationship.local_columns
+            )
+            relationships.append(selectinload(getattr(model, name)))
+    return [load_only(*(getattr(model, name) for name in sorted(columns))), *relationships]
@@ -1,10 +1,29 @@
 import uuid
-from typing import Sequence
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
 
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, insert, update
+from sqlmodel import Session, func, select
 
+from app.core.cache import bump_user_data_version, bump_users_data_version
+from app.crud.balance_snapshot import apply_balance_changes
+from app.crud.projection import projection_options
+from app.models.account import Account
+from app.models.category import Category
+from app.models.enums import CategoryType, PaymentMethodType, SubscriptionStatus, TransactionType
+from app.models.payment_method import PaymentMethod
 from app.models.subscription import Subscription
+from app.models.transaction import Transaction
 from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate
+from app.services.subscription_service import advance_payment_date
+
+# Category assigned to the transactions generated by the renewal job
+SUBSCRIPTION_CATEGORY_NAME = "Subscriptions"
+# Application-wide key of the advisory lock serializing renewal batches across workers
+RENEWAL_ADVISORY_LOCK_ID = 730251
+# Statuses whose subscriptions are charged when their payment date is reached
+RENEWABLE_STATUSES = (SubscriptionStatus.ACTIVE, SubscriptionStatus.PENDING_RENEWAL)
 
 
 def get_subscription(
@@ -18,13 +37,15 @@ def get_subscription(
 
 
 def get_subscriptions_by_user(
-    *, session: Session, user_id: uuid.UUID
+    *, session: Session, user_id: uuid.UUID, fields: Optional[Collection[str]] = None
 ) -> Sequence[Subscription]:
-    """Get multiple subscriptions for a specific user."""
+    """Get multiple subscriptions for a specific user, loading only `fields` when given."""
     statement = (
         select(Subscription)
         .where(Subscription.user_id == user_id)
     )
+    if fields is not None:
+        statement = statement.options(*projection_options(Subscription, fields))
     return session.exec(statement).all()
 
 
@@ -34,9 +55,11 @@ def create_subscription(
     """Create a new subscription for a user."""
     subscription_data = subscription_in.model_dump()
     subscription_data["user_id"] = user_id
+    subscription_data["billing_day"] = subscription_in.next_payment_date.day
 
     db_subscription = Subscription.model_validate(subscription_data)
     session.add(db_subscription)
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(db_subscription)
     return db_subscription
@@ -47,8 +70,11 @@ def update_subscription(
 ) -> Subscription:
     """Update an existing subscription."""
     update_data = subscription_in.model_dump(exclude_unset=True)
+    if update_data.get("next_payment_date"):
+        update_data["billing_day"] = update_data["next_payment_date"].day
     db_subscription.sqlmodel_update(update_data)
     session.add(db_subscription)
+    bump_user_data_version(session=session, user_id=db_subscription.user_id)
     session.commit()
     session.refresh(db_subscription)
     return db_subscription
@@ -57,4 +83,170 @@ def update_subscription(
 def delete_subscription(*, session: Session, db_subscription: Subscription) -> None:
     """Delete a subscription."""
     session.delete(db_subscription)
-    session.commit() 
\ No newline at end of file
+    bump_user_data_version(session=session, user_id=db_subscription.user_id)
+    session.commit()
+
+
+def get_due_subscriptions(
+    *, session: Session, as_of: date, limit: int = 500
+) -> Sequence[Subscription]:
+    """
+    Lock and return renewable subscriptions whose next payment date is on or before `as_of`.
+
+    Served by the (status, next_payment_date) index. Rows locked by a concurrent
+    transaction (e.g. a user editing the subscription) are skipped until the next run.
+    """
+    statement = (
+        select(Subscription)
+        .where(
+            Subscription.status.in_(RENEWABLE_STATUSES),
+            Subscription.next_payment_date <= as_of,
+        )
+        .order_by(Subscription.next_payment_date, Subscription.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return session.exec(statement).all()
+
+
+def renew_due_subscriptions(
+    *, session: Session, as_of: Optional[date] = None, batch_size: int = 500
+) -> int:
+    """
+    Charge every due subscription and roll its next payment date forward.
+
+    Each batch runs in its own database transaction, guarded by a transaction-level
+    advisory lock: when another worker holds it, this run stops and leaves the work
+    to that worker. Transactions are inserted and next payment dates advanced in
+    the same database transaction, so running the job again never charges a
+    period twice. Missed periods are caught up, one transaction per period, each
+    on the subscription's billing day (as cash flow forecasts project them).
+
+    Args:
+        session: Database session
+        as_of: Charge payments due on or before this date (defaults to today)
+        batch_size: Number of subscriptions renewed per database transaction
+
+    Returns:
+        Number of transactions created
+    """
+    as_of = as_of or date.today()
+    created = 0
+
+    while True:
+        acquired = session.exec(
+            select(func.pg_try_advisory_xact_lock(RENEWAL_ADVISORY_LOCK_ID))
+        ).one()
+        if not acquired:
+            session.rollback()
+            break
+
+        due = get_due_subscriptions(session=session, as_of=as_of, limit=batch_size)
+        if not due:
+            session.rollback()
+            break
+
+        created += _renew_subscriptions_batch(session=session, subscriptions=due, as_of=as_of)
+        session.commit()
+
+    return created
+
+
+def _renew_subscriptions_batch(
+    *, session: Session, subscriptions: Sequence[Subscription], as_of: date
+) -> int:
+    """Insert the due charges of a locked batch of subscriptions with set-based statements."""
+    category_id = _get_subscription_category_id(session=session)
+    payment_method_id = _get_renewal_payment_method_id(session=session)
+    if payment_method_id is None:
+        raise ValueError("No active payment method available for subscription renewals")
+
+    now = datetime.now()
+    transaction_rows: List[Dict] = []
+    balance_deltas: Dict[uuid.UUID, float] = defaultdict(float)
+    snapshot_changes: List[Tuple[uuid.UUID, date, float]] = []
+
+    for subscription in subscriptions:
+        payment_date = subscription.next_payment_date
+        # Payments fall on the billing day, even after one clamped to a shorter month
+        subscription.billing_day = subscription.billing_day or payment_date.day
+        while payment_date <= as_of:
+            transaction_rows.append({
+                "id": uuid.uuid4(),
+                "date": payment_date,
+                "amount": subscription.amount,
+                "description": f"{subscription.service_name} subscription",
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+                "user_id": subscription.user_id,
+                "category_id": category_id,
+                "payment_method_id": payment_method_id,
+                "currency_id": subscription.currency_id,
+                "account_id": subscription.account_id,
+                "subscription_id": subscription.id,
+                "transaction_type": TransactionType.EXPENSE.value,
+            })
+            if subscription.account_id:
+                balance_deltas[subscription.account_id] += subscription.amount
+                snapshot_changes.append((subscription.account_id, payment_date, -subscription.amount))
+            payment_date = advance_payment_date(
+                payment_date, subscription.frequency, subscription.billing_day
+            )
+
+        # Flushed by the unit of work as one executemany UPDATE for the batch
+        subscription.next_payment_date = payment_date
+        subscription.status = SubscriptionStatus.ACTIVE
+        subscription.updated_at = now
+        session.add(subscription)
+
+    if transaction_rows:
+        session.execute(insert(Transaction), transaction_rows)
+
+    if balance_deltas:
+        account_table = Account.__table__
+        session.execute(
+            update(account_table)
+            .where(account_table.c.id == bindparam("b_account_id"))
+            .values(balance=account_table.c.balance - bindparam("b_amount")),
+            [
+                {"b_account_id": account_id, "b_amount": amount}
+                for account_id, amount in balance_deltas.items()
+            ],
+        )
+
+    apply_balance_changes(session=session, changes=snapshot_changes)
+
+    bump_users_data_version(
+        session=session, user_ids={subscription.user_id for subscription in subscriptions}
+    )
+    return len(transaction_rows)
+
+
+def _get_subscription_category_id(*, session: Session) -> uuid.UUID:
+    """Get (or create) the expense category used for subscription charges."""
+    category = session.exec(
+        select(Category).where(
+            Category.name == SUBSCRIPTION_CATEGORY_NAME,
+            Category.category_type == CategoryType.EXPENSE,
+        )
+    ).first()
+    if not category:
+        category = Category(name=SUBSCRIPTION_CATEGORY_NAME, category_type=CategoryType.EXPENSE)
+        session.add(category)
+        session.flush()
+    return category.id
+
+
+def _get_renewal_payment_method_id(*, session: Session) -> Optional[uuid.UUID]:
+    """Pick the global payment method for subscription charges, preferring cards."""
+    statement = (
+        select(PaymentMethod.id)
+        .where(PaymentMethod.is_active == True)
+        .order_by(
+            (PaymentMethod.payment_method_type == PaymentMethodType.CARD).desc(),
+            PaymentMethod.name,
+        )
+        .limit(1)
+    )
+    return session.exec(statement).first()
@@ -6,23 +6,47 @@ from sqlalchemy import extract, func # Retained sqlalchemy for extract, func
 from sqlmodel import Session, select, col # Retained sqlmodel for Session, select, col
 
 from app.models import Transaction, User, Category, Currency # Added Currency, User, Category just in case, can be removed if not used by Transaction relationships indirectly
-from app.schemas.transaction import TransactionType
+from app.schemas.transaction import TransactionFilters, TransactionType
 from app.schemas.summary import MonthlyExpenseItem, DailyExpenseItem
+from app.core.cache import aggregate_cache
+from app.crud.exchange_rate import converted_amount, get_user_currency_id
+from app.crud.transaction import transaction_conditions
 
 def get_monthly_expense_summary(db: Session, user_id: uuid.UUID, year: int) -> List[MonthlyExpenseItem]:
     """
     Calculates total expenses for each month of a given year for a specific user.
     """
+    return aggregate_cache.get_or_compute(
+        session=db,
+        user_id=user_id,
+        kind="monthly_expense_summary",
+        period=year,
+        compute=lambda: _compute_monthly_expense_summary(db, user_id, year),
+    )
+
 
+def _compute_monthly_expense_summary(db: Session, user_id: uuid.UUID, year: int) -> List[MonthlyExpenseItem]:
+    amount_in_user_currency = converted_amount(
+        amount=Transaction.amount,
+        currency_id=Transaction.currency_id,
+        on=Transaction.date,
+        target_currency_id=get_user_currency_id(session=db, user_id=user_id),
+    )
     monthly_expenses_stmt = (
         select(
             extract('month', Transaction.date).label('month_num'),
-            func.sum(Transaction.amount).label('total_amount')
+            func.sum(amount_in_user_currency).label('total_amount')
         )
         .where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            extract('year', Transaction.date) == year
+            # A date range rather than extract('year') so the index on date applies
+            *transaction_conditions(
+                user_id=user_id,
+                filters=TransactionFilters(
+                    transaction_type=TransactionType.EXPENSE,
+                    date_from=date(year, 1, 1),
+                    date_to=date(year, 12, 31),
+                ),
+            )
         )
         .group_by(extract('month', Transaction.date))
         .order_by(extract('month', Transaction.date))
@@ -31,7 +55,8 @@ def get_monthly_expense_summary(db: Session, user_id: uuid.UUID, year: int) -> L
     results = db.exec(monthly_expenses_stmt).all()
     
     monthly_summary: List[MonthlyExpenseItem] = []
-    month_map: Dict[int, float] = {int(res.month_num): float(res.total_amount) for res in results}
+    # A month whose expenses all lack an exchange rate sums to NULL
+    month_map: Dict[int, float] = {int(res.month_num): float(res.total_amount or 0) for res in results}
 
     for month_num in range(1, 13):
         # Use datetime from datetime module, not the 'date' type alias for current_date
@@ -53,17 +78,38 @@ def get_daily_expense_summary_for_period(
     """
     Calculates total expenses for each day within a given date range for a specific user.
     """
+    return aggregate_cache.get_or_compute(
+        session=db,
+        user_id=user_id,
+        kind="daily_expense_summary",
+        period=(start_date, end_date),
+        compute=lambda: _compute_daily_expense_summary(db, user_id, start_date, end_date),
+    )
 
+
+def _compute_daily_expense_summary(
+    db: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> List[DailyExpenseItem]:
+    amount_in_user_currency = converted_amount(
+        amount=Transaction.amount,
+        currency_id=Transaction.currency_id,
+        on=Transaction.date,
+        target_currency_id=get_user_currency_id(session=db, user_id=user_id),
+    )
     daily_expenses_stmt = (
         select(
             Transaction.date.label('transaction_date'),
-            func.sum(Transaction.amount).label('total_amount')
+            func.sum(amount_in_user_currency).label('total_amount')
         )
         .where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
+            *transaction_conditions(
+                user_id=user_id,
+                filters=TransactionFilters(
+                    transaction_type=TransactionType.EXPENSE,
+                    date_from=start_date,
+                    date_to=end_date,
+                ),
+            )
         )
         .group_by(Transaction.date)
         .order_by(Transaction.date)
@@ -71,7 +117,7 @@ def get_daily_expense_summary_for_period(
     
     results = db.exec(daily_expenses_stmt).all()
     
-    daily_summary_dict: Dict[date, float] = {res.transaction_date: float(res.total_amount) for res in results}
+    daily_summary_dict: Dict[date, float] = {res.transaction_date: float(res.total_amount or 0) for res in results}
     
     daily_summary_list: List[DailyExpenseItem] = []
     current_date = start_date
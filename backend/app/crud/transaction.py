@@ -1,16 +1,32 @@
 import uuid
-from typing import Sequence, Union, Optional, List
+from collections import defaultdict
+from datetime import datetime
+from typing import Collection, Dict, Iterator, Sequence, Set, Union, Optional, List, Tuple
 
+from sqlalchemy import (
+    ColumnElement, CompoundSelect, Row, Select, and_, bindparam, case, delete, literal, union_all, update,
+)
 from sqlmodel import Session, select, func, or_ # Added or_
 
 from app.models.transaction import Transaction
-from app.models.enums import TransactionType
+from app.models.account import Account
 from app.models.category import Category
+from app.models.currency import Currency
 from app.models.debt import Debt
+from app.models.payment_method import PaymentMethod
+from app.core.cache import bump_user_data_version, bump_users_data_version
+from app.crud.balance_snapshot import apply_balance_changes, balance_change, signed_amount
+from app.crud.projection import projection_options
 from app.schemas.transaction import (
-    TransactionCreate, TransactionUpdate
+    TransactionCreate, TransactionFilters, TransactionSelection, TransactionUpdate
 )
 
+# Most transactions a bulk operation can list by ID; filters have no limit
+BULK_MAX_IDS = 1000
+
+# Effect of a transaction on its account balance, as balance_change computes it
+balance_effect = case((Transaction.is_active == True, signed_amount), else_=0.0)
+
 def get_transaction(
     *, session: Session, transaction_id: uuid.UUID, user_id: uuid.UUID
 ) -> Transaction | None:
@@ -21,13 +37,94 @@ def get_transaction(
     return session.exec(statement).first()
 
 
+def description_search(search: str) -> Tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Condition matching the transactions whose description matches `search`, and its rank.
+    
+    Whole words are matched on the full-text column (web search syntax: "quoted
+    phrase", or, -excluded), partial words and typos by trigram word similarity.
+    Both are served by GIN indexes.
+    
+    Args:
+        search: Text typed by the user
+    
+    Returns:
+        The WHERE condition and the rank to order by, higher first
+    """
+    query = func.websearch_to_tsquery("simple", search)
+    document = Transaction.__table__.c.description_search
+    condition = or_(
+        document.op("@@")(query),
+        literal(search).op("<%")(Transaction.description),
+    )
+    rank = func.ts_rank(document, query) + func.word_similarity(search, Transaction.description)
+    return condition, rank
+
+
+def transaction_conditions(
+    *, user_id: uuid.UUID, filters: Optional[TransactionFilters] = None
+) -> List[ColumnElement[bool]]:
+    """
+    WHERE conditions selecting the transactions of a user that match `filters`.
+    
+    Every condition is on a column of the transaction table, so the conditions
+    can be applied to any statement selecting from it (lists, counts, exports,
+    aggregates) and each one can use the column's index. Categories given by name
+    are resolved to their IDs in a subquery instead of joining the category table.
+    
+    Args:
+        user_id: User ID to filter by
+        filters: Optional filters, unset ones are ignored
+    
+    Returns:
+        The conditions to pass to the statement's where()
+    """
+    conditions: List[ColumnElement[bool]] = [Transaction.user_id == user_id]
+    if filters is None:
+        return conditions
+    
+    if filters.transaction_type:
+        conditions.append(Transaction.transaction_type == filters.transaction_type)
+    if filters.date_from:
+        conditions.append(Transaction.date >= filters.date_from)
+    if filters.date_to:
+        conditions.append(Transaction.date <= filters.date_to)
+    if filters.amount_min is not None:
+        conditions.append(Transaction.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        conditions.append(Transaction.amount <= filters.amount_max)
+    if filters.category_ids:
+        conditions.append(Transaction.category_id.in_(filters.category_ids))
+    if filters.category_name:
+        conditions.append(
+            Transaction.category_id.in_(
+                select(Category.id).where(Category.name == filters.category_name)
+            )
+        )
+    if filters.account_ids:
+        conditions.append(Transaction.account_id.in_(filters.account_ids))
+    if filters.payment_method_ids:
+        conditions.append(Transaction.payment_method_id.in_(filters.payment_method_ids))
+    if filters.debt_id:
+        conditions.append(Transaction.debt_id == filters.debt_id)
+    if filters.subscription_id:
+        conditions.append(Transaction.subscription_id == filters.subscription_id)
+    if filters.financial_goal_id:
+        conditions.append(Transaction.financial_goal_id == filters.financial_goal_id)
+    if filters.is_active is not None:
+        conditions.append(Transaction.is_active == filters.is_active)
+    if filters.search:
+        condition, _ = description_search(filters.search)
+        conditions.append(condition)
+    return conditions
+
+
 def get_transactions(
     *, session: Session, user_id: uuid.UUID,
-    transaction_type: Optional[TransactionType] = None,
-    category_name: Optional[str] = None,
-    account_id: Optional[uuid.UUID] = None,
+    filters: Optional[TransactionFilters] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[Collection[str]] = None
 ) -> Sequence[Transaction]:
     """
     Get multiple transactions for a specific user, with optional filtering and pagination.
@@ -35,45 +132,23 @@ def get_transactions(
     Args:
         session: Database session
         user_id: User ID to filter by
-        transaction_type: Optional transaction type filter
-        category_name: Optional category name filter
-        account_id: Optional account ID filter
+        filters: Optional filters, see transaction_conditions
         skip: Number of records to skip (for pagination)
         limit: Maximum number of records to return
+        fields: Optional attributes to load (all when None), see projection_options
     
     Returns:
-        A sequence of Transaction objects
+        A sequence of Transaction objects, best search matches first when searching,
+        then most recent first
     """
-    # Start with the base query
-    statement = select(Transaction).where(Transaction.user_id == user_id)
-    
-    # Filter by transaction type if provided
-    if transaction_type:
-        statement = statement.where(Transaction.transaction_type == transaction_type)
-    
-    # Filter by account ID if provided
-    if account_id:
-        statement = statement.where(Transaction.account_id == account_id)
-    
-    # Filter by category name if provided
-    if category_name:
-        # Join with Category table to filter by name
-        statement = (
-            select(Transaction)
-            .join(Category, Transaction.category_id == Category.id)
-            .where(
-                Transaction.user_id == user_id,
-                Category.name == category_name
-            )
-        )
-        
-        # Re-apply transaction type filter if needed
-        if transaction_type:
-            statement = statement.where(Transaction.transaction_type == transaction_type)
-            
-        # Re-apply account ID filter if needed
-        if account_id:
-            statement = statement.where(Transaction.account_id == account_id)
+    statement = select(Transaction).where(
+        *transaction_conditions(user_id=user_id, filters=filters)
+    )
+    
+    # Rank the matches if a search is provided
+    if filters is not None and filters.search:
+        _, rank = description_search(filters.search)
+        statement = statement.order_by(rank.desc())
     
     # Apply ordering, pagination
     statement = (
@@ -82,15 +157,15 @@ def get_transactions(
         .offset(skip)
         .limit(limit)
     )
+    if fields is not None:
+        statement = statement.options(*projection_options(Transaction, fields))
     
     return session.exec(statement).all()
 
 
 def get_transaction_count(
     *, session: Session, user_id: uuid.UUID,
-    transaction_type: Optional[TransactionType] = None,
-    category_name: Optional[str] = None,
-    account_id: Optional[uuid.UUID] = None
+    filters: Optional[TransactionFilters] = None
 ) -> int:
     """
     Get the total count of transactions for a user, with optional filtering.
@@ -98,46 +173,59 @@ def get_transaction_count(
     Args:
         session: Database session
         user_id: User ID to filter by
-        transaction_type: Optional transaction type filter
-        category_name: Optional category name filter
-        account_id: Optional account ID filter
+        filters: Optional filters, see transaction_conditions
     
     Returns:
         Total count of matching transactions
     """
-    # Start with the base query
-    statement = select(func.count(Transaction.id)).where(Transaction.user_id == user_id)
+    statement = select(func.count(Transaction.id)).where(
+        *transaction_conditions(user_id=user_id, filters=filters)
+    )
+    return session.exec(statement).one()
+
+
+def iter_transaction_rows(
+    *, session: Session, user_id: uuid.UUID,
+    filters: Optional[TransactionFilters] = None,
+    batch_size: int = 1000
+) -> Iterator[Row]:
+    """
+    Stream the transactions of a user matching `filters`, most recent first, for exports.
     
-    # Filter by transaction type if provided
-    if transaction_type:
-        statement = statement.where(Transaction.transaction_type == transaction_type)
-        
-    # Filter by account ID if provided
-    if account_id:
-        statement = statement.where(Transaction.account_id == account_id)
-    
-    # Filter by category name if provided
-    if category_name:
-        # Join with Category table to filter by name
-        statement = (
-            select(func.count(Transaction.id))
-            .join(Category, Transaction.category_id == Category.id)
-            .where(
-                Transaction.user_id == user_id,
-                Category.name == category_name
-            )
+    Rows hold the transaction columns with the names of its currency, category,
+    account and payment method, and are fetched `batch_size` at a time from a
+    server-side cursor, so memory use does not grow with the number of transactions.
+    
+    Args:
+        session: Database session
+        user_id: User ID to filter by
+        filters: Optional filters, see transaction_conditions
+        batch_size: Number of rows fetched per round trip
+    
+    Returns:
+        An iterator over the rows
+    """
+    statement = (
+        select(
+            Transaction.date,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.transaction_type,
+            Currency.code.label("currency"),
+            Category.name.label("category"),
+            Account.name.label("account"),
+            PaymentMethod.name.label("payment_method"),
+            Transaction.is_active,
         )
-        
-        # Re-apply transaction type filter if needed
-        if transaction_type:
-            statement = statement.where(Transaction.transaction_type == transaction_type)
-            
-        # Re-apply account ID filter if needed
-        if account_id:
-            statement = statement.where(Transaction.account_id == account_id)
-    
-    count = session.exec(statement).one()
-    return count
+        .join(Currency, Transaction.currency_id == Currency.id)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .outerjoin(Account, Transaction.account_id == Account.id)
+        .outerjoin(PaymentMethod, Transaction.payment_method_id == PaymentMethod.id)
+        .where(*transaction_conditions(user_id=user_id, filters=filters))
+        .order_by(Transaction.date.desc(), Transaction.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from session.exec(statement)
 
 
 def get_transactions_paginated(
@@ -146,9 +234,7 @@ def get_transactions_paginated(
     user_id: uuid.UUID,
     page: int = 1,
     page_size: int = 10,
-    transaction_type: Optional[TransactionType] = None,
-    category_name: Optional[str] = None,
-    account_id: Optional[uuid.UUID] = None
+    filters: Optional[TransactionFilters] = None
 ) -> dict:
     """
     Get paginated transactions for a specific user, with optional filtering.
@@ -158,9 +244,7 @@ def get_transactions_paginated(
         user_id: User ID to filter by
         page: Current page number (1-indexed)
         page_size: Number of items per page
-        transaction_type: Optional transaction type filter
-        category_name: Optional category name filter
-        account_id: Optional account ID filter
+        filters: Optional filters, see transaction_conditions
 
     Returns:
         A dictionary containing paginated transaction data.
@@ -172,9 +256,7 @@ def get_transactions_paginated(
     items = get_transactions(
         session=session, 
         user_id=user_id,
-        transaction_type=transaction_type,
-        category_name=category_name,
-        account_id=account_id,
+        filters=filters,
         skip=skip, 
         limit=page_size
     )
@@ -182,9 +264,7 @@ def get_transactions_paginated(
     total_items = get_transaction_count(
         session=session, 
         user_id=user_id,
-        transaction_type=transaction_type,
-        category_name=category_name,
-        account_id=account_id
+        filters=filters
     )
 
     total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
@@ -214,34 +294,17 @@ def create_transaction(
     # Create transaction instance
     db_transaction = Transaction.model_validate(transaction_data)
 
-    # Update account balance based on transaction type
-    if db_transaction.account_id:
-        from app.models.account import Account
-        account = session.get(Account, db_transaction.account_id)
-        if account:
-            # For transfers, we need source and destination accounts
-            if db_transaction.transaction_type == TransactionType.TRANSFER:
-                # For transfers, the amount is deducted from the source account
-                account.balance -= db_transaction.amount
-                
-                # If destination_account_id is provided (it should be in transfer_data)
-                dest_account_id = transaction_data.get("destination_account_id")
-                if dest_account_id:
-                    dest_account = session.get(Account, dest_account_id)
-                    if dest_account:
-                        # Add the amount to the destination account
-                        dest_account.balance += db_transaction.amount
-                        session.add(dest_account)
-            # For income, add to balance
-            elif db_transaction.transaction_type == TransactionType.INCOME:
-                account.balance += db_transaction.amount
-            # For expenses, subtract from balance
-            elif db_transaction.transaction_type == TransactionType.EXPENSE:
-                account.balance -= db_transaction.amount
-            
-            session.add(account)
+    # Update account balance, by the same rule as the bulk operations
+    _apply_account_balance_changes(
+        session=session, changes=[(db_transaction.account_id, balance_change(db_transaction))]
+    )
 
     session.add(db_transaction)
+    apply_balance_changes(
+        session=session,
+        changes=[(db_transaction.account_id, db_transaction.date, balance_change(db_transaction))],
+    )
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     session.refresh(db_transaction)
     
@@ -262,66 +325,36 @@ def update_transaction(
     # Store old values before update
     old_debt_id = db_transaction.debt_id
     old_account_id = db_transaction.account_id
-    old_amount = db_transaction.amount
-    old_transaction_type = db_transaction.transaction_type
+    old_amount = balance_change(db_transaction)
+    old_balance_change = (old_account_id, db_transaction.date, -old_amount)
     
     # Apply update data
     update_data = transaction_in.model_dump(exclude_unset=True)
-    
-    # If we're updating the account balance, we need to revert the old transaction first
-    if old_account_id:
-        from app.models.account import Account
-        old_account = session.get(Account, old_account_id)
-        if old_account:
-            # Revert the effect of the old transaction
-            if old_transaction_type == TransactionType.INCOME:
-                old_account.balance -= old_amount
-            elif old_transaction_type == TransactionType.EXPENSE:
-                old_account.balance += old_amount
-            elif old_transaction_type == TransactionType.TRANSFER:
-                # For transfers, add back to source account
-                old_account.balance += old_amount
-                
-                # If there was a destination account, subtract from it
-                old_dest_account_id = getattr(db_transaction, 'destination_account_id', None)
-                if old_dest_account_id:
-                    old_dest_account = session.get(Account, old_dest_account_id)
-                    if old_dest_account:
-                        old_dest_account.balance -= old_amount
-                        session.add(old_dest_account)
-            
-            session.add(old_account)
-    
-    # Now apply the update
     db_transaction.sqlmodel_update(update_data)
     session.add(db_transaction)
     session.flush()  # Flush to get updated values but don't commit yet
     
-    # Apply the new transaction effects on account balance
-    if db_transaction.account_id:
-        from app.models.account import Account
-        new_account = session.get(Account, db_transaction.account_id)
-        if new_account:
-            # Apply the effect of the new/updated transaction
-            if db_transaction.transaction_type == TransactionType.INCOME:
-                new_account.balance += db_transaction.amount
-            elif db_transaction.transaction_type == TransactionType.EXPENSE:
-                new_account.balance -= db_transaction.amount
-            elif db_transaction.transaction_type == TransactionType.TRANSFER:
-                # For transfers, subtract from source account
-                new_account.balance -= db_transaction.amount
-                
-                # If there is a destination account, add to it
-                new_dest_account_id = update_data.get('destination_account_id')
-                if new_dest_account_id:
-                    new_dest_account = session.get(Account, new_dest_account_id)
-                    if new_dest_account:
-                        new_dest_account.balance += db_transaction.amount
-                        session.add(new_dest_account)
-            
-            session.add(new_account)
+    # Revert the effect of the old transaction and apply the new one, by the same
+    # rule as bulk_update_transactions: deactivating a transaction reverts it
+    _apply_account_balance_changes(
+        session=session,
+        changes=[
+            (old_account_id, -old_amount),
+            (db_transaction.account_id, balance_change(db_transaction)),
+        ],
+    )
     
+    # Move the transaction's effect on the balance snapshots to its new account/date
+    apply_balance_changes(
+        session=session,
+        changes=[
+            old_balance_change,
+            (db_transaction.account_id, db_transaction.date, balance_change(db_transaction)),
+        ],
+    )
+
     # Now we can commit all changes
+    bump_user_data_version(session=session, user_id=db_transaction.user_id)
     session.commit()
     session.refresh(db_transaction)
     
@@ -340,68 +373,304 @@ def update_transaction(
     return db_transaction
 
 
+def _apply_account_balance_changes(
+    *, session: Session, changes: Sequence[Tuple[Optional[uuid.UUID], float]]
+) -> None:
+    """
+    Add (account_id, amount) changes to the stored account balances, without committing.
+
+    Amounts come from balance_change, the rule balance_effect applies to the bulk
+    operations: active incomes add, active expenses subtract, transfers leave the
+    balance alone.
+    """
+    for account_id, amount in changes:
+        if not account_id or not amount:
+            continue
+        account = session.get(Account, account_id)
+        if account:
+            account.balance += amount
+            session.add(account)
+
+
 def _update_debt_payment_progress(*, session: Session, debt_id: uuid.UUID) -> None:
     """Helper function to update a debt's payment progress after transactions change.
     
-    This function ensures that the debt payment progress is accurately calculated based on
-    the sum of all transaction amounts linked to the debt. It updates multiple fields in the
-    debt record, including paid_amount, remaining_amount, and payment_progress percentage.
+    See _update_debts_payment_progress; commits the changes.
     
     Args:
         session: The database session
         debt_id: The UUID of the debt to update
     """
-    # Get the debt
-    debt = session.get(Debt, debt_id)
-    if not debt:
-        return
+    user_ids = _update_debts_payment_progress(session=session, debt_ids=[debt_id])
+    bump_users_data_version(session=session, user_ids=user_ids)
+    session.commit()
+
+
+def _update_debts_payment_progress(
+    *, session: Session, debt_ids: Collection[uuid.UUID]
+) -> Set[uuid.UUID]:
+    """Recalculate the payment progress of debts in a single UPDATE, without committing.
     
-    # Get all active transactions associated with this debt
-    statement = select(Transaction).where(
-        Transaction.debt_id == debt_id,
-        Transaction.is_active == True
+    The paid amount is the sum of the active transactions linked to the debt, from
+    which remaining_amount, payment_progress (0-100) and is_paid follow; installment
+    debts also get their paid and remaining installments from the number of payments.
+    
+    Args:
+        session: The database session
+        debt_ids: The UUIDs of the debts to update
+    
+    Returns:
+        The IDs of the users owning the debts, whose data version the caller bumps
+    """
+    if not debt_ids:
+        return set()
+    payments = and_(Transaction.debt_id == Debt.id, Transaction.is_active == True)
+    paid_amount = (
+        select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(payments).scalar_subquery()
     )
-    transactions = session.exec(statement).all()
-    
-    # Calculate total paid amount from transactions
-    paid_amount = sum(transaction.amount for transaction in transactions)
-    
-    # Calculate remaining amount and ensure it doesn't go below zero
-    remaining_amount = max(0, debt.amount - paid_amount)
-    
-    # Calculate payment progress as percentage (0-100)
-    payment_progress = 0
-    if debt.amount > 0:
-        payment_progress = min(100, round((paid_amount / debt.amount) * 100))
-    
-    # Update debt with new payment status
-    debt.is_paid = remaining_amount <= 0
-    debt.paid_amount = paid_amount
-    debt.remaining_amount = remaining_amount
-    debt.payment_progress = payment_progress
-    
-    # Calculate installment progress if applicable
-    if debt.is_installment and debt.total_installments:
-        # If this is an installment debt, update installment tracking
-        paid_installments = len(transactions)
-        remaining_installments = max(0, debt.total_installments - paid_installments)
-        debt.paid_installments = paid_installments
-        debt.remaining_installments = remaining_installments
-    
-    # Commit the changes to the database
-    session.add(debt)
-    session.commit()
+    paid_installments = select(func.count()).where(payments).scalar_subquery()
+    has_installments = and_(Debt.is_installment == True, Debt.total_installments.is_not(None))
+    user_ids = session.exec(
+        update(Debt)
+        .where(Debt.id.in_(debt_ids))
+        .values(
+            paid_amount=paid_amount,
+            remaining_amount=func.greatest(Debt.amount - paid_amount, 0.0),
+            payment_progress=case(
+                (Debt.amount > 0, func.least(100, func.round(paid_amount / Debt.amount * 100))),
+                else_=0,
+            ),
+            is_paid=Debt.amount - paid_amount <= 0,
+            paid_installments=case((has_installments, paid_installments), else_=Debt.paid_installments),
+            remaining_installments=case(
+                (has_installments, func.greatest(Debt.total_installments - paid_installments, 0)),
+                else_=Debt.remaining_installments,
+            ),
+        )
+        .returning(Debt.user_id)
+        .execution_options(synchronize_session="fetch")
+    ).scalars().all()
+    return set(user_ids)
 
 
 def delete_transaction(*, session: Session, db_transaction: Transaction) -> None:
     """Delete a transaction."""
-    # Store debt_id before deleting the transaction
+    # Store debt_id and user_id before deleting the transaction
     debt_id = db_transaction.debt_id
+    user_id = db_transaction.user_id
     
     # Delete the transaction
+    _apply_account_balance_changes(
+        session=session, changes=[(db_transaction.account_id, -balance_change(db_transaction))]
+    )
+    apply_balance_changes(
+        session=session,
+        changes=[(db_transaction.account_id, db_transaction.date, -balance_change(db_transaction))],
+    )
     session.delete(db_transaction)
+    bump_user_data_version(session=session, user_id=user_id)
     session.commit()
     
     # If this transaction was linked to a debt, update the debt payment progress
     if debt_id:
-        _update_debt_payment_progress(session=session, debt_id=debt_id)
\ No newline at end of file
+        _update_debt_payment_progress(session=session, debt_id=debt_id)
+
+
+def _selection_conditions(
+    *, user_id: uuid.UUID, selection: TransactionSelection
+) -> List[ColumnElement[bool]]:
+    """WHERE conditions of the transactions of a user picked by a bulk operation."""
+    if bool(selection.ids) == (selection.filters is not None):
+        raise ValueError("Select the transactions either by ids or by filters")
+    if len(selection.ids) > BULK_MAX_IDS:
+        raise ValueError(f"At most {BULK_MAX_IDS} transactions can be selected by ID")
+    conditions = transaction_conditions(user_id=user_id, filters=selection.filters)
+    if selection.ids:
+        conditions.append(Transaction.id.in_(selection.ids))
+    return conditions
+
+
+def _check_bulk_changes(*, session: Session, user_id: uuid.UUID, changes: Dict) -> None:
+    """Reject changes pointing transactions to another user's account or debt, or a missing category."""
+    if not changes:
+        raise ValueError("No changes given")
+    if changes.get("category_id") and not session.get(Category, changes["category_id"]):
+        raise ValueError(f"Category with ID {changes['category_id']} does not exist")
+    for field, model in (("account_id", Account), ("debt_id", Debt)):
+        if changes.get(field):
+            owned = session.exec(
+                select(model.id).where(model.id == changes[field], model.user_id == user_id)
+            ).first()
+            if not owned:
+                raise ValueError(f"{model.__name__} with ID {changes[field]} does not exist")
+
+
+def _apply_bulk_effects(
+    *, session: Session, user_id: uuid.UUID, effects: Sequence[Row]
+) -> int:
+    """
+    Apply the (account_id, date, debt_id, amount, count) rows aggregated from a bulk
+    write to the account balances, balance snapshots and debts, without committing.
+    
+    Returns:
+        The number of transactions written
+    """
+    apply_balance_changes(
+        session=session, changes=[(row.account_id, row.date, row.amount) for row in effects]
+    )
+
+    account_deltas: Dict[uuid.UUID, float] = defaultdict(float)
+    for row in effects:
+        if row.account_id and row.amount:
+            account_deltas[row.account_id] += row.amount
+    account_table = Account.__table__
+    if account_deltas:
+        session.execute(
+            update(account_table)
+            .where(account_table.c.id == bindparam("b_id"))
+            .values(balance=account_table.c.balance + bindparam("b_delta")),
+            [{"b_id": account_id, "b_delta": delta} for account_id, delta in account_deltas.items()],
+        )
+
+    # Only the user's own debts can be linked, see _check_bulk_changes
+    _update_debts_payment_progress(
+        session=session, debt_ids={row.debt_id for row in effects if row.debt_id}
+    )
+    bump_user_data_version(session=session, user_id=user_id)
+    return sum(row.count for row in effects)
+
+
+def _aggregate_effects(changes: Union[Select, CompoundSelect]) -> Select:
+    """Sum the rows of a union of (account_id, date, debt_id, amount, count) per account, date and debt."""
+    changes = changes.subquery("changes")
+    return select(
+        changes.c.account_id,
+        changes.c.date,
+        changes.c.debt_id,
+        func.sum(changes.c.amount).label("amount"),
+        func.sum(changes.c.count).label("count"),
+    ).group_by(changes.c.account_id, changes.c.date, changes.c.debt_id)
+
+
+def bulk_update_transactions(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    selection: TransactionSelection,
+    transaction_in: TransactionUpdate,
+) -> int:
+    """
+    Apply the same changes to many transactions of a user in one database transaction.
+    
+    The transactions are updated with a single UPDATE ... RETURNING both their old
+    and new account, date, debt and balance effect, which the same statement sums
+    up per account, date and debt. The account balances and snapshots then move by
+    those net deltas and the affected debts are recalculated, each in one statement,
+    instead of a read-modify-write per transaction. Balances follow
+    calculate_account_balance: active incomes add, active expenses subtract.
+    
+    Args:
+        session: Database session
+        user_id: User ID owning the transactions
+        selection: The transactions to update, by ID or by filters
+        transaction_in: The fields to set, unset fields are left alone
+    
+    Returns:
+        The number of transactions updated
+    """
+    conditions = _selection_conditions(user_id=user_id, selection=selection)
+    changes = transaction_in.model_dump(exclude_unset=True)
+    _check_bulk_changes(session=session, user_id=user_id, changes=changes)
+
+    old = (
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.account_id,
+            Transaction.debt_id,
+            balance_effect.label("amount"),
+        )
+        .where(*conditions)
+        .with_for_update()
+        .subquery("old")
+    )
+    updated = (
+        update(Transaction)
+        .where(Transaction.id == old.c.id, Transaction.date == old.c.date)
+        .values(**changes, updated_at=datetime.now())
+        .returning(
+            old.c.account_id.label("old_account_id"),
+            old.c.date.label("old_date"),
+            old.c.debt_id.label("old_debt_id"),
+            old.c.amount.label("old_amount"),
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.debt_id,
+            balance_effect.label("amount"),
+        )
+        .cte("updated")
+    )
+    effects = session.execute(
+        _aggregate_effects(
+            union_all(
+                # Revert the old effect...
+                select(
+                    updated.c.old_account_id.label("account_id"),
+                    updated.c.old_date.label("date"),
+                    updated.c.old_debt_id.label("debt_id"),
+                    (-updated.c.old_amount).label("amount"),
+                    literal(0).label("count"),
+                ),
+                # ...and apply the new one
+                select(
+                    updated.c.account_id,
+                    updated.c.date,
+                    updated.c.debt_id,
+                    updated.c.amount,
+                    literal(1),
+                ),
+            )
+        )
+    ).all()
+
+    count = _apply_bulk_effects(session=session, user_id=user_id, effects=effects)
+    session.commit()
+    return count
+
+
+def bulk_delete_transactions(
+    *, session: Session, user_id: uuid.UUID, selection: TransactionSelection
+) -> int:
+    """
+    Delete many transactions of a user in one database transaction.
+    
+    A single DELETE ... RETURNING sums up the balance effect of the deleted
+    transactions per account, date and debt; the account balances, snapshots and
+    debts are then adjusted as in bulk_update_transactions.
+    
+    Args:
+        session: Database session
+        user_id: User ID owning the transactions
+        selection: The transactions to delete, by ID or by filters
+    
+    Returns:
+        The number of transactions deleted
+    """
+    conditions = _selection_conditions(user_id=user_id, selection=selection)
+    deleted = (
+        delete(Transaction)
+        .where(*conditions)
+        .returning(
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.debt_id,
+            (-balance_effect).label("amount"),
+            literal(1).label("count"),
+        )
+        .cte("deleted")
+    )
+    effects = session.execute(_aggregate_effects(select(deleted))).all()
+
+    count = _apply_bulk_effects(session=session, user_id=user_id, effects=effects)
+    session.commit()
+    return count
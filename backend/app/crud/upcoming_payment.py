@@ -0,0 +1,190 @@
+import uuid
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, tuple_, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.crud.subscription import RENEWABLE_STATUSES
+from app.models.debt import Debt
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.schemas.upcoming_payment import UpcomingPayment
+
+
+def get_upcoming_payments(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    days: int = 30,
+    today: Optional[date] = None,
+) -> List[UpcomingPayment]:
+    """
+    Get the payments of a user whose reminder falls within the next `days` days.
+
+    Includes payments whose reminder already fired but are not due yet, and
+    unpaid debts past their due date.
+
+    Args:
+        session: Database session
+        user_id: ID of the user
+        days: Number of days ahead to look for reminders
+        today: Reference date (defaults to today)
+
+    Returns:
+        Upcoming payments ordered by due date
+    """
+    today = today or date.today()
+    horizon = today + timedelta(days=days)
+
+    subscriptions = session.exec(
+        select(Subscription).where(
+            Subscription.user_id == user_id,
+            Subscription.status.in_(RENEWABLE_STATUSES),
+            Subscription.reminder_at <= horizon,
+            Subscription.next_payment_date >= today,
+        )
+    ).all()
+    debts = session.exec(
+        select(Debt).where(
+            Debt.user_id == user_id,
+            Debt.is_paid == False,
+            Debt.due_date <= horizon + timedelta(days=settings.DEBT_REMINDER_DAYS),
+        )
+    ).all()
+
+    payments = [_subscription_to_payment(subscription, today) for subscription in subscriptions]
+    payments += [_debt_to_payment(debt, today) for debt in debts]
+    payments.sort(key=lambda payment: (payment.due_date, payment.name))
+    return payments
+
+
+def iter_payment_reminders(
+    *,
+    session: Session,
+    today: Optional[date] = None,
+    page_size: int = 500,
+) -> Iterator[List[Tuple[UpcomingPayment, str]]]:
+    """
+    Yield pages of (payment, user email) whose reminder is due and was not sent yet.
+
+    A reminder is due from its reminder date until the payment is due, so a day
+    the job did not run is caught up by the next run; mark_reminders_sent records
+    the delivered ones. Only active users are included. Pages are fetched with
+    keyset pagination on (reminder date, id), so each page is an index range scan
+    no matter how deep the job is.
+    """
+    today = today or date.today()
+
+    subscriptions = (
+        select(Subscription, User.email)
+        .join(User, User.id == Subscription.user_id)
+        .where(
+            Subscription.status.in_(RENEWABLE_STATUSES),
+            Subscription.reminder_at <= today,
+            Subscription.next_payment_date >= today,
+            Subscription.reminder_sent_for.is_distinct_from(Subscription.next_payment_date),
+            User.is_active == True,
+        )
+    )
+    for rows in _iter_pages(
+        session=session,
+        statement=subscriptions,
+        key_columns=(Subscription.reminder_at, Subscription.id),
+        page_size=page_size,
+    ):
+        yield [(_subscription_to_payment(subscription, today), email) for subscription, email in rows]
+
+    debts = (
+        select(Debt, User.email)
+        .join(User, User.id == Debt.user_id)
+        .where(
+            Debt.is_paid == False,
+            Debt.due_date >= today,
+            Debt.due_date <= today + timedelta(days=settings.DEBT_REMINDER_DAYS),
+            Debt.reminder_sent_for.is_distinct_from(Debt.due_date),
+            User.is_active == True,
+        )
+    )
+    for rows in _iter_pages(
+        session=session,
+        statement=debts,
+        key_columns=(Debt.due_date, Debt.id),
+        page_size=page_size,
+    ):
+        yield [(_debt_to_payment(debt, today), email) for debt, email in rows]
+
+
+def mark_reminders_sent(*, session: Session, payments: Iterable[UpcomingPayment]) -> None:
+    """
+    Record that the reminders of `payments` were delivered, one executemany UPDATE
+    per kind, so iter_payment_reminders no longer yields them for these due dates.
+    """
+    for model, kind in ((Subscription, "subscription"), (Debt, "debt")):
+        rows = [
+            {"b_id": payment.id, "b_due_date": payment.due_date}
+            for payment in payments
+            if payment.kind == kind
+        ]
+        if not rows:
+            continue
+        table = model.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(reminder_sent_for=bindparam("b_due_date")),
+            rows,
+        )
+    session.commit()
+
+
+def _iter_pages(*, session: Session, statement, key_columns: Tuple, page_size: int) -> Iterator[List]:
+    """Run `statement` page by page, resuming after the last key of the previous page."""
+    last_key = None
+    while True:
+        page_statement = statement.order_by(*key_columns).limit(page_size)
+        if last_key is not None:
+            page_statement = page_statement.where(tuple_(*key_columns) > tuple_(*last_key))
+        rows = session.exec(page_statement).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        entity = rows[-1][0]
+        last_key = tuple(getattr(entity, column.key) for column in key_columns)
+
+
+def _subscription_to_payment(subscription: Subscription, today: date) -> UpcomingPayment:
+    return UpcomingPayment(
+        kind="subscription",
+        id=subscription.id,
+        user_id=subscription.user_id,
+        name=subscription.service_name,
+        amount=subscription.amount,
+        due_date=subscription.next_payment_date,
+        reminder_date=subscription.reminder_at or subscription.next_payment_date,
+        days_until_due=(subscription.next_payment_date - today).days,
+        currency_id=subscription.currency_id,
+        account_id=subscription.account_id,
+        icon=subscription.icon,
+        color=subscription.color,
+    )
+
+
+def _debt_to_payment(debt: Debt, today: date) -> UpcomingPayment:
+    return UpcomingPayment(
+        kind="debt",
+        id=debt.id,
+        user_id=debt.user_id,
+        name=debt.creditor_name,
+        amount=debt.minimum_payment or debt.remaining_amount or debt.amount,
+        due_date=debt.due_date,
+        reminder_date=debt.due_date - timedelta(days=settings.DEBT_REMINDER_DAYS),
+        days_until_due=(debt.due_date - today).days,
+        currency_id=debt.currency_id,
+        account_id=debt.account_id,
+        icon=debt.icon,
+        color=debt.color,
+    )
@@ -16,6 +16,8 @@ from decimal import Decimal
 from sqlalchemy import func, and_
 from app.models.transaction import Transaction, TransactionType
 from app.models.currency import Currency
+from app.core.cache import aggregate_cache
+from app.crud.exchange_rate import converted_amount, missing_rate
 
 
 def get_user_by_email(*, session: Session, email: str) -> User | None:
@@ -116,6 +118,17 @@ def _calculate_percentage_change(current_value: Decimal, previous_value: Decimal
     return float(((current_value - previous_value) / previous_value) * 100)
 
 def get_user_financial_summary(session: Session, user: User) -> dict:
+    """Cumulative income/expenses and month-over-month changes, cached per user and day."""
+    return aggregate_cache.get_or_compute(
+        session=session,
+        user_id=user.id,
+        kind="financial_summary",
+        period=date.today(),
+        compute=lambda: _compute_user_financial_summary(session=session, user=user),
+    )
+
+
+def _compute_user_financial_summary(session: Session, user: User) -> dict:
     today = date.today()
     current_month_start = today.replace(day=1)
     
@@ -123,9 +136,17 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
     prev_month_end_date = current_month_start - timedelta(days=1)
     prev_month_start_date = prev_month_end_date.replace(day=1)
 
+    # Amounts converted to the user's default currency at the rate of each transaction date
+    amount_in_user_currency = converted_amount(
+        amount=Transaction.amount,
+        currency_id=Transaction.currency_id,
+        on=Transaction.date,
+        target_currency_id=user.default_currency_id,
+    )
+
     # Cumulative Income: Sum of all income transactions ever
     stmt_total_income = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.INCOME)
     )
@@ -134,7 +155,7 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
 
     # Cumulative Expenses: Sum of all expense transactions ever
     stmt_total_expenses = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.EXPENSE)
     )
@@ -142,7 +163,7 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
 
     # Income - Current Month (from start of current month to today)
     stmt_income_current_month = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.INCOME)
         .where(Transaction.date >= current_month_start)
@@ -152,7 +173,7 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
 
     # Income - Previous Full Month
     stmt_income_prev_month = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.INCOME)
         .where(and_(Transaction.date >= prev_month_start_date, Transaction.date <= prev_month_end_date))
@@ -161,7 +182,7 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
 
     # Expenses - Current Month (from start of current month to today)
     stmt_expenses_current_month = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.EXPENSE)
         .where(Transaction.date >= current_month_start)
@@ -171,13 +192,27 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
 
     # Expenses - Previous Full Month
     stmt_expenses_prev_month = (
-        select(func.sum(Transaction.amount))
+        select(func.sum(amount_in_user_currency))
         .where(Transaction.user_id == user.id)
         .where(Transaction.transaction_type == TransactionType.EXPENSE)
         .where(and_(Transaction.date >= prev_month_start_date, Transaction.date <= prev_month_end_date))
     )
     expenses_prev_month = session.exec(stmt_expenses_prev_month).one_or_none() or Decimal(0)
 
+    # Transactions left out of the totals above for lack of an exchange rate
+    stmt_unconverted = (
+        select(func.count(Transaction.id))
+        .where(Transaction.user_id == user.id)
+        .where(
+            missing_rate(
+                currency_id=Transaction.currency_id,
+                on=Transaction.date,
+                target_currency_id=user.default_currency_id,
+            )
+        )
+    )
+    unconverted_transactions = session.exec(stmt_unconverted).one()
+
     income_change_percentage = _calculate_percentage_change(income_current_month, income_prev_month)
     expense_change_percentage = _calculate_percentage_change(expenses_current_month, expenses_prev_month)
     
@@ -195,6 +230,7 @@ def get_user_financial_summary(session: Session, user: User) -> dict:
         "cumulative_expenses": float(total_expenses),
         "expense_change_percentage": expense_change_percentage,
         "currency_code": currency_code,
+        "unconverted_transactions": unconverted_transactions,
     }
 
 
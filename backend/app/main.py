@@ -1,10 +1,23 @@
-import sentry_sdk
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.routes.file_upload import create_upload_directory
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.db import prewarm_connections
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import MetricsMiddleware, mark_worker_dead, metrics_endpoint
+from app.core.profiling import ProfilingMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.read_routing import ReadYourWritesMiddleware
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -12,14 +25,34 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    # Only imported when enabled: sentry_sdk alone is a good part of the import time
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Side effects live here rather than at import time, so importing the app (tests,
+    # scripts, the benchmarks in app.benchmarks.startup) stays cheap and harmless
+    create_upload_directory()
+    await run_in_threadpool(prewarm_connections)
+    yield
+    mark_worker_dead(os.getpid())
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Added first so it runs innermost: it stores the endpoint's own response, which the
+# other middleware (compression, timing headers) then process like any other
+app.add_middleware(IdempotencyMiddleware)
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -30,4 +63,29 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        route_levels=settings.COMPRESSION_ROUTE_LEVELS,
+    )
+
+# Keeps a client reading from the primary for a while after it writes, whichever worker serves it
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Added before QueryStatsMiddleware so it runs inside it and reuses its query stats
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
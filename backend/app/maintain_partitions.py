@@ -0,0 +1,27 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.partition import ensure_transaction_partitions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def maintain() -> list[str]:
+    with Session(engine) as session:
+        return ensure_transaction_partitions(session=session)
+
+
+def main() -> None:
+    # Run on deploy (scripts/prestart.sh) and meant to be scheduled (e.g. cron,
+    # monthly), so next year's partition always exists before it is needed;
+    # concurrent runs are serialized by an advisory lock in the database.
+    logger.info("Creating missing transaction partitions")
+    created = maintain()
+    logger.info(f"Created {len(created)} transaction partitions: {', '.join(created) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
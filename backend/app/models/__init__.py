@@ -13,6 +13,8 @@ from .enums import (
     DebtType,
     SubscriptionStatus,
     TransactionType,
+    DeletionTarget,
+    DeletionJobStatus,
 )
 
 # Import base models (these should not have schemas imported)
@@ -26,6 +28,10 @@ from .subscription import Subscription
 from .debt import Debt
 from .account import Account
 from .budget import Budget
+from .exchange_rate import ExchangeRate
+from .account_balance_snapshot import AccountBalanceSnapshot
+from .idempotency_key import IdempotencyKey
+from .deletion_job import DeletionJob
 
 # Rebuild the base models
 Currency.model_rebuild()
@@ -38,6 +44,10 @@ Subscription.model_rebuild()
 Debt.model_rebuild()
 Account.model_rebuild()
 Budget.model_rebuild()
+ExchangeRate.model_rebuild()
+AccountBalanceSnapshot.model_rebuild()
+IdempotencyKey.model_rebuild()
+DeletionJob.model_rebuild()
 
 # Export commonly used models and types
 __all__ = [
@@ -56,6 +66,8 @@ __all__ = [
     "DebtType",
     "SubscriptionStatus",
     "TransactionType",
+    "DeletionTarget",
+    "DeletionJobStatus",
     
     # Database Models
     "Currency",
@@ -68,4 +80,8 @@ __all__ = [
     "Debt",
     "Account",
     "Budget",
+    "ExchangeRate",
+    "AccountBalanceSnapshot",
+    "IdempotencyKey",
+    "DeletionJob",
 ] 
\ No newline at end of file
@@ -0,0 +1,25 @@
+import uuid
+import datetime
+from datetime import date
+
+from pydantic import ConfigDict
+from sqlmodel import Field, SQLModel
+
+
+class AccountBalanceSnapshot(SQLModel, table=True):
+    """
+    Balance of an account at the end of a month (snapshot_date is the last day of
+    the month), from every active income and expense on or before that day.
+    Maintained by crud.balance_snapshot.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    __tablename__ = "account_balance_snapshot"
+
+    account_id: uuid.UUID = Field(foreign_key="account.id", primary_key=True)
+    snapshot_date: date = Field(primary_key=True)
+    balance: float
+    updated_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+
+    # Denormalized from the account, for the net worth of a user
+    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
@@ -4,6 +4,7 @@ from datetime import date
 from typing import TYPE_CHECKING, Optional, ForwardRef, List
 
 from pydantic import ConfigDict
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from .enums import DebtType
@@ -58,9 +59,16 @@ class DebtBase(SQLModel):
 class Debt(DebtBase, table=True):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    __table_args__ = (
+        # Range scans of the reminder job and upcoming payments over unpaid debts
+        Index("ix_debt_unpaid_due_date", "due_date", postgresql_where=text("NOT is_paid")),
+    )
+
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
     )
+    # Due date whose payment reminder was delivered, so the reminder job sends it once
+    reminder_sent_for: Optional[date] = None
 
     # Relationships
     user: "User" = Relationship(back_populates="debts")
@@ -0,0 +1,33 @@
+import uuid
+import datetime
+from typing import Optional
+
+from pydantic import ConfigDict
+from sqlmodel import Field, SQLModel
+
+from .enums import DeletionJobStatus, DeletionTarget
+
+
+class DeletionJob(SQLModel, table=True):
+    """
+    Background deletion of an account or a user with every row depending on it,
+    removed in bounded batches by crud.deletion.run_deletion_job.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    __tablename__ = "deletion_job"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False)
+    target_type: DeletionTarget
+    target_id: uuid.UUID = Field(index=True)
+    status: DeletionJobStatus = Field(default=DeletionJobStatus.PENDING, index=True)
+    # Rows to delete, counted when the job starts, and rows deleted (or detached) so far
+    total_rows: Optional[int] = None
+    deleted_rows: int = Field(default=0)
+    error: Optional[str] = Field(default=None, max_length=255)
+    created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    updated_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    finished_at: Optional[datetime.datetime] = None
+
+    # Who asked for the deletion; not a foreign key, the job outlives a deleted user
+    requested_by: uuid.UUID = Field(index=True)
@@ -70,6 +70,13 @@ class DebtType(str, Enum):
     MEDICAL = "medical"
     OTHER = "other"
 
+
+class DebtPayoffStrategy(str, Enum):
+    """Order in which extra payments are put towards debts."""
+    AVALANCHE = "avalanche"  # Highest interest rate first
+    SNOWBALL = "snowball"  # Smallest balance first
+    CUSTOM = "custom"  # Order chosen by the user
+
 class AccountType(str, Enum):
     """Type of account."""
     BANK = "bank"
@@ -96,3 +103,17 @@ class TransactionType(str, Enum):
     INCOME = "income"
     EXPENSE = "expense"
     TRANSFER = "transfer"
+
+
+class DeletionTarget(str, Enum):
+    """Kind of entity removed by a background deletion job."""
+    ACCOUNT = "account"
+    USER = "user"
+
+
+class DeletionJobStatus(str, Enum):
+    """Status of a background deletion job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
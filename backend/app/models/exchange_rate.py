@@ -0,0 +1,37 @@
+import uuid
+import datetime
+from datetime import date
+
+from pydantic import ConfigDict
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class ExchangeRateBase(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    rate: float = Field(gt=0)  # Units of the quote currency for one unit of the base currency
+    rate_date: date  # Day from which the rate applies, until a newer one exists
+    created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    updated_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+
+    # Foreign Keys
+    base_currency_id: uuid.UUID = Field(foreign_key="currency.id")
+    quote_currency_id: uuid.UUID = Field(foreign_key="currency.id")
+
+
+class ExchangeRate(ExchangeRateBase, table=True):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    __tablename__ = "exchange_rate"
+    __table_args__ = (
+        # Also the index behind "latest rate of a pair on or before a date" lookups
+        UniqueConstraint(
+            "base_currency_id", "quote_currency_id", "rate_date",
+            name="uq_exchange_rate_pair_date",
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
+    )
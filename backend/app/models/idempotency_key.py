@@ -0,0 +1,31 @@
+import uuid
+import datetime
+from typing import List, Optional
+
+from pydantic import ConfigDict
+from sqlalchemy import JSON, Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """
+    A mutating request sent with an Idempotency-Key header and, once it completed,
+    its response, replayed when the client retries the request. Expired keys are
+    purged by crud.idempotency.purge_expired_idempotency_keys.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    __tablename__ = "idempotency_key"
+
+    user_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    key: str = Field(primary_key=True, max_length=255)
+    # SHA-256 of the method, path, query string and body of the request
+    request_hash: str = Field(max_length=64)
+    # Null while the first request is still running
+    status_code: Optional[int] = None
+    content_type: Optional[str] = Field(default=None, max_length=255)
+    # [name, value] pairs of the response headers (e.g. Location), but Content-Length
+    response_headers: Optional[List[List[str]]] = Field(default=None, sa_column=Column(JSON))
+    response_body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    expires_at: datetime.datetime = Field(index=True)
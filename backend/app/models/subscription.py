@@ -4,6 +4,7 @@ from datetime import date
 from typing import TYPE_CHECKING, Optional, ForwardRef, List
 
 from pydantic import ConfigDict
+from sqlalchemy import Column, Computed, Date, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from .enums import SubscriptionFrequency, SubscriptionStatus
@@ -45,9 +46,30 @@ class SubscriptionBase(SQLModel):
 class Subscription(SubscriptionBase, table=True):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    __table_args__ = (
+        # Range scans of the renewal job: status = ? AND next_payment_date <= ?
+        Index("ix_subscription_status_next_payment_date", "status", "next_payment_date"),
+        # Range scans of the reminder job and upcoming payments: status = ? AND reminder_at BETWEEN ? AND ?
+        Index("ix_subscription_status_reminder_at", "status", "reminder_at"),
+    )
+
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
     )
+    # Day of month the payments fall on, set from next_payment_date by the crud functions.
+    # next_payment_date may be clamped to a shorter month (Feb 29 for the 31st), this
+    # keeps the later payments on the 31st. NULL means the day of next_payment_date.
+    billing_day: Optional[int] = Field(default=None, ge=1, le=31)
+    # Payment date whose reminder was delivered, so the reminder job sends it once
+    reminder_sent_for: Optional[date] = None
+    # Day the payment reminder is due, maintained by the database
+    reminder_at: Optional[date] = Field(
+        default=None,
+        sa_column=Column(
+            Date,
+            Computed("next_payment_date - COALESCE(reminder_days, 0)", persisted=True),
+        ),
+    )
 
     # Relationships
     user: User = Relationship(back_populates="subscriptions")
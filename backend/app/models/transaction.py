@@ -3,6 +3,8 @@ import datetime
 from typing import TYPE_CHECKING, ForwardRef, Optional
 
 from pydantic import ConfigDict
+from sqlalchemy import DDL, Computed, Index, PrimaryKeyConstraint, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel, Column, String
 
 from .enums import TransactionType
@@ -55,10 +57,34 @@ class Transaction(TransactionBase, table=True):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     __tablename__ = "transaction"
-
-    id: uuid.UUID = Field(
-        default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
+    __table_args__ = (
+        # Range-partitioned by date, one partition per year (see crud.partition): the
+        # partition key has to be part of the primary key. The ORM still identifies
+        # a transaction by its id alone (see __mapper_args__).
+        PrimaryKeyConstraint("id", "date", name="transaction_pkey"),
+        # Transactions of an account over a range of dates (balance on a date, history)
+        Index("ix_transaction_account_id_date", "account_id", "date"),
+        # Words of the description, maintained by the database for full-text search.
+        # Not mapped: it is only used in search conditions, never loaded.
+        Column(
+            "description_search",
+            TSVECTOR,
+            Computed("to_tsvector('simple', coalesce(description, ''))", persisted=True),
+        ),
+        Index("ix_transaction_description_search", "description_search", postgresql_using="gin"),
+        # Trigrams of the description, for partial words and typos
+        Index(
+            "ix_transaction_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
+    __mapper_args__ = {"exclude_properties": ["description_search"], "primary_key": ["id"]}
+
+    # Primary key together with the date, see __table_args__
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, index=True, nullable=False)
 
     # Relationships
     user: "User" = Relationship(back_populates="transactions")
@@ -70,5 +96,18 @@ class Transaction(TransactionBase, table=True):
     financial_goal: Optional["FinancialGoal"] = Relationship(back_populates="transactions")
     debt: Optional["Debt"] = Relationship(back_populates="transactions")
 
+# The trigram index needs the extension when the table is created without migrations
+event.listen(
+    Transaction.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+# A partitioned table created without migrations has no partition to insert into:
+# add the default one (crud.partition.DEFAULT_PARTITION), ensure_transaction_partitions
+# then adds the yearly ones
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL('CREATE TABLE IF NOT EXISTS transaction_default PARTITION OF "transaction" DEFAULT'),
+)
+
 # Update forward references
 Transaction.model_rebuild()
\ No newline at end of file
@@ -50,6 +50,10 @@ class User(UserBase, table=True):
         default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
     )
     hashed_password: str = Field(nullable=False)
+    # Bumped on every write to the user's data; part of the aggregate cache keys
+    data_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Time of the last data_version bump; the user's reads skip the replica for a while after it
+    data_changed_at: Optional[datetime.datetime] = Field(default=None)
 
     # Relationships
     default_currency: Currency = Relationship(back_populates="users")
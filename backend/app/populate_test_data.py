@@ -1,13 +1,26 @@
+import argparse
 import logging
 import datetime
+import math
 import random
+import uuid
 
-from sqlmodel import Session, select
+from sqlalchemy import insert, text
+from sqlmodel import Session, delete, select
 
 from app import crud
 from app.core.config import settings
 from app.core.db import engine
-from app.models.enums import TransactionType, PaymentMethodType
+from app.core.security import get_password_hash
+from app.models.enums import (
+    AccountType,
+    DebtType,
+    PaymentMethodType,
+    SubscriptionFrequency,
+    SubscriptionStatus,
+    SubscriptionType,
+    TransactionType,
+)
 from app.models.user import User
 from app.models.debt import Debt
 from app.models.financial_goal import FinancialGoal
@@ -16,6 +29,8 @@ from app.models.payment_method import PaymentMethod
 from app.models.category import Category
 from app.models.budget import Budget
 from app.models.account import Account
+from app.models.account_balance_snapshot import AccountBalanceSnapshot
+from app.models.transaction import Transaction
 from app.schemas.user import UserCreate
 from app.schemas.currency import CurrencyCreate
 from app.schemas.category import CategoryCreate
@@ -33,6 +48,7 @@ from app.crud import debt as debt_crud
 from app.crud import financial_goal as financial_goal_crud
 from app.crud import subscription as subscription_crud
 from app.crud import budget as budget_crud
+from app.services.subscription_service import advance_payment_date
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,85 +73,33 @@ def is_development_environment() -> bool:
 
 
 def clear_existing_data(session: Session) -> None:
-    """Clear existing data using CRUD functions."""
+    """Clear existing data with one set-based DELETE per table, keeping the superuser."""
     logger.info("Clearing existing data...")
-    
-    # First, delete all transactions as they have foreign key constraints to other entities
-    # This ensures we don't have constraint violations when deleting referenced entities
-    logger.info("Deleting all transactions...")
-    from app.models.transaction import Transaction
-    statement = select(Transaction).where(Transaction.id != None)
-    transactions = session.exec(statement).all()
-    for transaction in transactions:
-        logger.info(f"Deleting transaction: {transaction.id}")
-        session.delete(transaction)
-    # Commit to ensure transactions are deleted before proceeding
-    session.commit()
-    
-    # Get all users except the superuser
-    statement = select(User).where(User.email != settings.FIRST_SUPERUSER)
-    users = session.exec(statement).all()
-    
-    # Delete all test users and their related data
-    for user in users:
-        logger.info(f"Deleting data for user: {user.email}")
-        
-        # Delete accounts
-        accounts = account_crud.get_accounts(db=session, user_id=user.id)
-        for account in accounts:
-            logger.info(f"Deleting account: {account.id}")
-            account_crud.delete_account(db=session, account_id=account.id)
-        
-        # Delete debts
-        statement = select(Debt).where(Debt.user_id == user.id)
-        debts = session.exec(statement).all()
-        for debt in debts:
-            logger.info(f"Deleting debt: {debt.id}")
-            session.delete(debt)
-        
-        # Delete financial goals
-        statement = select(FinancialGoal).where(FinancialGoal.user_id == user.id)
-        goals = session.exec(statement).all()
-        for goal in goals:
-            logger.info(f"Deleting financial goal: {goal.id}")
-            session.delete(goal)
-        
-        # Delete subscriptions
-        statement = select(Subscription).where(Subscription.user_id == user.id)
-        subscriptions = session.exec(statement).all()
-        for subscription in subscriptions:
-            logger.info(f"Deleting subscription: {subscription.id}")
-            session.delete(subscription)
-            
-        # Delete budgets
-        statement = select(Budget).where(Budget.user_id == user.id)
-        budgets = session.exec(statement).all()
-        for budget in budgets:
-            logger.info(f"Deleting budget: {budget.id}")
-            session.delete(budget)
-        
-        # Delete payment methods
-        statement = select(PaymentMethod).where(PaymentMethod.id != None)
-        payment_methods = session.exec(statement).all()
-        for payment_method in payment_methods:
-            logger.info(f"Deleting payment method: {payment_method.id}")
-            session.delete(payment_method)
-        
-        # Finally delete the user
-        logger.info(f"Deleting user: {user.id}")
-        session.delete(user)
-    
-    # Delete all categories
-    logger.info("Deleting all categories...")
-    statement = select(Category).where(Category.id != None)
-    categories = session.exec(statement).all()
-    for category in categories:
-        logger.info(f"Deleting category: {category.id} - {category.name}")
-        session.delete(category)
-    
-    # Commit all deletions
+
+    test_user_ids = select(User.id).where(User.email != settings.FIRST_SUPERUSER)
+
+    # Children before parents: transactions reference accounts, debts, subscriptions
+    # and goals; debts and subscriptions reference accounts. Every transaction and
+    # budget goes, since the categories and payment methods they point to are
+    # deleted too.
+    statements = [
+        ("transactions", delete(Transaction)),
+        ("budgets", delete(Budget)),
+        ("subscriptions", delete(Subscription).where(Subscription.user_id.in_(test_user_ids))),
+        ("financial goals", delete(FinancialGoal).where(FinancialGoal.user_id.in_(test_user_ids))),
+        ("debts", delete(Debt).where(Debt.user_id.in_(test_user_ids))),
+        ("balance snapshots", delete(AccountBalanceSnapshot).where(AccountBalanceSnapshot.user_id.in_(test_user_ids))),
+        ("accounts", delete(Account).where(Account.user_id.in_(test_user_ids))),
+        ("users", delete(User).where(User.email != settings.FIRST_SUPERUSER)),
+        ("payment methods", delete(PaymentMethod)),
+        ("categories", delete(Category)),
+    ]
+    for name, statement in statements:
+        result = session.exec(statement)
+        logger.info(f"Deleted {result.rowcount} {name}")
+
     session.commit()
-    
+
     # Reset the created_ids dictionary to ensure we don't reference stale data
     for key in created_ids:
         if isinstance(created_ids[key], dict):
@@ -849,6 +813,346 @@ def create_test_budgets(session: Session) -> None:
         logger.info(f"Created {budget_count} budgets for user {email}")
 
 
+# ---------------------------------------------------------------------------
+# Synthetic data at volume (load tests and benchmarks)
+# ---------------------------------------------------------------------------
+
+# Share of daily expenses and log-normal (median, sigma) of their amount, per category
+SYNTHETIC_EXPENSE_CATEGORIES = {
+    "Food": (0.36, 22.0, 0.7),
+    "Transportation": (0.16, 12.0, 0.6),
+    "Entertainment": (0.12, 28.0, 0.8),
+    "Personal": (0.11, 35.0, 0.9),
+    "Utilities": (0.08, 60.0, 0.5),
+    "Healthcare": (0.06, 45.0, 1.0),
+    "Education": (0.04, 80.0, 0.9),
+    "Housing": (0.07, 90.0, 1.1),
+}
+SYNTHETIC_ACCOUNTS = [
+    ("Cash", AccountType.CASH),
+    ("Bank Account", AccountType.BANK),
+    ("Credit Card", AccountType.CREDIT),
+    ("Savings Account", AccountType.SAVINGS),
+    ("Digital Wallet", AccountType.DIGITAL),
+    ("Investment Account", AccountType.INVESTMENT),
+]
+# (service, amount, frequency, category)
+SYNTHETIC_SUBSCRIPTIONS = [
+    ("Netflix", 15.49, SubscriptionFrequency.MONTHLY, "Entertainment"),
+    ("Spotify", 10.99, SubscriptionFrequency.MONTHLY, "Entertainment"),
+    ("Gym Membership", 45.00, SubscriptionFrequency.MONTHLY, "Healthcare"),
+    ("Cloud Storage", 2.99, SubscriptionFrequency.MONTHLY, "Utilities"),
+    ("Mobile Plan", 30.00, SubscriptionFrequency.MONTHLY, "Utilities"),
+    ("News", 39.00, SubscriptionFrequency.QUARTERLY, "Education"),
+    ("Amazon Prime", 139.00, SubscriptionFrequency.YEARLY, "Personal"),
+]
+# (creditor, debt type, amount range, annual interest, installments)
+SYNTHETIC_DEBTS = [
+    ("Auto Finance Bank", DebtType.AUTO, (8_000, 30_000), 4.5, 48),
+    ("Federal Student Aid", DebtType.STUDENT, (10_000, 40_000), 5.0, 120),
+    ("Credit Card Company", DebtType.CREDIT_CARD, (500, 6_000), 18.99, None),
+    ("Personal Loan Co", DebtType.PERSONAL, (1_000, 10_000), 9.5, 24),
+]
+SYNTHETIC_TRANSACTION_COLUMNS = (
+    "id", "date", "amount", "description", "is_active", "created_at", "updated_at",
+    "user_id", "category_id", "payment_method_id", "currency_id", "account_id",
+    "subscription_id", "debt_id", "transaction_type",
+)
+
+
+def generate_synthetic_data(
+    session: Session,
+    *,
+    users: int = 100,
+    accounts_per_user: int = 3,
+    years: int = 2,
+    seed: int = 42,
+    daily_expenses: float = 2.5,
+    debt_probability: float = 0.5,
+    batch_size: int = 5_000,
+) -> int:
+    """Generate `users` users with `accounts_per_user` accounts and `years` years of history.
+    
+    Every user gets a monthly salary, rent, daily expenses (Poisson count, log-normal
+    amounts, busier weekends), subscriptions charged on their billing day and, for
+    `debt_probability` of them, installment debts paid monthly, plus a monthly
+    budget per expense category. The same seed always produces the same data.
+    
+    Users, accounts, budgets, subscriptions and debts are inserted with executemany batches;
+    transactions are streamed to the database with COPY. Account balances and debt
+    progress are then derived from the loaded transactions with set-based UPDATEs.
+    
+    Requires the currencies, categories and payment methods created by
+    create_test_currencies, create_test_categories and create_test_payment_methods.
+    
+    Returns:
+        Number of transactions loaded
+    """
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    start_date = today.replace(year=today.year - years, day=1)
+    now = datetime.datetime.now()
+
+    currency_ids = created_ids["currencies"]
+    category_ids = created_ids["categories"]
+    card_payment_ids = [created_ids["payment_methods"][name] for name in ("Credit Card", "Debit Card")]
+    cash_payment_id = created_ids["payment_methods"]["Cash"]
+    transfer_payment_id = created_ids["payment_methods"]["Bank Transfer"]
+    hashed_password = get_password_hash("password123")
+
+    expense_names = list(SYNTHETIC_EXPENSE_CATEGORIES)
+    expense_weights = [weight for weight, _, _ in SYNTHETIC_EXPENSE_CATEGORIES.values()]
+
+    user_rows, account_rows, budget_rows, subscription_rows, debt_rows = [], [], [], [], []
+    plans = []  # Per-user inputs of the transaction stream
+    for index in range(users):
+        user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        currency_code = rng.choices(["USD", "EUR", "ARS"], weights=[0.7, 0.2, 0.1])[0]
+        currency_id = currency_ids[currency_code]
+        user_rows.append({
+            "id": user_id,
+            "email": f"synthetic.user{index}@example.com",
+            "first_name": "Synthetic",
+            "last_name": f"User {index}",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": False,
+            "subscription_type": SubscriptionType.FREE,
+            "default_currency_id": currency_id,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+        accounts = []
+        for position in range(accounts_per_user):
+            name, account_type = SYNTHETIC_ACCOUNTS[position % len(SYNTHETIC_ACCOUNTS)]
+            account_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            # Most accounts are in the user's currency, a few are foreign
+            account_currency_id = (
+                currency_id if position == 0 or rng.random() < 0.85
+                else currency_ids[rng.choice(["USD", "EUR", "ARS"])]
+            )
+            account_rows.append({
+                "id": account_id,
+                "name": name if position < len(SYNTHETIC_ACCOUNTS) else f"{name} {position}",
+                "account_type": account_type,
+                "balance": 0.0,
+                "institution": None if account_type == AccountType.CASH else f"{name} Corp",
+                "is_default": position == 0,
+                "user_id": user_id,
+                "currency_id": account_currency_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+            accounts.append((account_id, account_currency_id))
+        # Salary, rent and subscriptions go through the main (bank) account when there is one
+        main_account = accounts[1] if len(accounts) > 1 else accounts[0]
+
+        subscriptions = []
+        for service, amount, frequency, category in rng.sample(
+            SYNTHETIC_SUBSCRIPTIONS, rng.randint(1, 5)
+        ):
+            subscription_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            first_payment = start_date + datetime.timedelta(days=rng.randint(0, 27))
+            payment_dates = [first_payment]
+            while True:
+                next_date = advance_payment_date(payment_dates[-1], frequency)
+                if next_date > today:
+                    break
+                payment_dates.append(next_date)
+            subscription_rows.append({
+                "id": subscription_id,
+                "service_name": service,
+                "amount": amount,
+                "frequency": frequency,
+                "next_payment_date": advance_payment_date(payment_dates[-1], frequency),
+                "status": SubscriptionStatus.ACTIVE,
+                "reminder_days": 3,
+                "user_id": user_id,
+                "currency_id": main_account[1],
+                "account_id": main_account[0],
+                "created_at": now,
+                "updated_at": now,
+            })
+            subscriptions.append((subscription_id, service, amount, category, payment_dates))
+
+        for category, (weight, median, sigma) in SYNTHETIC_EXPENSE_CATEGORIES.items():
+            # Roughly the expected monthly spend of the category, rounded to tens
+            expected = daily_expenses * 31 * weight * median * math.exp(sigma ** 2 / 2)
+            budget_rows.append({
+                "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                "name": category,
+                "amount": round(expected * rng.uniform(0.9, 1.3), -1) or 10,
+                "color": "#607D8B",
+                "user_id": user_id,
+                "category_id": category_ids[category],
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        debts = []
+        if rng.random() < debt_probability:
+            for creditor, debt_type, (low, high), interest, installments in rng.sample(
+                SYNTHETIC_DEBTS, rng.randint(1, 2)
+            ):
+                debt_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+                amount = round(rng.uniform(low, high), 2)
+                monthly_payment = round(amount / (installments or 12), 2)
+                debt_start = start_date + datetime.timedelta(days=rng.randint(0, 365 * years // 2))
+                debt_rows.append({
+                    "id": debt_id,
+                    "creditor_name": creditor,
+                    "amount": amount,
+                    "due_date": today.replace(day=15),
+                    "is_paid": False,
+                    "debt_type": debt_type,
+                    "interest_rate": interest,
+                    "minimum_payment": monthly_payment,
+                    "paid_amount": 0.0,
+                    "remaining_amount": amount,
+                    "payment_progress": 0.0,
+                    "is_installment": installments is not None,
+                    "total_installments": installments,
+                    "paid_installments": 0,
+                    "remaining_installments": installments,
+                    "start_date": debt_start,
+                    "user_id": user_id,
+                    "currency_id": main_account[1],
+                    "account_id": main_account[0],
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                debts.append((debt_id, creditor, amount, monthly_payment, debt_start))
+
+        plans.append({
+            "user_id": user_id,
+            "accounts": accounts,
+            "main_account": main_account,
+            "salary": round(rng.lognormvariate(math.log(3_000), 0.45), 2),
+            "rent_share": rng.uniform(0.2, 0.35),
+            "subscriptions": subscriptions,
+            "debts": debts,
+            "seed": rng.getrandbits(64),
+        })
+
+    logger.info(
+        f"Inserting {len(user_rows)} users, {len(account_rows)} accounts, {len(budget_rows)} budgets, "
+        f"{len(subscription_rows)} subscriptions and {len(debt_rows)} debts..."
+    )
+    for model, rows in (
+        (User, user_rows),
+        (Account, account_rows),
+        (Budget, budget_rows),
+        (Subscription, subscription_rows),
+        (Debt, debt_rows),
+    ):
+        for offset in range(0, len(rows), batch_size):
+            session.execute(insert(model.__table__), rows[offset:offset + batch_size])
+
+    def transaction_rows():
+        for plan in plans:
+            # One generator per user: the data of a user does not depend on the others
+            user_rng = random.Random(plan["seed"])
+            user_id = plan["user_id"]
+            main_account_id, main_currency_id = plan["main_account"]
+
+            def row(day, amount, description, category, payment_method_id, account,
+                    transaction_type=TransactionType.EXPENSE, subscription_id=None, debt_id=None):
+                return (
+                    uuid.UUID(int=user_rng.getrandbits(128), version=4), day, amount, description,
+                    True, now, now, user_id, category_ids[category], payment_method_id,
+                    account[1], account[0], subscription_id, debt_id, transaction_type.value,
+                )
+
+            month = start_date
+            while month <= today:
+                yield row(month, plan["salary"], "Salary", "Income", transfer_payment_id,
+                          plan["main_account"], transaction_type=TransactionType.INCOME)
+                rent_day = month + datetime.timedelta(days=user_rng.randint(0, 4))
+                if rent_day <= today:
+                    yield row(rent_day, round(plan["salary"] * plan["rent_share"], 2), "Rent",
+                              "Housing", transfer_payment_id, plan["main_account"])
+                for debt_id, creditor, amount, monthly_payment, debt_start in plan["debts"]:
+                    if debt_start <= month and month.replace(day=15) <= today:
+                        yield row(month.replace(day=15), monthly_payment, f"Payment to {creditor}",
+                                  "Housing", transfer_payment_id, plan["main_account"], debt_id=debt_id)
+                month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+            for subscription_id, service, amount, category, payment_dates in plan["subscriptions"]:
+                for payment_date in payment_dates:
+                    yield row(payment_date, amount, f"{service} subscription", category,
+                              card_payment_ids[0], plan["main_account"], subscription_id=subscription_id)
+
+            day = start_date
+            while day <= today:
+                rate = daily_expenses * (1.3 if day.weekday() >= 5 else 1.0)
+                for _ in range(_poisson(user_rng, rate)):
+                    category = user_rng.choices(expense_names, weights=expense_weights)[0]
+                    _, median, sigma = SYNTHETIC_EXPENSE_CATEGORIES[category]
+                    amount = round(max(0.5, user_rng.lognormvariate(math.log(median), sigma)), 2)
+                    account = user_rng.choice(plan["accounts"])
+                    payment_method_id = (
+                        cash_payment_id if user_rng.random() < 0.2 else user_rng.choice(card_payment_ids)
+                    )
+                    yield row(day, amount, category, category, payment_method_id, account)
+                day += datetime.timedelta(days=1)
+
+    logger.info("Streaming synthetic transactions with COPY...")
+    loaded = 0
+    cursor = session.connection().connection.driver_connection.cursor()
+    columns = ", ".join(SYNTHETIC_TRANSACTION_COLUMNS)
+    with cursor.copy(f'COPY "transaction" ({columns}) FROM STDIN') as copy:
+        for transaction_row in transaction_rows():
+            copy.write_row(transaction_row)
+            loaded += 1
+            if loaded % 1_000_000 == 0:
+                logger.info(f"Loaded {loaded} transactions")
+
+    logger.info("Deriving account balances and debt progress...")
+    session.exec(text("""
+        UPDATE account SET balance = totals.balance
+        FROM (
+            SELECT t.account_id,
+                   SUM(CASE WHEN t.transaction_type = 'income' THEN t.amount ELSE -t.amount END) AS balance
+            FROM "transaction" t JOIN "user" u ON u.id = t.user_id
+            WHERE u.email LIKE 'synthetic.user%' AND t.is_active
+            GROUP BY t.account_id
+        ) AS totals
+        WHERE account.id = totals.account_id
+    """))
+    session.exec(text("""
+        UPDATE debt SET
+            paid_amount = LEAST(paid.total, debt.amount),
+            remaining_amount = GREATEST(debt.amount - paid.total, 0),
+            payment_progress = LEAST(paid.total / debt.amount * 100, 100),
+            is_paid = paid.total >= debt.amount,
+            paid_installments = CASE WHEN debt.is_installment THEN paid.payments END,
+            remaining_installments = CASE WHEN debt.is_installment
+                THEN GREATEST(debt.total_installments - paid.payments, 0) END
+        FROM (
+            SELECT debt_id, SUM(amount) AS total, COUNT(*) AS payments
+            FROM "transaction" WHERE debt_id IS NOT NULL AND is_active
+            GROUP BY debt_id
+        ) AS paid
+        WHERE debt.id = paid.debt_id
+    """))
+    session.commit()
+    logger.info(f"Loaded {loaded} synthetic transactions for {users} users")
+    return loaded
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    """Sample a Poisson-distributed count (Knuth's method; normal approximation for large rates)."""
+    if lam > 30:
+        return max(0, round(rng.gauss(lam, math.sqrt(lam))))
+    threshold = math.exp(-lam)
+    count, product = 0, rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
 def populate_test_data(force: bool = False) -> None:
     """Main function to populate test data.
     
@@ -921,17 +1225,71 @@ def populate_test_data(force: bool = False) -> None:
     logger.info("Test data population completed successfully.")
 
 
+def populate_synthetic_data(
+    *,
+    users: int,
+    accounts_per_user: int,
+    years: int,
+    seed: int,
+    force: bool = False,
+) -> None:
+    """Replace the test data with a generated dataset of the requested size.
+    
+    Args:
+        users: Number of users to generate
+        accounts_per_user: Number of accounts per user
+        years: Years of transaction history per user
+        seed: Seed of the random generator; the same seed produces the same data
+        force: If True, will populate test data even in non-development environments.
+    """
+    if not force and not is_development_environment():
+        logger.warning("Not in development environment. Skipping test data population.")
+        return
+
+    logger.info("Starting synthetic data population...")
+    with Session(engine) as session:
+        clear_existing_data(session)
+        create_test_currencies(session)
+        create_test_categories(session)
+        create_test_payment_methods(session)
+        generate_synthetic_data(
+            session,
+            users=users,
+            accounts_per_user=accounts_per_user,
+            years=years,
+            seed=seed,
+        )
+    logger.info("Synthetic data population completed successfully.")
+
+
 def main() -> None:
     """Main entry point."""
-    import sys
+    parser = argparse.ArgumentParser(description="Populate the database with test data.")
+    parser.add_argument("--force", action="store_true", help="Run outside of local/staging environments")
+    parser.add_argument(
+        "--synthetic", action="store_true",
+        help="Generate a parameterized dataset instead of the hand-written fixtures",
+    )
+    parser.add_argument("--users", type=int, default=100, help="Synthetic users to generate")
+    parser.add_argument("--accounts", type=int, default=3, help="Accounts per synthetic user")
+    parser.add_argument("--years", type=int, default=2, help="Years of history per synthetic user")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic data generator")
+    args = parser.parse_args()
     
     logger.info("Checking environment and populating test data if needed")
     
-    # Check if --force flag is provided
-    force = "--force" in sys.argv
-    
+    if args.synthetic:
+        populate_synthetic_data(
+            users=args.users,
+            accounts_per_user=args.accounts,
+            years=args.years,
+            seed=args.seed,
+            force=args.force,
+        )
+        return
+
     # Always populate test data, clearing existing data first
-    populate_test_data(force=force)
+    populate_test_data(force=args.force)
 
 
 if __name__ == "__main__":
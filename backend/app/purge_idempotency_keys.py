@@ -0,0 +1,26 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.idempotency import purge_expired_idempotency_keys
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def purge() -> int:
+    with Session(engine) as session:
+        return purge_expired_idempotency_keys(session=session)
+
+
+def main() -> None:
+    # Meant to be scheduled (e.g. hourly with cron); expired keys are never
+    # replayed, purging only keeps the table small
+    logger.info("Purging expired idempotency keys")
+    deleted = purge()
+    logger.info(f"Deleted {deleted} idempotency keys")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.subscription import renew_due_subscriptions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def renew() -> int:
+    with Session(engine) as session:
+        return renew_due_subscriptions(session=session)
+
+
+def main() -> None:
+    # Meant to be scheduled (e.g. cron, every hour) on one or more hosts;
+    # concurrent runs are serialized by an advisory lock in the database.
+    logger.info("Renewing due subscriptions")
+    created = renew()
+    logger.info(f"Created {created} subscription transactions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.deletion import resume_deletion_jobs
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def resume() -> int:
+    with Session(engine) as session:
+        return resume_deletion_jobs(session=session)
+
+
+def main() -> None:
+    # Meant to be scheduled (e.g. every few minutes with cron); deletions normally
+    # run as background tasks of the request, this picks up those a worker dropped
+    logger.info("Resuming abandoned deletion jobs")
+    completed = resume()
+    logger.info(f"Completed {completed} deletion jobs")
+
+
+if __name__ == "__main__":
+    main()
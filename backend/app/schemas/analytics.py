@@ -0,0 +1,43 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import uuid
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+
+
+class AnalyticsDimension(str, Enum):
+    """What transactions can be grouped by in the spending analytics."""
+    CATEGORY = "category"
+    ACCOUNT = "account"
+    PAYMENT_METHOD = "payment_method"
+    CURRENCY = "currency"
+    TRANSACTION_TYPE = "transaction_type"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
+class AnalyticsResponse(SQLModel):
+    """
+    Spending breakdown in columnar form: `data[column][i]` is the value of
+    `column` in the i-th row, for every column of `columns`.
+
+    Category, account, payment method and currency contribute an `<name>_id` and a
+    `<name>` (name or code) column, periods the date they start on. `income` and
+    `expense` are summed in `currency_id`, the user's currency, over the `count`
+    transactions but the `unconverted` ones, which have no exchange rate. With
+    `rollup`, subtotal rows hold null in the rolled-up dimensions and `grouping` is
+    their bitmask (first dimension highest bit, 0 for detail rows, all bits for
+    the grand total).
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    group_by: List[AnalyticsDimension]
+    rollup: bool
+    currency_id: Optional[uuid.UUID] = None
+    columns: List[str]
+    data: Dict[str, List[Any]]
+    row_count: int
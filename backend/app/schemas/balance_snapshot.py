@@ -0,0 +1,37 @@
+import uuid
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+
+
+class BalanceInterval(str, Enum):
+    """Spacing of the points of a balance series; each point is the end of its period."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AccountBalanceHistory(SQLModel):
+    """End-of-day balances of an account, one per date from date_from to date_to."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    account_id: uuid.UUID
+    currency_id: uuid.UUID
+    date_from: date
+    date_to: date
+    opening_balance: float
+    dates: List[date]
+    balances: List[float]
+
+
+class NetWorthSeries(SQLModel):
+    """Sum of the balances of every account of a user, in their default currency."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    currency_id: Optional[uuid.UUID]
+    interval: BalanceInterval
+    dates: List[date]
+    net_worth: List[float]
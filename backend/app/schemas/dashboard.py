@@ -0,0 +1,35 @@
+from typing import Any, Dict, List
+import datetime
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+
+from app.schemas.account import AccountRead
+from app.schemas.budget import BudgetSummary
+from app.schemas.debt import DebtRead
+from app.schemas.financial_goal import FinancialGoalReadWithDetails
+from app.schemas.subscription import SubscriptionRead
+from app.schemas.summary import UserExpenseSummaryResponse
+from app.schemas.user import UserFinancialSummaryResponse
+
+
+class BudgetsProgressSnapshot(SQLModel):
+    """Same payload as GET /budgets/progress."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    budgets: List[Dict[str, Any]] = []
+    summary: BudgetSummary
+
+
+class UserDashboardResponse(SQLModel):
+    """All the widgets of the home screen, computed in a single request."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    financial_summary: UserFinancialSummaryResponse
+    expense_summary: UserExpenseSummaryResponse
+    budgets_progress: BudgetsProgressSnapshot
+    accounts: List[AccountRead] = []
+    debts: List[DebtRead] = []
+    subscriptions: List[SubscriptionRead] = []
+    financial_goals: List[FinancialGoalReadWithDetails] = []
+    generated_at: datetime.datetime
@@ -6,7 +6,7 @@ from pydantic import ConfigDict, computed_field
 from sqlmodel import Field, SQLModel
 
 from app.models.debt import DebtBase
-from app.models.enums import DebtType
+from app.models.enums import DebtPayoffStrategy, DebtType
 from app.schemas.currency import CurrencyRead
 from app.schemas.account import AccountRead
 
@@ -86,4 +86,34 @@ class DebtAddPayment(SQLModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     amount: float = Field(gt=0)
     description: Optional[str] = Field(default=None, max_length=255)
-    payment_date: Optional[date] = Field(default=None)  # If not provided, current date will be used
\ No newline at end of file
+    payment_date: Optional[date] = Field(default=None)  # If not provided, current date will be used
+
+
+class DebtAmortizationSchedule(SQLModel):
+    """Month by month payoff of a debt: payments, interest and balances hold one value per date."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    debt_id: uuid.UUID
+    creditor_name: str
+    starting_balance: float
+    interest_rate: float
+    minimum_payment: float
+    payoff_date: Optional[date] = None  # None if not paid off within the simulation
+    total_interest: float
+    total_paid: float
+    dates: List[date] = []
+    payments: List[float] = []
+    interest: List[float] = []
+    balances: List[float] = []
+
+
+class DebtPayoffPlan(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    strategy: DebtPayoffStrategy
+    monthly_budget: float
+    order: List[uuid.UUID] = []  # Debts in the order extra payments go to them
+    paid_off: bool
+    months_to_payoff: Optional[int] = None
+    payoff_date: Optional[date] = None
+    total_interest: float
+    total_paid: float
+    debts: List[DebtAmortizationSchedule] = []
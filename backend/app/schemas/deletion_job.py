@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import ConfigDict, computed_field
+from sqlmodel import SQLModel
+
+from app.models.enums import DeletionJobStatus, DeletionTarget
+
+
+class DeletionJobRead(SQLModel):
+    """State of the background deletion of an account or a user."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    id: uuid.UUID
+    target_type: DeletionTarget
+    target_id: uuid.UUID
+    status: DeletionJobStatus
+    total_rows: Optional[int] = None
+    deleted_rows: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def progress(self) -> float:
+        """Fraction of the rows deleted so far, from 0 to 1."""
+        if self.status == DeletionJobStatus.COMPLETED:
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(self.deleted_rows / self.total_rows, 1.0)
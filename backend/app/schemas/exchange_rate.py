@@ -0,0 +1,25 @@
+from datetime import date
+import uuid
+
+from pydantic import ConfigDict
+from sqlmodel import Field, SQLModel
+
+
+class ExchangeRateBase(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    base_currency_id: uuid.UUID
+    quote_currency_id: uuid.UUID
+    rate: float = Field(gt=0)  # Units of the quote currency for one unit of the base currency
+    rate_date: date
+
+
+class ExchangeRateCreate(ExchangeRateBase):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    pass
+
+
+class ExchangeRateRead(ExchangeRateBase):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    id: uuid.UUID
+
@@ -71,6 +71,21 @@ class FinancialGoalAddSaving(SQLModel):
 
 # Utility functions for converting models to API response format
 
+def goal_progress_percentage(goal) -> float:
+    """
+    Percentage of the target amount already saved.
+    
+    Args:
+        goal: A FinancialGoal model instance
+        
+    Returns:
+        float: The progress percentage, 0 when the goal has no target amount
+    """
+    if goal.target_amount > 0:
+        return (goal.current_amount / goal.target_amount) * 100
+    return 0
+
+
 def format_financial_goal_for_response(goal) -> Dict[str, Any]:
     """
     Convert a FinancialGoal model instance to a dictionary format suitable for API responses.
@@ -86,9 +101,7 @@ def format_financial_goal_for_response(goal) -> Dict[str, Any]:
         return None
         
     # Calculate progress percentage
-    progress_percentage = 0
-    if goal.target_amount > 0:
-        progress_percentage = (goal.current_amount / goal.target_amount) * 100
+    progress_percentage = goal_progress_percentage(goal)
     
     # Create the base dictionary from the model
     goal_dict = {
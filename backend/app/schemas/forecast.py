@@ -0,0 +1,32 @@
+import uuid
+from datetime import date
+from typing import List
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+
+
+class AccountForecast(SQLModel):
+    """Projected end-of-day balances of an account, one per date of the forecast."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    account_id: uuid.UUID
+    name: str
+    currency_id: uuid.UUID
+    starting_balance: float
+    balances: List[float]
+    projected_income: float
+    projected_expenses: float
+    lowest_balance: float
+    lowest_balance_date: date
+
+
+class CashFlowForecastResponse(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    start_date: date
+    end_date: date
+    months: int
+    history_months: int
+    dates: List[date]
+    accounts: List[AccountForecast]
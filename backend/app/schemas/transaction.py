@@ -94,4 +94,43 @@ class PaginatedTransactionResponse(SQLModel):
     total: int
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+
+class TransactionFilters(SQLModel):
+    """Filters shared by the transaction list, count, export and summaries; unset filters match everything."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    transaction_type: Optional[TransactionType] = None
+    date_from: Optional[datetime.date] = None  # Inclusive
+    date_to: Optional[datetime.date] = None  # Inclusive
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+    category_ids: List[uuid.UUID] = []
+    category_name: Optional[str] = None
+    account_ids: List[uuid.UUID] = []
+    payment_method_ids: List[uuid.UUID] = []
+    debt_id: Optional[uuid.UUID] = None
+    subscription_id: Optional[uuid.UUID] = None
+    financial_goal_id: Optional[uuid.UUID] = None
+    is_active: Optional[bool] = None
+    search: Optional[str] = None  # Description search, see crud.transaction.description_search
+
+
+class TransactionSelection(SQLModel):
+    """Transactions of the current user targeted by a bulk operation: either by ID or by filters."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    ids: List[uuid.UUID] = []
+    filters: Optional[TransactionFilters] = None
+
+
+class TransactionBulkUpdate(TransactionSelection):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    changes: TransactionUpdate
+
+
+class TransactionBulkResult(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    count: int  # Number of transactions updated or deleted
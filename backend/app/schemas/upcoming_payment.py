@@ -0,0 +1,34 @@
+import uuid
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+
+
+class UpcomingPayment(SQLModel):
+    """A subscription charge or debt payment coming up for a user."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    kind: Literal["subscription", "debt"]
+    id: uuid.UUID
+    user_id: uuid.UUID
+    name: str
+    amount: float
+    due_date: date
+    reminder_date: date
+    days_until_due: int
+    currency_id: uuid.UUID
+    account_id: Optional[uuid.UUID] = None
+    icon: Optional[str] = None
+    color: Optional[str] = None
+
+
+class UpcomingPaymentsResponse(SQLModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: List[UpcomingPayment]
+    count: int
+    total_amount: float  # In the user's default currency
+    # Payments left out of the total for lack of an exchange rate
+    unconverted: int = 0
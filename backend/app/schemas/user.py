@@ -73,6 +73,8 @@ class UserFinancialSummaryResponse(SQLModel):
     cumulative_expenses: float
     expense_change_percentage: float
     currency_code: str
+    # Transactions left out of the totals for lack of an exchange rate
+    unconverted_transactions: int = 0
 
 
 class UserPublic(UserBase):
@@ -0,0 +1,39 @@
+import logging
+from datetime import date
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.notifications import NotificationQueue
+from app.crud.upcoming_payment import mark_reminders_sent
+from app.services.reminder_service import send_payment_reminders
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def send(today: date) -> int:
+    with Session(engine) as session:
+        with NotificationQueue(workers=settings.REMINDER_NOTIFICATION_WORKERS) as notifications:
+            queued = send_payment_reminders(session=session, notifications=notifications, today=today)
+        # Only the delivered ones: a reminder that failed is sent again by the next run
+        mark_reminders_sent(session=session, payments=notifications.delivered)
+    logger.info(f"Delivered {notifications.sent} reminders, {notifications.failed} failed")
+    return queued
+
+
+def main() -> None:
+    # Meant to be scheduled once a day: each run sends the reminders due today that
+    # were not sent yet, including those of days the job did not run.
+    if not settings.emails_enabled:
+        logger.warning("Emails are not configured, skipping payment reminders")
+        return
+    today = date.today()
+    logger.info("Sending payment reminders")
+    queued = send(today)
+    logger.info(f"Queued {queued} payment reminders")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import uuid
-from typing import List, Dict, Any, Optional, Sequence
+from datetime import date, timedelta
+from typing import Collection, List, Dict, Any, Optional, Sequence
 from sqlmodel import Session
 
 from app.models.account import Account
+from app.models.deletion_job import DeletionJob
 from app.models.enums import AccountType
 from app.schemas.account import (
     AccountCreate, 
@@ -11,7 +13,11 @@ from app.schemas.account import (
     AccountReadWithDetails,
     AccountTypeResponse
 )
+from app.core.cache import aggregate_cache
 from app.crud import account as account_crud
+from app.crud import balance_snapshot as balance_snapshot_crud
+from app.crud import deletion as deletion_crud
+from app.schemas.balance_snapshot import AccountBalanceHistory
 from app.crud.transaction import get_transaction_count as get_transaction_count_from_db
 
 class AccountService:
@@ -21,18 +27,21 @@ class AccountService:
     """
     
     @staticmethod
-    def get_accounts(db: Session, user_id: uuid.UUID) -> Sequence[Account]:
+    def get_accounts(
+        db: Session, user_id: uuid.UUID, fields: Optional[Collection[str]] = None
+    ) -> Sequence[Account]:
         """
         Obtiene todas las cuentas de un usuario.
         
         Args:
             db: Sesión de base de datos
             user_id: ID del usuario
+            fields: Atributos a cargar (todos si es None)
             
         Returns:
             Lista de cuentas del usuario
         """
-        return account_crud.get_accounts(db=db, user_id=user_id)
+        return account_crud.get_accounts(db=db, user_id=user_id, fields=fields)
     
     @staticmethod
     def create_account(
@@ -87,11 +96,18 @@ class AccountService:
         if not account or account.user_id != user_id:
             return None
         
-        # Actualizar balance basado en transacciones
+        # Actualizar balance basado en transacciones, antes de leer la versión de datos:
+        # si lo corrige, la versión cambia y los detalles cacheados dejan de servirse
         account_crud.update_account_balance(db=db, account_id=account_id)
-        
-        # Obtener cuenta con detalles completos
-        return account_crud.get_account_with_details(db=db, account_id=account_id)
+
+        # Obtener detalles; se cachean hasta el próximo cambio de datos del usuario
+        return aggregate_cache.get_or_compute(
+            session=db,
+            user_id=user_id,
+            kind="account_details",
+            period=account_id,
+            compute=lambda: account_crud.get_account_with_details(db=db, account_id=account_id),
+        )
     
     @staticmethod
     def update_account(
@@ -135,9 +151,14 @@ class AccountService:
         )
     
     @staticmethod
-    def delete_account(db: Session, account_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+    def delete_account(
+        db: Session, account_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Optional[DeletionJob]:
         """
-        Elimina una cuenta y sus entidades asociadas.
+        Programa la eliminación de una cuenta y sus entidades asociadas.
+        
+        La eliminación se hace por lotes en segundo plano con run_deletion_job;
+        el trabajo devuelto permite consultar su progreso.
         
         Args:
             db: Sesión de base de datos
@@ -145,15 +166,48 @@ class AccountService:
             user_id: ID del usuario
             
         Returns:
-            True si se eliminó correctamente, False en caso contrario
+            El trabajo de eliminación, o None si la cuenta no existe o no pertenece al usuario
         """
         # Verificar que la cuenta existe y pertenece al usuario
         account = account_crud.get_account(db=db, account_id=account_id)
         if not account or account.user_id != user_id:
-            return False
+            return None
+        
+        return deletion_crud.create_account_deletion_job(
+            session=db, account=account, requested_by=user_id
+        )
+    
+    @staticmethod
+    def get_balance_history(
+        db: Session,
+        account_id: uuid.UUID,
+        user_id: uuid.UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Optional[AccountBalanceHistory]:
+        """
+        Obtiene el balance al cierre de cada día de una cuenta en un rango de fechas.
         
-        # Eliminar la cuenta y sus entidades asociadas
-        return account_crud.delete_account(db=db, account_id=account_id)
+        Args:
+            db: Sesión de base de datos
+            account_id: ID de la cuenta
+            user_id: ID del usuario
+            date_from: Primer día (por defecto, 90 días antes de date_to)
+            date_to: Último día (por defecto, hoy)
+            
+        Returns:
+            Historial de balances o None si la cuenta no existe
+        """
+        # Verificar que la cuenta existe y pertenece al usuario
+        account = account_crud.get_account(db=db, account_id=account_id)
+        if not account or account.user_id != user_id:
+            return None
+        
+        date_to = date_to or date.today()
+        date_from = date_from or date_to - timedelta(days=89)
+        return balance_snapshot_crud.get_balance_history(
+            session=db, account=account, date_from=date_from, date_to=date_to
+        )
     
     @staticmethod
     def get_account_types() -> List[AccountTypeResponse]:
@@ -1,6 +1,15 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from app.models.debt import Debt
 from app.models.enums import DebtStatus
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Balances below this are considered paid off (rounding leftovers)
+PAID_OFF_THRESHOLD = 0.005
+
 
 def mark_as_paid(debt: Debt) -> None:
     """
@@ -51,3 +60,82 @@ def calculate_monthly_payment(debt: Debt, months: int) -> float:
     else:
         # No interest
         return debt.amount / months
+
+
+
+@dataclass(frozen=True)
+class PayoffSimulation:
+    """Month by month result of simulate_payoff, as (months, debts) arrays."""
+
+    payments: "np.ndarray"
+    interest: "np.ndarray"
+    balances: "np.ndarray"
+    # Whether every balance reached zero within the simulated months
+    paid_off: bool
+
+
+def simulate_payoff(
+    balances: "np.ndarray",
+    annual_rates: "np.ndarray",
+    minimum_payments: "np.ndarray",
+    priority: "np.ndarray",
+    monthly_budget: float,
+    max_months: int = 600,
+) -> PayoffSimulation:
+    """
+    Simulate paying off several debts with a fixed monthly budget.
+    
+    Every month, each debt accrues interest at its annual rate / 12, then gets its
+    minimum payment, and what is left of the budget goes to the debts in `priority`
+    order, each one being paid off before the next gets anything. The budget stays
+    the same as debts are paid off, so their minimum payments roll over to the others.
+    Each month is computed for all the debts at once with array operations.
+    
+    Args:
+        balances: Current balance of each debt
+        annual_rates: Annual interest rate of each debt, in percent
+        minimum_payments: Minimum monthly payment of each debt
+        priority: Indices of the debts, in the order extra payments go to them
+        monthly_budget: Total paid each month, at least the sum of the minimum payments
+        max_months: Months after which the simulation stops if debts are still unpaid
+        
+    Returns:
+        The payments, interest and end-of-month balances of each month and debt
+        
+    Raises:
+        ValueError: If the budget does not cover the minimum payments
+    """
+    import numpy as np
+    balances = np.asarray(balances, dtype=float).copy()
+    if monthly_budget < float(np.sum(minimum_payments)) - PAID_OFF_THRESHOLD:
+        raise ValueError("The monthly budget must cover the minimum payments of every debt")
+    monthly_rates = np.asarray(annual_rates, dtype=float) / 100 / 12
+    minimum_payments = np.asarray(minimum_payments, dtype=float)
+
+    payments = np.zeros((max_months, len(balances)))
+    interest = np.zeros((max_months, len(balances)))
+    history = np.zeros((max_months, len(balances)))
+    months = 0
+    while months < max_months and np.any(balances > PAID_OFF_THRESHOLD):
+        interest[months] = balances * monthly_rates
+        balances += interest[months]
+        minimums = np.minimum(minimum_payments, balances)
+        left = balances - minimums
+        # Extra payments: each debt in priority order gets what the ones before it left over
+        extra_budget = monthly_budget - minimums.sum()
+        ordered = left[priority]
+        taken_before = np.cumsum(ordered) - ordered
+        extra = np.zeros_like(balances)
+        extra[priority] = np.clip(extra_budget - taken_before, 0, ordered)
+        payments[months] = minimums + extra
+        balances -= payments[months]
+        balances[balances <= PAID_OFF_THRESHOLD] = 0
+        history[months] = balances
+        months += 1
+
+    return PayoffSimulation(
+        payments=payments[:months],
+        interest=interest[:months],
+        balances=history[:months],
+        paid_off=not np.any(balances > PAID_OFF_THRESHOLD),
+    )
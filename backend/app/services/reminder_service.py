@@ -0,0 +1,47 @@
+from datetime import date
+
+from sqlmodel import Session
+
+from app.core.notifications import NotificationQueue
+from app.crud.upcoming_payment import iter_payment_reminders
+from app.utils import generate_payment_reminder_email
+
+
+def send_payment_reminders(
+    *,
+    session: Session,
+    notifications: NotificationQueue,
+    today: date,
+    page_size: int = 500,
+) -> int:
+    """
+    Queue a reminder email for every payment whose reminder is due on `today` and
+    was not sent yet, keyed by the payment: once the queue is done, pass its
+    `delivered` payments to mark_reminders_sent.
+
+    Args:
+        session: Database session
+        notifications: Started queue delivering the emails
+        today: Reference date of the run
+        page_size: Number of payments fetched per query
+        
+    Returns:
+        The number of reminders queued
+    """
+    queued = 0
+    for page in iter_payment_reminders(
+        session=session, today=today, page_size=page_size
+    ):
+        for payment, email in page:
+            notifications.enqueue(
+                email_to=email,
+                email_data=generate_payment_reminder_email(
+                    email_to=email,
+                    name=payment.name,
+                    amount=payment.amount,
+                    due_date=payment.due_date,
+                ),
+                key=payment,
+            )
+            queued += 1
+    return queued
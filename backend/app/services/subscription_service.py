@@ -1,8 +1,44 @@
+import calendar
 from datetime import date
+from typing import Optional
 from app.models.enums import SubscriptionFrequency, SubscriptionStatus
 from app.models.subscription import Subscription
 
 
+FREQUENCY_MONTHS = {
+    SubscriptionFrequency.MONTHLY: 1,
+    SubscriptionFrequency.QUARTERLY: 3,
+    SubscriptionFrequency.YEARLY: 12,
+}
+
+
+def advance_payment_date(
+    current: date, frequency: SubscriptionFrequency, billing_day: Optional[int] = None
+) -> date:
+    """
+    Calculate the payment date that follows `current` for the given frequency.
+    
+    The payment falls on `billing_day` (by default the day of `current`), clamped
+    to the length of the target month: a payment on the 31st falls on Feb 28/29
+    and, with billing_day=31, is back on the 31st in March. A yearly payment on
+    Feb 29 is followed by Feb 28.
+    
+    Args:
+        current: The current payment date
+        frequency: The subscription frequency
+        billing_day: Day of month the payments fall on (see Subscription.billing_day)
+        
+    Returns:
+        The next payment date
+    """
+    months = FREQUENCY_MONTHS[SubscriptionFrequency(frequency)]
+    month_index = current.month - 1 + months
+    year = current.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(billing_day or current.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
 def renew_subscription(subscription: Subscription) -> date:
     """
     Renew the subscription and calculate the next payment date.
@@ -13,30 +49,9 @@ def renew_subscription(subscription: Subscription) -> date:
     Returns:
         The new next payment date
     """
-    if subscription.frequency == SubscriptionFrequency.MONTHLY:
-        # Add one month to the next payment date
-        # Handle month rollover correctly
-        month = subscription.next_payment_date.month % 12 + 1
-        year = subscription.next_payment_date.year + (subscription.next_payment_date.month // 12)
-        day = min(subscription.next_payment_date.day, 
-                 [31, 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28, 
-                  31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month-1])
-        subscription.next_payment_date = date(year, month, day)
-    elif subscription.frequency == SubscriptionFrequency.YEARLY:
-        # Add one year to the next payment date
-        subscription.next_payment_date = date(
-            subscription.next_payment_date.year + 1, 
-            subscription.next_payment_date.month, 
-            subscription.next_payment_date.day
-        )
-    elif subscription.frequency == SubscriptionFrequency.QUARTERLY:
-        # Add three months to the next payment date
-        month = (subscription.next_payment_date.month + 2) % 12 + 1
-        year = subscription.next_payment_date.year + ((subscription.next_payment_date.month + 2) // 12)
-        day = min(subscription.next_payment_date.day, 
-                 [31, 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28, 
-                  31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month-1])
-        subscription.next_payment_date = date(year, month, day)
+    subscription.next_payment_date = advance_payment_date(
+        subscription.next_payment_date, subscription.frequency, subscription.billing_day
+    )
     
     # Update status if needed
     if subscription.status == SubscriptionStatus.PENDING_RENEWAL:
@@ -0,0 +1,27 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.balance_snapshot import refresh_balance_snapshots
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def refresh() -> int:
+    with Session(engine) as session:
+        return refresh_balance_snapshots(session=session)
+
+
+def main() -> None:
+    # Meant to be scheduled nightly (e.g. cron) on one or more hosts; concurrent
+    # runs are serialized by an advisory lock in the database. The first run
+    # backfills the snapshots of every account.
+    logger.info("Refreshing account balance snapshots")
+    written = refresh()
+    logger.info(f"Wrote {written} balance snapshots")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+
+def test_balance_history_and_net_worth(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    currencies = client.get(f"{settings.API_V1_STR}/currencies/").json()
+    currency_id = next(currency["id"] for currency in currencies if currency["code"] == "USD")
+    category = client.post(
+        f"{settings.API_V1_STR}/categories/",
+        headers=superuser_token_headers,
+        json={"name": "History groceries", "category_type": "expense", "color": "#009688"},
+    ).json()
+    payment_method = client.post(
+        f"{settings.API_V1_STR}/payment-methods/",
+        headers=superuser_token_headers,
+        json={"name": f"History card {random_lower_string()}"},
+    ).json()
+    r = client.post(
+        f"{settings.API_V1_STR}/accounts/",
+        headers=normal_user_token_headers,
+        json={"name": "History checking", "account_type": "bank", "currency_id": currency_id},
+    )
+    assert r.status_code == 201, r.text
+    account = r.json()
+
+    for date, amount, transaction_type in [
+        ("2021-03-01", 500, "income"),
+        ("2021-03-03", 120, "expense"),
+        ("2021-04-01", 80, "expense"),
+    ]:
+        r = client.post(
+            f"{settings.API_V1_STR}/transactions",
+            headers=normal_user_token_headers,
+            json={
+                "description": "History",
+                "amount": amount,
+                "transaction_type": transaction_type,
+                "date": date,
+                "currency_id": currency_id,
+                "category_id": category["id"],
+                "payment_method_id": payment_method["id"],
+                "account_id": account["id"],
+            },
+        )
+        assert r.status_code == 200, r.text
+
+    r = client.get(
+        f"{settings.API_V1_STR}/accounts/{account['id']}/balance-history",
+        headers=normal_user_token_headers,
+        params={"date_from": "2021-03-02", "date_to": "2021-03-04"},
+    )
+    assert r.status_code == 200, r.text
+    history = r.json()
+    assert history["opening_balance"] == 500
+    assert history["dates"] == ["2021-03-02", "2021-03-03", "2021-03-04"]
+    assert history["balances"] == [500, 380, 380]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/accounts/{account['id']}/balance-history",
+        headers=normal_user_token_headers,
+        params={"date_from": "2021-03-04", "date_to": "2021-03-02"},
+    )
+    assert r.status_code == 400
+
+    r = client.get(
+        f"{settings.API_V1_STR}/accounts/{account['id']}/balance-history",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/net-worth",
+        headers=normal_user_token_headers,
+        params={"date_from": "2021-02-15", "date_to": "2021-04-15", "interval": "month"},
+    )
+    assert r.status_code == 200, r.text
+    series = r.json()
+    assert series["dates"] == ["2021-02-28", "2021-03-31", "2021-04-15"]
+    assert series["net_worth"] == [0, 380, 300]
@@ -0,0 +1,107 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+
+def _create_transactions(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    headers: dict[str, str],
+) -> None:
+    currencies = client.get(f"{settings.API_V1_STR}/currencies/").json()
+    currency_id = next(currency["id"] for currency in currencies if currency["code"] == "USD")
+    categories = [
+        client.post(
+            f"{settings.API_V1_STR}/categories/",
+            headers=superuser_token_headers,
+            json={"name": name, "category_type": "expense", "color": "#009688"},
+        ).json()
+        for name in ("Analytics food", "Analytics rent")
+    ]
+    payment_method = client.post(
+        f"{settings.API_V1_STR}/payment-methods/",
+        headers=superuser_token_headers,
+        json={"name": f"Analytics card {random_lower_string()}"},
+    ).json()
+    # (category, date, amount, type)
+    transactions = [
+        (0, "2022-01-10", 10, "expense"),
+        (0, "2022-01-20", 20, "expense"),
+        (1, "2022-01-01", 500, "expense"),
+        (0, "2022-02-05", 30, "expense"),
+        (1, "2022-02-01", 1000, "income"),
+    ]
+    for category, date, amount, transaction_type in transactions:
+        r = client.post(
+            f"{settings.API_V1_STR}/transactions",
+            headers=headers,
+            json={
+                "description": "Analytics",
+                "amount": amount,
+                "transaction_type": transaction_type,
+                "date": date,
+                "currency_id": currency_id,
+                "category_id": categories[category]["id"],
+                "payment_method_id": payment_method["id"],
+            },
+        )
+        assert r.status_code == 200, r.text
+
+
+def test_group_by_with_rollup_returns_columnar_subtotals(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    _create_transactions(client, superuser_token_headers, normal_user_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/analytics",
+        headers=normal_user_token_headers,
+        params={
+            "group_by": ["month", "category"],
+            "rollup": True,
+            "date_from": "2022-01-01",
+            "date_to": "2022-12-31",
+        },
+    )
+    assert r.status_code == 200, r.text
+    result = r.json()
+    assert result["columns"] == [
+        "month", "category_id", "category", "grouping", "income", "expense", "count", "unconverted",
+    ]
+    data = result["data"]
+    rows = list(
+        zip(data["month"], data["category"], data["grouping"], data["income"], data["expense"], data["count"], strict=True)
+    )
+    assert rows == [
+        ("2022-01-01", "Analytics food", 0, 0.0, 30.0, 2),
+        ("2022-01-01", "Analytics rent", 0, 0.0, 500.0, 1),
+        ("2022-01-01", None, 1, 0.0, 530.0, 3),
+        ("2022-02-01", "Analytics food", 0, 0.0, 30.0, 1),
+        ("2022-02-01", "Analytics rent", 0, 1000.0, 0.0, 1),
+        ("2022-02-01", None, 1, 1000.0, 30.0, 2),
+        (None, None, 3, 1000.0, 560.0, 5),
+    ]
+    assert result["row_count"] == len(rows)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/analytics",
+        headers=normal_user_token_headers,
+        params={"group_by": "transaction_type", "date_from": "2022-01-01", "date_to": "2022-12-31"},
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["transaction_type"] == ["expense", "income"]
+    assert data["count"] == [4, 1]
+
+
+def test_dimensions_cannot_repeat(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/analytics",
+        headers=normal_user_token_headers,
+        params={"group_by": ["year", "year"]},
+    )
+    assert r.status_code == 400
@@ -0,0 +1,73 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def _create_debt(client: TestClient, headers: dict[str, str], **debt: object) -> dict:
+    r = client.post(f"{settings.API_V1_STR}/debts/", headers=headers, json=debt)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_payoff_plan_strategies_and_schedules(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    card = _create_debt(
+        client, superuser_token_headers,
+        creditor_name="Plan card", amount=1000, interest_rate=24, minimum_payment=50,
+    )
+    loan = _create_debt(
+        client, superuser_token_headers,
+        creditor_name="Plan loan", amount=300, interest_rate=0, minimum_payment=30,
+    )
+
+    def plan(**params: object) -> dict:
+        r = client.get(
+            f"{settings.API_V1_STR}/debts/payoff-plan", headers=superuser_token_headers, params=params
+        )
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    def position(plan: dict, debt: dict) -> int:
+        return plan["order"].index(debt["id"])
+
+    avalanche = plan(strategy="avalanche", monthly_budget=1000)
+    snowball = plan(strategy="snowball", monthly_budget=1000)
+    custom = plan(strategy="custom", monthly_budget=1000, order=[loan["id"]])
+    assert position(avalanche, card) < position(avalanche, loan)
+    assert position(snowball, loan) < position(snowball, card)
+    assert custom["order"][0] == loan["id"]
+    assert avalanche["paid_off"]
+    assert avalanche["total_interest"] <= snowball["total_interest"]
+    schedule = next(debt for debt in avalanche["debts"] if debt["debt_id"] == card["id"])
+    assert len(schedule["dates"]) == len(schedule["payments"]) == len(schedule["balances"])
+    assert schedule["balances"][-1] == 0
+    assert schedule["payoff_date"] == schedule["dates"][-1]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/debts/{card['id']}/schedule", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    minimum_schedule = r.json()
+    assert minimum_schedule["payments"][0] == 50
+    assert minimum_schedule["interest"][0] == 20
+
+    # The cached schedule is recomputed once the debt changes
+    r = client.patch(
+        f"{settings.API_V1_STR}/debts/{card['id']}",
+        headers=superuser_token_headers,
+        json={"minimum_payment": 100},
+    )
+    assert r.status_code == 200
+    r = client.get(
+        f"{settings.API_V1_STR}/debts/{card['id']}/schedule", headers=superuser_token_headers
+    )
+    assert r.json()["payments"][0] == 100
+    assert len(r.json()["dates"]) < len(minimum_schedule["dates"])
+
+    r = client.get(
+        f"{settings.API_V1_STR}/debts/payoff-plan",
+        headers=superuser_token_headers,
+        params={"monthly_budget": 10},
+    )
+    assert r.status_code == 400
@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def _currency_ids(client: TestClient) -> dict[str, str]:
+    r = client.get(f"{settings.API_V1_STR}/currencies/")
+    return {currency["code"]: currency["id"] for currency in r.json()}
+
+
+def test_upsert_exchange_rate_replaces_rate_of_same_day(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    currencies = _currency_ids(client)
+    data = {
+        "base_currency_id": currencies["EUR"],
+        "quote_currency_id": currencies["USD"],
+        "rate": 1.08,
+        "rate_date": "2024-01-02",
+    }
+    r = client.put(
+        f"{settings.API_V1_STR}/exchange-rates/", headers=superuser_token_headers, json=data
+    )
+    assert r.status_code == 200
+    first = r.json()
+
+    r = client.put(
+        f"{settings.API_V1_STR}/exchange-rates/",
+        headers=superuser_token_headers,
+        json={**data, "rate": 1.1},
+    )
+    assert r.status_code == 200
+    second = r.json()
+    assert second["id"] == first["id"]
+    assert second["rate"] == 1.1
+
+
+def test_upsert_exchange_rate_same_currency(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    currencies = _currency_ids(client)
+    r = client.put(
+        f"{settings.API_V1_STR}/exchange-rates/",
+        headers=superuser_token_headers,
+        json={
+            "base_currency_id": currencies["USD"],
+            "quote_currency_id": currencies["USD"],
+            "rate": 1,
+            "rate_date": "2024-01-02",
+        },
+    )
+    assert r.status_code == 400
+
+
+def test_upsert_exchange_rate_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    currencies = _currency_ids(client)
+    r = client.put(
+        f"{settings.API_V1_STR}/exchange-rates/",
+        headers=normal_user_token_headers,
+        json={
+            "base_currency_id": currencies["EUR"],
+            "quote_currency_id": currencies["USD"],
+            "rate": 1.08,
+            "rate_date": "2024-01-02",
+        },
+    )
+    assert r.status_code == 403
@@ -0,0 +1,121 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.query_stats import capture_queries
+from app.tests.utils.utils import random_lower_string
+
+
+def _usd_id(client: TestClient) -> str:
+    r = client.get(f"{settings.API_V1_STR}/currencies/")
+    return next(currency["id"] for currency in r.json() if currency["code"] == "USD")
+
+
+def _create_account(client: TestClient, headers: dict[str, str], name: str) -> dict:
+    r = client.post(
+        f"{settings.API_V1_STR}/accounts/",
+        headers=headers,
+        json={
+            "name": name,
+            "account_type": "bank",
+            "currency_id": _usd_id(client),
+            "institution": "Sparse Bank",
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_accounts_fields_narrow_query_and_response(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    _create_account(client, normal_user_token_headers, "Sparse checking")
+
+    with capture_queries() as stats:
+        r = client.get(
+            f"{settings.API_V1_STR}/accounts/",
+            headers=normal_user_token_headers,
+            params={"fields": "name, balance"},
+        )
+    assert r.status_code == 200
+    assert r.json()
+    assert all(set(account) == {"id", "name", "balance"} for account in r.json())
+    account_query = next(s for s, _ in stats.statements if "FROM account" in s)
+    assert "account.institution" not in account_query
+
+
+def test_transactions_fields_load_requested_relationships(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    account = _create_account(client, normal_user_token_headers, "Sparse wallet")
+    category = client.post(
+        f"{settings.API_V1_STR}/categories/",
+        headers=superuser_token_headers,
+        json={"name": "Sparse coffee shops", "category_type": "expense", "color": "#795548"},
+    ).json()
+    payment_method = client.post(
+        f"{settings.API_V1_STR}/payment-methods/",
+        headers=superuser_token_headers,
+        json={"name": f"Sparse cash {random_lower_string()}"},
+    ).json()
+    r = client.post(
+        f"{settings.API_V1_STR}/transactions",
+        headers=normal_user_token_headers,
+        json={
+            "description": "Sparse coffee",
+            "amount": 3.5,
+            "transaction_type": "expense",
+            "date": "2024-03-01",
+            "currency_id": account["currency_id"],
+            "account_id": account["id"],
+            "category_id": category["id"],
+            "payment_method_id": payment_method["id"],
+        },
+    )
+    assert r.status_code == 200, r.text
+
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions",
+        headers=normal_user_token_headers,
+        params={"fields": "amount,account", "account_id": account["id"]},
+    )
+    assert r.status_code == 200
+    page = r.json()
+    assert page["total"] == 1
+    assert page["items"] == [
+        {"id": page["items"][0]["id"], "amount": 3.5, "account": page["items"][0]["account"]}
+    ]
+    assert page["items"][0]["account"]["id"] == account["id"]
+
+
+def test_goals_fields_compute_derived_fields(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/financial-goals/",
+        headers=normal_user_token_headers,
+        json={"name": "Sparse trip", "target_amount": 200, "current_amount": 50},
+    )
+    assert r.status_code == 200, r.text
+
+    r = client.get(
+        f"{settings.API_V1_STR}/financial-goals/",
+        headers=normal_user_token_headers,
+        params={"fields": "name,progress_percentage"},
+    )
+    assert r.status_code == 200
+    goal = next(goal for goal in r.json() if goal["name"] == "Sparse trip")
+    assert goal == {"id": goal["id"], "name": "Sparse trip", "progress_percentage": 25.0}
+
+
+def test_unknown_fields_are_rejected(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/debts/",
+        headers=normal_user_token_headers,
+        params={"fields": "creditor_name,password"},
+    )
+    assert r.status_code == 400
+    assert "password" in r.json()["detail"]
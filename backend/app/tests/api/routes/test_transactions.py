@@ -0,0 +1,150 @@
+import csv
+import io
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+
+def _create_transactions(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    headers: dict[str, str],
+    amounts: list[float],
+    name: str = "Filter",
+) -> dict:
+    currencies = client.get(f"{settings.API_V1_STR}/currencies/").json()
+    currency_id = next(currency["id"] for currency in currencies if currency["code"] == "USD")
+    category = client.post(
+        f"{settings.API_V1_STR}/categories/",
+        headers=superuser_token_headers,
+        json={"name": f"{name} books", "category_type": "expense", "color": "#3f51b5"},
+    ).json()
+    payment_method = client.post(
+        f"{settings.API_V1_STR}/payment-methods/",
+        headers=superuser_token_headers,
+        json={"name": f"{name} card {random_lower_string()}"},
+    ).json()
+    for day, amount in enumerate(amounts, start=1):
+        r = client.post(
+            f"{settings.API_V1_STR}/transactions",
+            headers=headers,
+            json={
+                "description": f"{name} book {day}",
+                "amount": amount,
+                "transaction_type": "expense",
+                "date": f"2023-02-{day:02d}",
+                "currency_id": currency_id,
+                "category_id": category["id"],
+                "payment_method_id": payment_method["id"],
+            },
+        )
+        assert r.status_code == 200, r.text
+    return category
+
+
+def test_list_and_export_apply_the_same_filters(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    category = _create_transactions(
+        client, superuser_token_headers, normal_user_token_headers, [5, 15, 25, 35]
+    )
+    params = {
+        "category_id": category["id"],
+        "date_from": "2023-02-02",
+        "date_to": "2023-02-04",
+        "amount_max": 30,
+    }
+
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions", headers=normal_user_token_headers, params=params
+    )
+    assert r.status_code == 200
+    page = r.json()
+    assert page["total"] == 2
+    assert [item["amount"] for item in page["items"]] == [25, 15]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions/export",
+        headers=normal_user_token_headers,
+        params=params,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "attachment" in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [(row["date"], row["amount"]) for row in rows] == [
+        ("2023-02-03", "25.0"),
+        ("2023-02-02", "15.0"),
+    ]
+    assert rows[0]["category"] == "Filter books"
+    assert rows[0]["currency"] == "USD"
+
+
+def test_inverted_ranges_are_rejected(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions",
+        headers=normal_user_token_headers,
+        params={"date_from": "2024-02-01", "date_to": "2024-01-01"},
+    )
+    assert r.status_code == 400
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions/export",
+        headers=normal_user_token_headers,
+        params={"amount_min": 10, "amount_max": 5},
+    )
+    assert r.status_code == 400
+
+
+def test_bulk_update_and_delete(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    category = _create_transactions(
+        client, superuser_token_headers, normal_user_token_headers, [5, 15, 25], name="Bulk"
+    )
+    other_category = client.post(
+        f"{settings.API_V1_STR}/categories/",
+        headers=superuser_token_headers,
+        json={"name": "Bulk comics", "category_type": "expense", "color": "#3f51b5"},
+    ).json()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/transactions/bulk-update",
+        headers=normal_user_token_headers,
+        json={
+            "filters": {"category_ids": [category["id"]], "amount_min": 10},
+            "changes": {"category_id": other_category["id"]},
+        },
+    )
+    assert r.status_code == 200, r.text
+    assert r.json() == {"count": 2}
+
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions",
+        headers=normal_user_token_headers,
+        params={"category_id": other_category["id"]},
+    )
+    ids = [item["id"] for item in r.json()["items"]]
+    assert len(ids) == 2
+
+    r = client.post(
+        f"{settings.API_V1_STR}/transactions/bulk-delete",
+        headers=normal_user_token_headers,
+        json={"ids": ids},
+    )
+    assert r.json() == {"count": 2}
+
+    # Either ids or filters
+    r = client.post(
+        f"{settings.API_V1_STR}/transactions/bulk-delete",
+        headers=normal_user_token_headers,
+        json={"ids": ids, "filters": {}},
+    )
+    assert r.status_code == 400
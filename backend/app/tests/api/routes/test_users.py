@@ -1,3 +1,5 @@
+import datetime
+import itertools
 import uuid
 from unittest.mock import patch
 
@@ -7,7 +9,9 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import Currency, Debt, DeletionJob, ExchangeRate, Subscription, User
+from app.models.enums import DeletionJobStatus, SubscriptionFrequency
+from app.schemas.user import UserCreate
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -33,6 +37,118 @@ def test_get_users_normal_user_me(
     assert current_user["email"] == settings.EMAIL_TEST_USER
 
 
+def test_get_users_me_query_budget(
+    client: TestClient, normal_user_token_headers: dict[str, str], query_budget
+) -> None:
+    with query_budget(2):
+        r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 200
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_get_users_me_dashboard(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/dashboard", headers=normal_user_token_headers
+    )
+    assert r.status_code == 200
+    dashboard = r.json()
+    for widget in (
+        "financial_summary",
+        "expense_summary",
+        "budgets_progress",
+        "accounts",
+        "debts",
+        "subscriptions",
+        "financial_goals",
+    ):
+        assert widget in dashboard
+    assert len(dashboard["expense_summary"]["monthly_summary"]) == 12
+    assert len(dashboard["expense_summary"]["daily_summary"]) == 7
+
+
+def test_get_users_me_upcoming_payments(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    # Two currencies without an exchange rate between them: payments in the
+    # second cannot be added to a total in the first
+    rated = {
+        frozenset(pair)
+        for pair in db.exec(select(ExchangeRate.base_currency_id, ExchangeRate.quote_currency_id)).all()
+    }
+    currency, unrated = next(
+        pair
+        for pair in itertools.permutations(db.exec(select(Currency)).all(), 2)
+        if frozenset(row.id for row in pair) not in rated
+    )
+    default_currency_id, user.default_currency_id = user.default_currency_id, currency.id
+    today = datetime.date.today()
+    suffix = random_lower_string()
+    subscriptions = [
+        Subscription(
+            service_name=f"{name} {suffix}", amount=amount, frequency=SubscriptionFrequency.MONTHLY,
+            next_payment_date=today + datetime.timedelta(days=days), reminder_days=3,
+            user_id=user.id, currency_id=currency.id,
+        )
+        # The reminder of the last one is after the 14 days asked for
+        for name, amount, days in [("Music", 10, 5), ("Storage", 20, 10), ("Gym", 30, 40)]
+    ]
+    debts = [
+        Debt(
+            creditor_name=f"{name} {suffix}", amount=100, minimum_payment=minimum,
+            due_date=today + datetime.timedelta(days=days), is_paid=is_paid,
+            user_id=user.id, currency_id=currency.id,
+        )
+        for name, minimum, days, is_paid in [
+            ("Card", 25, 2, False), ("Loan", 40, -3, False), ("Paid loan", 50, 4, True)
+        ]
+    ]
+    subscriptions.append(
+        Subscription(
+            service_name=f"Abroad {suffix}", amount=5, frequency=SubscriptionFrequency.MONTHLY,
+            next_payment_date=today + datetime.timedelta(days=7), reminder_days=3,
+            user_id=user.id, currency_id=unrated.id,
+        )
+    )
+    db.add_all([user, *subscriptions, *debts])
+    db.commit()
+    try:
+        r = client.get(
+            f"{settings.API_V1_STR}/users/me/upcoming-payments",
+            headers=normal_user_token_headers,
+            params={"days": 14},
+        )
+        assert r.status_code == 200
+        upcoming = r.json()
+        assert upcoming["count"] == len(upcoming["data"])
+        due_dates = [payment["due_date"] for payment in upcoming["data"]]
+        assert due_dates == sorted(due_dates)
+        seeded = [
+            (payment["kind"], payment["name"], payment["amount"], payment["days_until_due"])
+            for payment in upcoming["data"]
+            if payment["name"].endswith(suffix)
+        ]
+        # Overdue debts included, paid ones and reminders past the horizon left out
+        assert seeded == [
+            ("debt", f"Loan {suffix}", 40, -3),
+            ("debt", f"Card {suffix}", 25, 2),
+            ("subscription", f"Music {suffix}", 10, 5),
+            ("subscription", f"Abroad {suffix}", 5, 7),
+            ("subscription", f"Storage {suffix}", 20, 10),
+        ]
+        # The payment in the unrated currency is counted apart, not added as is
+        assert upcoming["unconverted"] == 1
+        assert upcoming["total_amount"] == 95
+    finally:
+        for row in [*subscriptions, *debts]:
+            db.delete(row)
+        user.default_currency_id = default_currency_id
+        db.add(user)
+        db.commit()
+
+
 def test_create_user_new_email(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -402,9 +518,14 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
         f"{settings.API_V1_STR}/users/me",
         headers=headers,
     )
-    assert r.status_code == 200
-    deleted_user = r.json()
-    assert deleted_user["message"] == "User deleted successfully"
+    assert r.status_code == 202
+    job = r.json()
+    assert job["target_type"] == "user"
+    assert job["target_id"] == str(user_id)
+    # The background task ran before the test client returned
+    db_job = db.get(DeletionJob, uuid.UUID(job["id"]))
+    db.refresh(db_job)
+    assert db_job.status == DeletionJobStatus.COMPLETED
     result = db.exec(select(User).where(User.id == user_id)).first()
     assert result is None
 
@@ -437,9 +558,17 @@ def test_delete_user_super_user(
         f"{settings.API_V1_STR}/users/{user_id}",
         headers=superuser_token_headers,
     )
+    assert r.status_code == 202
+    job = r.json()
+    assert job["target_id"] == str(user_id)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/deletion-jobs/{job['id']}",
+        headers=superuser_token_headers,
+    )
     assert r.status_code == 200
-    deleted_user = r.json()
-    assert deleted_user["message"] == "User deleted successfully"
+    assert r.json()["status"] == "completed"
+    assert r.json()["progress"] == 1.0
     result = db.exec(select(User).where(User.id == user_id)).first()
     assert result is None
 
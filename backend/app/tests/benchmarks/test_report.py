@@ -0,0 +1,39 @@
+from app.benchmarks.report import compare_reports, percentile, summarize_latencies
+
+
+def _report(p95_ms: float, queries: int, rows_scanned: int) -> dict:
+    return {
+        "scales": {
+            "1000": {
+                "GET /transactions": {
+                    "p95_ms": p95_ms,
+                    "queries": queries,
+                    "rows_scanned": rows_scanned,
+                }
+            }
+        }
+    }
+
+
+def test_percentile_nearest_rank() -> None:
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_summarize_latencies() -> None:
+    summary = summarize_latencies([4.0, 1.0, 3.0, 2.0])
+    assert summary["p50_ms"] == 2.0
+    assert summary["p95_ms"] == 4.0
+    assert summary["mean_ms"] == 2.5
+
+
+def test_compare_reports_within_thresholds() -> None:
+    assert compare_reports(_report(10.0, 3, 1000), _report(12.0, 3, 1050)) == []
+
+
+def test_compare_reports_flags_regressions() -> None:
+    regressions = compare_reports(_report(10.0, 3, 1000), _report(20.0, 4, 2000))
+    assert len(regressions) == 3
+    assert all(regression.startswith("[1000] GET /transactions") for regression in regressions)
@@ -0,0 +1,15 @@
+import asyncio
+import json
+
+from app.benchmarks.serialization import ENDPOINTS, STRATEGIES, find_route, render
+
+
+def test_strategies_render_the_same_json() -> None:
+    for label, (method, path, response_type, build, before_content) in ENDPOINTS.items():
+        route = find_route(method, path)
+        payload = build(5, 1)
+        bodies = [
+            json.loads(asyncio.run(render(strategy, route, response_type, payload, before_content(payload))))
+            for strategy in STRATEGIES
+        ]
+        assert bodies[0] == bodies[1] == bodies[2], label
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from app.benchmarks.startup import LAZY_MODULES, check_budget
+
+
+def _report(import_ms: float, eager_modules: list[str]) -> dict:
+    return {
+        "phases": {
+            "import_ms": {"p50_ms": import_ms},
+            "first_request_ms": {"p50_ms": 50.0},
+        },
+        "eager_modules": eager_modules,
+    }
+
+
+def test_check_budget_within_budget() -> None:
+    assert check_budget(_report(900.0, []), {"import_ms": 1000, "lifespan_ms": 100}) == []
+
+
+def test_check_budget_flags_slow_phases_and_eager_modules() -> None:
+    violations = check_budget(_report(1200.0, ["emails"]), {"import_ms": 1000, "first_request_ms": 100})
+    assert violations == [
+        "import_ms: p50 1200.0ms > budget 1000.0ms",
+        "emails is imported at startup",
+    ]
+
+
+def test_optional_dependencies_load_lazily() -> None:
+    code = f"import sys, app.main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
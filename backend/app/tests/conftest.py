@@ -1,15 +1,25 @@
-from collections.abc import Generator
+import os
+from collections.abc import Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+from sqlmodel import Session, select
 
-from app.core.config import settings
-from app.core.db import engine, init_db
-from app.main import app
-from app.models import Item, User
-from app.tests.utils.user import authentication_token_from_email
-from app.tests.utils.utils import get_superuser_token_headers
+# Features off by default that the tests cover, enabled before the app reads its settings
+os.environ.setdefault("METRICS_ENABLED", "true")
+os.environ.setdefault("PROFILING_ENABLED", "true")
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import engine, init_db  # noqa: E402
+from app.core.query_stats import QueryStats, capture_queries  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User  # noqa: E402
+from app.tests.utils.user import (  # noqa: E402
+    authentication_token_from_email,
+    delete_user,
+)
+from app.tests.utils.utils import get_superuser_token_headers  # noqa: E402
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -17,10 +27,10 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
-        statement = delete(Item)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
+        # With every row they own, which the API tests leave behind
+        session.rollback()
+        for user_id in session.exec(select(User.id)).all():
+            delete_user(session, user_id)
         session.commit()
 
 
@@ -40,3 +50,24 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """
+    Assert that a block runs at most `budget` SQL statements:
+
+        with query_budget(3):
+            client.get(...)
+    """
+
+    @contextmanager
+    def _query_budget(budget: int) -> Iterator[QueryStats]:
+        with capture_queries() as stats:
+            yield stats
+        statements = "\n".join(statement for statement, _ in stats.statements)
+        assert stats.count <= budget, (
+            f"{stats.count} queries run, budget is {budget}:\n{statements}"
+        )
+
+    return _query_budget
@@ -0,0 +1,58 @@
+import uuid
+from unittest.mock import patch
+
+from app.core.cache import AggregateCache
+
+
+def test_aggregate_cache_hit_and_miss() -> None:
+    cache = AggregateCache(ttl_seconds=60, max_entries=10)
+    key = (uuid.uuid4(), 0, "budget_summary", (2025, 5))
+    assert cache.get(key) is None
+    cache.set(key, {"total_spent": 10})
+    assert cache.get(key) == {"total_spent": 10}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_aggregate_cache_evicts_least_recently_used() -> None:
+    cache = AggregateCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_aggregate_cache_expires_entries() -> None:
+    cache = AggregateCache(ttl_seconds=5, max_entries=10)
+    with patch("app.core.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == 1
+    with patch("app.core.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+
+def test_aggregate_cache_keys_on_data_version() -> None:
+    cache = AggregateCache(ttl_seconds=60, max_entries=10)
+    user_id = uuid.uuid4()
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        return len(calls)
+
+    with patch("app.core.cache.get_user_data_version", return_value=0):
+        for _ in range(2):
+            assert cache.get_or_compute(
+                session=None, user_id=user_id, kind="k", period=1, compute=compute  # type: ignore[arg-type]
+            ) == 1
+    with patch("app.core.cache.get_user_data_version", return_value=1):
+        assert cache.get_or_compute(
+            session=None, user_id=user_id, kind="k", period=1, compute=compute  # type: ignore[arg-type]
+        ) == 2
@@ -0,0 +1,96 @@
+import gzip
+from collections.abc import Iterator
+
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = [{"description": "Groceries", "amount": 12.5, "category": {"name": "Food"}}] * 100
+
+
+def _client(**options: object) -> tuple[TestClient, FastAPI]:
+    app = FastAPI()
+
+    @app.get("/large")
+    def large() -> list[dict[str, object]]:
+        return LARGE
+
+    @app.get("/small")
+    def small() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/text")
+    def text() -> PlainTextResponse:
+        return PlainTextResponse("x" * 5000, media_type="image/png")
+
+    @app.get("/export")
+    def export() -> StreamingResponse:
+        def rows() -> Iterator[bytes]:
+            yield b"date,description,amount\n"
+            for i in range(2000):
+                yield f"2024-01-01,Row {i},{i}.50\n".encode()
+
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, **options)
+    return TestClient(app), app
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_large_json_is_compressed() -> None:
+    client, _ = _client()
+    r = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert r.json() == LARGE
+
+    r = client.get("/large", headers={"Accept-Encoding": "br"})
+    assert r.headers["content-encoding"] == "br"
+    assert r.json() == LARGE
+
+
+def test_small_and_disallowed_responses_are_untouched() -> None:
+    client, _ = _client()
+    r = client.get("/small", headers={"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in r.headers
+    assert r.json() == {"ok": True}
+
+    r = client.get("/text", headers={"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in r.headers
+
+
+def test_streaming_response_is_compressed_chunk_by_chunk() -> None:
+    client, _ = _client()
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        assert "content-length" not in r.headers
+        raw = b"".join(r.iter_raw())
+    body = gzip.decompress(raw).decode()
+    assert body.startswith("date,description,amount\n")
+    assert body.count("\n") == 2001
+
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "br"}) as r:
+        raw = b"".join(r.iter_raw())
+    assert brotli.decompress(raw).decode() == body
+
+
+def test_route_level_override_can_disable_compression() -> None:
+    _, app = _client()
+    route = next(r for r in app.routes if isinstance(r, APIRoute) and r.path == "/large")
+    client, _ = _client(route_levels={route.unique_id: {"gzip": 0}})
+    r = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    r = client.get("/large", headers={"Accept-Encoding": "br"})
+    assert r.headers["content-encoding"] == "br"
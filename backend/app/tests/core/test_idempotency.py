@@ -0,0 +1,194 @@
+import asyncio
+import datetime
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    REPLAYED_HEADER,
+    IdempotencyMiddleware,
+)
+from app.crud.idempotency import claim_idempotency_key, purge_expired_idempotency_keys
+from app.models import IdempotencyKey, User
+
+
+def _transaction(client: TestClient, superuser_token_headers: dict[str, str]) -> dict[str, object]:
+    currencies = client.get(f"{settings.API_V1_STR}/currencies/").json()
+    category = client.post(
+        f"{settings.API_V1_STR}/categories/",
+        headers=superuser_token_headers,
+        json={"name": f"Idempotent {uuid.uuid4().hex[:8]}", "category_type": "expense", "color": "#009688"},
+    ).json()
+    payment_method = client.post(
+        f"{settings.API_V1_STR}/payment-methods/",
+        headers=superuser_token_headers,
+        json={"name": f"Idempotent {uuid.uuid4().hex[:8]}"},
+    ).json()
+    return {
+        "description": "Idempotent coffee",
+        "amount": 3.5,
+        "transaction_type": "expense",
+        "date": "2024-05-01",
+        "currency_id": currencies[0]["id"],
+        "category_id": category["id"],
+        "payment_method_id": payment_method["id"],
+    }
+
+
+def test_retried_transaction_is_created_once(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    transaction = _transaction(client, superuser_token_headers)
+    headers = {**normal_user_token_headers, IDEMPOTENCY_KEY_HEADER: str(uuid.uuid4())}
+
+    first = client.post(f"{settings.API_V1_STR}/transactions", headers=headers, json=transaction)
+    assert first.status_code == 200, first.text
+    assert REPLAYED_HEADER not in first.headers
+
+    retry = client.post(f"{settings.API_V1_STR}/transactions", headers=headers, json=transaction)
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/transactions",
+        headers=normal_user_token_headers,
+        params={"category_id": transaction["category_id"]},
+    )
+    assert r.json()["total"] == 1
+
+    # Same key, other request
+    r = client.post(
+        f"{settings.API_V1_STR}/transactions", headers=headers, json={**transaction, "amount": 4}
+    )
+    assert r.status_code == 422
+
+    # A new key runs the request again
+    headers[IDEMPOTENCY_KEY_HEADER] = str(uuid.uuid4())
+    r = client.post(f"{settings.API_V1_STR}/transactions", headers=headers, json=transaction)
+    assert r.status_code == 200
+    assert r.json()["id"] != first.json()["id"]
+
+
+def test_retried_goal_saving_is_added_once(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/financial-goals/",
+        headers=normal_user_token_headers,
+        json={"name": "Idempotent bike", "target_amount": 500},
+    )
+    assert r.status_code == 200, r.text
+    goal = r.json()
+    headers = {**normal_user_token_headers, IDEMPOTENCY_KEY_HEADER: str(uuid.uuid4())}
+
+    for _ in range(2):
+        r = client.post(
+            f"{settings.API_V1_STR}/financial-goals/{goal['id']}/add-saving",
+            headers=headers,
+            json={"amount": 50},
+        )
+        assert r.status_code == 200, r.text
+        assert r.json()["current_amount"] == 50
+
+    # Errors are replayed too
+    headers[IDEMPOTENCY_KEY_HEADER] = str(uuid.uuid4())
+    missing_goal_id = uuid.uuid4()
+    for _ in range(2):
+        r = client.post(
+            f"{settings.API_V1_STR}/financial-goals/{missing_goal_id}/add-saving",
+            headers=headers,
+            json={"amount": 50},
+        )
+        assert r.status_code == 404
+
+    r = client.post(
+        f"{settings.API_V1_STR}/financial-goals/{goal['id']}/add-saving",
+        headers={**normal_user_token_headers, IDEMPOTENCY_KEY_HEADER: "x" * 256},
+        json={"amount": 50},
+    )
+    assert r.status_code == 400
+
+
+def test_pending_and_expired_keys(db: Session) -> None:
+    user_id = db.exec(select(User.id)).first()
+    key = str(uuid.uuid4())
+
+    assert claim_idempotency_key(session=db, user_id=user_id, key=key, request_hash="a") is None
+    pending = claim_idempotency_key(session=db, user_id=user_id, key=key, request_hash="a")
+    assert pending.status_code is None
+
+    # The first request was lost: once its claim expires, a retry runs
+    pending.expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    db.add(pending)
+    db.commit()
+    assert claim_idempotency_key(session=db, user_id=user_id, key=key, request_hash="a") is None
+
+    pending = db.get(IdempotencyKey, (user_id, key), populate_existing=True)
+    pending.expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    db.add(pending)
+    db.commit()
+    assert purge_expired_idempotency_keys(session=db, batch_size=1) >= 1
+    assert db.get(IdempotencyKey, (user_id, key), populate_existing=True) is None
+
+
+def _things_client() -> tuple[TestClient, list[float]]:
+    """A client of an app creating things behind IdempotencyMiddleware, and the runs of its endpoint."""
+    runs: list[float] = []
+
+    async def create_thing(request: Request) -> JSONResponse:
+        runs.append(time.monotonic())
+        await asyncio.sleep(float(request.query_params.get("seconds", 0)))
+        return JSONResponse(
+            {"id": len(runs)}, status_code=201, headers={"Location": f"/things/{len(runs)}"}
+        )
+
+    app = Starlette(routes=[Route("/things", create_thing, methods=["POST"])])
+    return TestClient(IdempotencyMiddleware(app)), runs
+
+
+def test_replayed_response_keeps_its_headers(superuser_token_headers: dict[str, str]) -> None:
+    client, runs = _things_client()
+    headers = {**superuser_token_headers, IDEMPOTENCY_KEY_HEADER: str(uuid.uuid4())}
+
+    first = client.post("/things", headers=headers)
+    retry = client.post("/things", headers=headers)
+
+    assert len(runs) == 1
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["location"] == first.headers["location"] == "/things/1"
+    assert retry.headers["content-type"] == "application/json"
+    assert retry.headers[REPLAYED_HEADER] == "true"
+
+
+def test_long_request_keeps_its_key_claimed(superuser_token_headers: dict[str, str]) -> None:
+    client, runs = _things_client()
+    headers = {**superuser_token_headers, IDEMPOTENCY_KEY_HEADER: str(uuid.uuid4())}
+    responses = []
+
+    with patch("app.core.config.settings.IDEMPOTENCY_PENDING_SECONDS", 0.3):
+        first = threading.Thread(
+            target=lambda: responses.append(client.post("/things", headers=headers, params={"seconds": 1}))
+        )
+        first.start()
+        # Well past IDEMPOTENCY_PENDING_SECONDS, the first request renews its claim
+        time.sleep(0.7)
+        retry = client.post("/things", headers=headers, params={"seconds": 1})
+        first.join()
+
+    assert retry.status_code == 409
+    assert len(runs) == 1
+    assert responses[0].status_code == 201
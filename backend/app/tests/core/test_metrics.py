@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_metrics_endpoint_reports_requests_by_route(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 200
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert 'http_requests_total{method="GET",route="users-read_user_me",status="200"}' in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert "http_request_db_queries_bucket" in body
+    assert "db_pool_connections_checked_out" in body
+
+
+def test_unmatched_paths_share_one_series(client: TestClient) -> None:
+    client.get("/this/path/does/not/exist")
+    r = client.get("/metrics")
+    assert 'route="unmatched",status="404"' in r.text
+    assert "/this/path/does/not/exist" not in r.text
+
+
+def test_metrics_token_is_required_when_set(client: TestClient) -> None:
+    with patch("app.core.config.settings.METRICS_TOKEN", "scrape-secret"):
+        assert client.get("/metrics").status_code == 401
+        r = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        assert r.status_code == 401
+        r = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert r.status_code == 200
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import (
+    PROFILE_ID_HEADER,
+    fold_stacks,
+    new_profile_id,
+    profile_path,
+)
+
+
+def test_fold_stacks_counts_identical_stacks() -> None:
+    stacks = [("main:run", "app:handler"), ("main:run", "app:handler"), ("main:run",)]
+    assert fold_stacks(stacks) == "main:run 1\nmain:run;app:handler 2\n"
+
+
+def test_profile_path_rejects_malformed_ids() -> None:
+    assert profile_path(new_profile_id()) is not None
+    assert profile_path("../../etc/passwd") is None
+
+
+def test_superuser_request_is_profiled(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers=superuser_token_headers,
+        params={"profile": "1"},
+    )
+    assert r.status_code == 200
+    profile_id = r.headers[PROFILE_ID_HEADER]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/profiles/{profile_id}", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert r.text.startswith("# GET /api/v1/users/me")
+
+    r = client.get(f"{settings.API_V1_STR}/utils/profiles/", headers=superuser_token_headers)
+    assert profile_id in r.json()
+
+
+def test_profile_flag_is_ignored_for_normal_users(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={**normal_user_token_headers, "X-Profile": "1"},
+    )
+    assert r.status_code == 200
+    assert PROFILE_ID_HEADER not in r.headers
+
+    r = client.get(f"{settings.API_V1_STR}/utils/profiles/", headers=normal_user_token_headers)
+    assert r.status_code == 403
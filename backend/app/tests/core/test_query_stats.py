@@ -0,0 +1,48 @@
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DataError
+
+from app.core.db import engine
+from app.core.query_stats import QueryStats, capture_queries, parameter_shape
+
+
+def test_parameter_shape_hides_values() -> None:
+    shape = parameter_shape({"user_id_1": uuid.uuid4(), "date_1": datetime.date.today(), "param_1": 10})
+    assert shape == {"user_id_1": "UUID", "date_1": "date", "param_1": "int"}
+
+
+def test_parameter_shape_executemany() -> None:
+    assert parameter_shape([{"id": 1}, {"id": 2}]) == "2 x {'id': 'int'}"
+    assert parameter_shape(("a", 1.5)) == ["str", "float"]
+
+
+def test_query_stats_add() -> None:
+    stats = QueryStats(record_statements=True)
+    stats.add("SELECT 1", {"p": 1}, False, 2.0)
+    stats.add("INSERT INTO t VALUES (%(p)s)", [{"p": 1}], True, 3.0)
+    assert stats.count == 2
+    assert stats.duration_ms == 5.0
+    assert stats.statements == [("SELECT 1", {"p": 1}), ("INSERT INTO t VALUES (%(p)s)", None)]
+
+
+def test_capture_queries_unregisters_on_exit() -> None:
+    from app.core import query_stats
+
+    with capture_queries() as stats:
+        assert stats in query_stats._captures
+    assert stats not in query_stats._captures
+
+
+def test_failed_statement_leaves_no_start_time() -> None:
+    with engine.connect() as conn:
+        with pytest.raises(DataError):
+            conn.execute(text("SELECT 1 / 0"))
+        conn.rollback()
+        assert conn.info["query_started_at"] == []
+        with capture_queries() as stats:
+            conn.execute(text("SELECT 1"))
+        assert stats.count == 1
+        assert conn.info["query_started_at"] == []
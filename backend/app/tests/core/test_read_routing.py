@@ -0,0 +1,135 @@
+import datetime
+import time
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlmodel import Session
+
+from app.api import deps
+from app.core.config import settings
+from app.core.read_routing import (
+    PRIMARY_PIN_COOKIE,
+    ReadYourWritesMiddleware,
+    reads_from_replica,
+)
+from app.models import User
+from app.tests.utils.utils import random_lower_string
+
+
+def test_reads_from_replica() -> None:
+    assert reads_from_replica("GET", None, {})
+    assert not reads_from_replica("POST", None, {})
+    assert not reads_from_replica("GET", None, {PRIMARY_PIN_COOKIE: str(time.time() + 5)})
+    assert reads_from_replica("GET", None, {PRIMARY_PIN_COOKIE: str(time.time() - 5)})
+    assert reads_from_replica("GET", None, {PRIMARY_PIN_COOKIE: "garbage"})
+
+
+def test_recent_writes_keep_reads_on_the_primary() -> None:
+    now = datetime.datetime.now()
+    with patch("app.core.read_routing.settings.READ_YOUR_WRITES_SECONDS", 5):
+        assert not reads_from_replica("GET", now - datetime.timedelta(seconds=4), {})
+        assert reads_from_replica("GET", now - datetime.timedelta(seconds=6), {})
+
+
+def test_successful_writes_set_the_pin_cookie() -> None:
+    app = FastAPI()
+
+    @app.get("/read")
+    def read() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/write")
+    def write(fail: bool = False) -> dict[str, bool]:
+        if fail:
+            raise HTTPException(status_code=400, detail="Invalid")
+        return {"ok": True}
+
+    app.add_middleware(ReadYourWritesMiddleware)
+    client = TestClient(app)
+
+    assert PRIMARY_PIN_COOKIE not in client.get("/read").cookies
+    assert PRIMARY_PIN_COOKIE not in client.post("/write", params={"fail": True}).cookies
+    written_at = time.time()
+    r = client.post("/write")
+    pinned_until = float(r.cookies[PRIMARY_PIN_COOKIE])
+    assert written_at < pinned_until < time.time() + settings.READ_YOUR_WRITES_SECONDS + 1
+    assert "HttpOnly" in r.headers["set-cookie"]
+
+
+@pytest.fixture
+def replica_statements(monkeypatch: pytest.MonkeyPatch) -> Generator[list[str], None, None]:
+    """
+    Route the read endpoints to a stand-in replica: a read-only engine on the test
+    database, recording the statements it runs.
+    """
+    replica = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), execution_options={"postgresql_readonly": True}
+    )
+    statements: list[str] = []
+
+    @event.listens_for(replica, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    monkeypatch.setattr(deps, "replica_engine", replica)
+    yield statements
+    replica.dispose()
+
+
+def _age_last_write(db: Session, email: str) -> None:
+    db.exec(
+        update(User)
+        .where(User.email == email)
+        .values(data_changed_at=datetime.datetime.now() - datetime.timedelta(minutes=1))
+    )
+    db.commit()
+
+
+def test_reads_go_to_the_replica_until_the_user_writes(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    replica_statements: list[str],
+    db: Session,
+) -> None:
+    _age_last_write(db, settings.EMAIL_TEST_USER)
+    r = client.get(f"{settings.API_V1_STR}/users/me/summary", headers=normal_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert replica_statements
+
+    currencies = client.get(f"{settings.API_V1_STR}/currencies/").json()
+    name = f"Replica {random_lower_string()}"
+    replica_statements.clear()
+    r = client.post(
+        f"{settings.API_V1_STR}/accounts/",
+        headers=normal_user_token_headers,
+        json={"name": name, "account_type": "bank", "currency_id": currencies[0]["id"]},
+    )
+    assert r.status_code == 201, r.text
+    assert not replica_statements
+    # A client without cookies, as another worker would see it
+    client.cookies.clear()
+
+    # Pinned to the primary, which already has the new account
+    r = client.get(f"{settings.API_V1_STR}/users/me/dashboard", headers=normal_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert name in [account["name"] for account in r.json()["accounts"]]
+    assert not replica_statements
+
+    _age_last_write(db, settings.EMAIL_TEST_USER)
+    r = client.get(f"{settings.API_V1_STR}/transactions/export", headers=normal_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert replica_statements
+
+    # A write that leaves the user's data alone, carried by the cookie
+    replica_statements.clear()
+    client.cookies.set(PRIMARY_PIN_COOKIE, str(time.time() + 5))
+    try:
+        r = client.get(f"{settings.API_V1_STR}/users/me/summary", headers=normal_user_token_headers)
+    finally:
+        client.cookies.delete(PRIMARY_PIN_COOKIE)
+    assert r.status_code == 200, r.text
+    assert not replica_statements
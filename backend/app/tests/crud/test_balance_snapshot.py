@@ -0,0 +1,171 @@
+import datetime
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session, delete, select
+
+from app.crud.balance_snapshot import (
+    backfill_balance_snapshots,
+    get_balance_history,
+    get_balance_on,
+    get_net_worth_series,
+    refresh_balance_snapshots,
+)
+from app.crud.transaction import (
+    create_transaction,
+    delete_transaction,
+    update_transaction,
+)
+from app.models import Account, AccountBalanceSnapshot, Transaction
+from app.models.enums import AccountType, TransactionType
+from app.schemas.balance_snapshot import BalanceInterval
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+THROUGH = datetime.date(2024, 3, 31)
+
+
+@pytest.fixture
+def account(db: Session) -> Generator[Account, None, None]:
+    ledger = create_ledger(db, label="Snapshot")
+    account = Account(
+        name="Checking",
+        account_type=AccountType.BANK,
+        balance=0,
+        user_id=ledger.user_id,
+        currency_id=ledger.currency.id,
+    )
+    db.add(account)
+    db.flush()
+    # (date, amount, type, is_active); nothing in February
+    for day, amount, transaction_type, is_active in [
+        (datetime.date(2024, 1, 5), 1000, TransactionType.INCOME, True),
+        (datetime.date(2024, 1, 20), 200, TransactionType.EXPENSE, True),
+        (datetime.date(2024, 1, 25), 999, TransactionType.EXPENSE, False),
+        (datetime.date(2024, 1, 31), 50, TransactionType.TRANSFER, True),
+        (datetime.date(2024, 3, 10), 300, TransactionType.EXPENSE, True),
+        (datetime.date(2024, 4, 2), 40, TransactionType.EXPENSE, True),
+    ]:
+        db.add(
+            ledger.transaction(
+                day, amount, transaction_type, is_active=is_active, account_id=account.id
+            )
+        )
+    db.commit()
+    yield account
+    # refresh_balance_snapshots covers the accounts of every user
+    db.exec(delete(AccountBalanceSnapshot))
+    db.commit()
+    delete_ledger(db, ledger)
+
+
+def _snapshots(db: Session, account: Account) -> list[tuple[datetime.date, float]]:
+    return [
+        (snapshot.snapshot_date, snapshot.balance)
+        for snapshot in db.exec(
+            select(AccountBalanceSnapshot)
+            .where(AccountBalanceSnapshot.account_id == account.id)
+            .order_by(AccountBalanceSnapshot.snapshot_date)
+        ).all()
+    ]
+
+
+def test_backfill_writes_a_running_balance_per_month(db: Session, account: Account) -> None:
+    written = backfill_balance_snapshots(session=db, through=THROUGH, account_ids=[account.id])
+    db.commit()
+
+    assert written == 3
+    assert _snapshots(db, account) == [
+        (datetime.date(2024, 1, 31), 800),
+        (datetime.date(2024, 2, 29), 800),
+        (datetime.date(2024, 3, 31), 500),
+    ]
+    assert get_balance_on(session=db, account_id=account.id, on=datetime.date(2023, 12, 31)) == 0
+    assert get_balance_on(session=db, account_id=account.id, on=datetime.date(2024, 1, 19)) == 1000
+    assert get_balance_on(session=db, account_id=account.id, on=datetime.date(2024, 3, 9)) == 800
+    assert get_balance_on(session=db, account_id=account.id, on=datetime.date(2024, 4, 30)) == 460
+
+
+def test_transaction_writes_keep_snapshots_current(db: Session, account: Account) -> None:
+    backfill_balance_snapshots(session=db, through=THROUGH, account_ids=[account.id])
+    db.commit()
+    template = db.exec(select(Transaction).where(Transaction.account_id == account.id)).first()
+
+    transaction = create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            date=datetime.date(2024, 2, 10),
+            description="Snapshot",
+            amount=100,
+            transaction_type=TransactionType.EXPENSE,
+            currency_id=template.currency_id,
+            category_id=template.category_id,
+            payment_method_id=template.payment_method_id,
+            account_id=account.id,
+        ),
+        user_id=account.user_id,
+    )
+    assert [balance for _, balance in _snapshots(db, account)] == [800, 700, 400]
+
+    # Moved to March and turned into income: -100 in February becomes +100 in March
+    update_transaction(
+        session=db,
+        db_transaction=transaction,
+        transaction_in=TransactionUpdate(
+            date=datetime.date(2024, 3, 1), transaction_type=TransactionType.INCOME
+        ),
+    )
+    assert [balance for _, balance in _snapshots(db, account)] == [800, 800, 600]
+
+    delete_transaction(session=db, db_transaction=transaction)
+    assert [balance for _, balance in _snapshots(db, account)] == [800, 800, 500]
+
+
+def test_refresh_rebuilds_accounts_that_are_behind(db: Session, account: Account) -> None:
+    backfill_balance_snapshots(
+        session=db, through=datetime.date(2024, 1, 31), account_ids=[account.id]
+    )
+    db.commit()
+
+    refresh_balance_snapshots(session=db, as_of=datetime.date(2024, 4, 15))
+    assert _snapshots(db, account)[-1] == (THROUGH, 500)
+
+    # Up to date: nothing to rebuild for this account
+    assert refresh_balance_snapshots(session=db, as_of=datetime.date(2024, 4, 15)) == 0
+
+
+def test_history_and_net_worth_use_snapshot_plus_delta(db: Session, account: Account) -> None:
+    backfill_balance_snapshots(session=db, through=THROUGH, account_ids=[account.id])
+    db.commit()
+
+    history = get_balance_history(
+        session=db,
+        account=account,
+        date_from=datetime.date(2024, 3, 30),
+        date_to=datetime.date(2024, 4, 2),
+    )
+    assert history.opening_balance == 500
+    assert history.balances == [500, 500, 500, 460]
+
+    series = get_net_worth_series(
+        session=db,
+        user_id=account.user_id,
+        date_from=datetime.date(2024, 1, 10),
+        date_to=datetime.date(2024, 4, 15),
+        interval=BalanceInterval.MONTH,
+    )
+    assert series.dates == [
+        datetime.date(2024, 1, 31),
+        datetime.date(2024, 2, 29),
+        datetime.date(2024, 3, 31),
+        datetime.date(2024, 4, 15),
+    ]
+    assert series.net_worth == [800, 800, 500, 460]
+
+    with pytest.raises(ValueError):
+        get_net_worth_series(
+            session=db,
+            user_id=account.user_id,
+            date_from=datetime.date(2024, 4, 15),
+            date_to=datetime.date(2024, 1, 10),
+        )
@@ -0,0 +1,23 @@
+import datetime
+
+from sqlmodel import Session
+
+from app.crud.debt import get_debt_with_details
+from app.models import Debt
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+
+def test_debt_details_report_the_debt_as_just_settled(db: Session) -> None:
+    ledger = create_ledger(db, label="Debt details")
+    debt = Debt(creditor_name="Bank", amount=100, user_id=ledger.user_id, currency_id=ledger.currency.id)
+    db.add(debt)
+    db.flush()
+    for day in (1, 2):
+        db.add(ledger.transaction(datetime.date(2024, 1, day), 50, debt_id=debt.id))
+    db.commit()
+
+    details = get_debt_with_details(session=db, debt_id=debt.id, user_id=ledger.user_id)
+
+    assert details is not None
+    assert (details.paid_amount, details.remaining_amount, details.is_paid) == (100, 0, True)
+    delete_ledger(db, ledger)
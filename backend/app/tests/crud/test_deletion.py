@@ -0,0 +1,135 @@
+import datetime
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session, select
+
+from app.crud.account import has_related_entities
+from app.crud.deletion import (
+    STALE_JOB_AFTER,
+    create_account_deletion_job,
+    create_user_deletion_job,
+    resume_deletion_jobs,
+    run_deletion_job,
+)
+from app.models import (
+    Account,
+    AccountBalanceSnapshot,
+    Debt,
+    Subscription,
+    Transaction,
+    User,
+)
+from app.models.enums import AccountType, DeletionJobStatus, SubscriptionFrequency
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+
+@pytest.fixture
+def accounts(db: Session) -> Generator[tuple[Account, Account], None, None]:
+    """
+    Two accounts of a user: checking with 12 expenses, a balance snapshot, a debt
+    and a subscription; savings with one payment of each of the latter.
+    """
+    ledger = create_ledger(db, label="Deletion")
+    user_id, currency_id = ledger.user_id, ledger.currency.id
+    checking, savings = (
+        Account(name=name, account_type=AccountType.BANK, balance=0, user_id=user_id, currency_id=currency_id)
+        for name in ("Checking", "Savings")
+    )
+    db.add_all([checking, savings])
+    db.flush()
+    debt = Debt(
+        creditor_name="Bank", amount=100, user_id=user_id, currency_id=currency_id, account_id=checking.id
+    )
+    subscription = Subscription(
+        service_name="Streaming", amount=10, frequency=SubscriptionFrequency.MONTHLY,
+        next_payment_date=datetime.date(2024, 2, 1), user_id=user_id, currency_id=currency_id,
+        account_id=checking.id,
+    )
+    db.add_all([debt, subscription])
+    db.add(
+        AccountBalanceSnapshot(
+            account_id=checking.id, user_id=user_id, snapshot_date=datetime.date(2024, 1, 31), balance=-120
+        )
+    )
+    db.flush()
+
+    def expense(day: int, account: Account, **links: object) -> Transaction:
+        return ledger.transaction(
+            datetime.date(2024, 1, day), 10, description=f"Deletion {day}", account_id=account.id, **links
+        )
+
+    db.add_all([expense(day, checking) for day in range(1, 13)])
+    db.add_all([expense(13, savings, debt_id=debt.id), expense(14, savings, subscription_id=subscription.id)])
+    db.commit()
+    yield checking, savings
+    delete_ledger(db, ledger)
+
+
+def test_account_deletion_runs_in_batches_and_detaches_other_accounts(
+    db: Session, accounts: tuple[Account, Account]
+) -> None:
+    checking, savings = accounts
+    checking_id, user_id = checking.id, checking.user_id
+    assert has_related_entities(db, checking_id)
+    assert not has_related_entities(db, savings.id)
+
+    job = create_account_deletion_job(session=db, account=checking, requested_by=user_id)
+    assert job.status == DeletionJobStatus.PENDING
+    # Asking again while it is pending returns the same job
+    assert create_account_deletion_job(session=db, account=checking, requested_by=user_id).id == job.id
+
+    job = run_deletion_job(session=db, job_id=job.id, batch_size=5)
+
+    assert job.status == DeletionJobStatus.COMPLETED
+    assert job.finished_at is not None
+    # 2 detached payments, 12 transactions, a snapshot, a debt, a subscription and the account
+    assert job.total_rows == job.deleted_rows == 18
+    db.expire_all()
+    assert db.get(Account, checking_id) is None
+    assert db.exec(select(Debt).where(Debt.account_id == checking_id)).all() == []
+    assert db.exec(select(AccountBalanceSnapshot).where(AccountBalanceSnapshot.account_id == checking_id)).all() == []
+    kept = db.exec(select(Transaction).where(Transaction.account_id == savings.id)).all()
+    assert len(kept) == 2
+    assert all(t.debt_id is None and t.subscription_id is None for t in kept)
+
+    # A finished job is not run again
+    assert run_deletion_job(session=db, job_id=job.id) is None
+
+
+def test_user_deletion_deactivates_then_deletes_everything(
+    db: Session, accounts: tuple[Account, Account]
+) -> None:
+    checking, _ = accounts
+    user = db.get(User, checking.user_id)
+    user_id = user.id
+
+    job = create_user_deletion_job(session=db, user=user, requested_by=user_id)
+    assert not db.get(User, user_id).is_active
+
+    job = run_deletion_job(session=db, job_id=job.id, batch_size=4)
+
+    assert job.status == DeletionJobStatus.COMPLETED
+    # 14 transactions, a snapshot, a subscription, a debt, 2 accounts and the user
+    assert job.deleted_rows == 20
+    db.expire_all()
+    assert db.get(User, user_id) is None
+    assert db.exec(select(Transaction).where(Transaction.user_id == user_id)).all() == []
+
+
+def test_resume_runs_abandoned_jobs(db: Session, accounts: tuple[Account, Account]) -> None:
+    checking, savings = accounts
+    fresh = create_account_deletion_job(session=db, account=savings, requested_by=savings.user_id)
+    abandoned = create_account_deletion_job(session=db, account=checking, requested_by=checking.user_id)
+    abandoned.status = DeletionJobStatus.RUNNING
+    abandoned.updated_at = datetime.datetime.now() - STALE_JOB_AFTER - datetime.timedelta(minutes=1)
+    db.add(abandoned)
+    db.commit()
+
+    assert resume_deletion_jobs(session=db) >= 1
+
+    db.refresh(abandoned)
+    db.refresh(fresh)
+    assert abandoned.status == DeletionJobStatus.COMPLETED
+    # Jobs just scheduled are left to the background task that scheduled them
+    assert fresh.status == DeletionJobStatus.PENDING
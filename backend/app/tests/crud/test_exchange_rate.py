@@ -0,0 +1,79 @@
+import datetime
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session, select
+
+from app.crud.analytics import get_spending_analytics
+from app.crud.exchange_rate import delete_exchange_rate, upsert_exchange_rate
+from app.crud.summary import get_monthly_expense_summary
+from app.crud.user import get_user_financial_summary
+from app.models import Currency, ExchangeRate
+from app.models.enums import CurrencyCode, TransactionType
+from app.schemas.analytics import AnalyticsDimension
+from app.schemas.exchange_rate import ExchangeRateCreate
+from app.tests.utils.ledger import Ledger, create_ledger, delete_ledger
+
+SPENT_ON = datetime.date(2023, 3, 15)
+
+
+@pytest.fixture
+def ledger(db: Session) -> Generator[Ledger, None, None]:
+    """
+    A user reporting in USD with expenses of 100 USD, 100 EUR and 50 ARS and an
+    income of 200 EUR in March 2023. EUR has a rate into USD from March 1st and
+    another one from April, ARS none.
+    """
+    currencies = {currency.code: currency for currency in db.exec(select(Currency)).all()}
+    usd, eur, ars = (currencies[code] for code in (CurrencyCode.USD, CurrencyCode.EUR, CurrencyCode.ARS))
+    ledger = create_ledger(db, label="Rates")
+    ledger.user.default_currency_id = usd.id
+    db.add_all(
+        [
+            ledger.transaction(SPENT_ON, 100, currency_id=usd.id),
+            ledger.transaction(SPENT_ON, 100, currency_id=eur.id),
+            ledger.transaction(SPENT_ON, 50, currency_id=ars.id),
+            ledger.transaction(SPENT_ON, 200, TransactionType.INCOME, currency_id=eur.id),
+        ]
+    )
+    db.commit()
+    rates = [
+        upsert_exchange_rate(
+            session=db,
+            rate_in=ExchangeRateCreate(
+                base_currency_id=eur.id, quote_currency_id=usd.id, rate=rate, rate_date=rate_date
+            ),
+        )
+        for rate, rate_date in [(1.25, datetime.date(2023, 3, 1)), (2.0, datetime.date(2023, 4, 1))]
+    ]
+    yield ledger
+    for rate in rates:
+        delete_exchange_rate(session=db, db_rate=db.get(ExchangeRate, rate.id))
+    delete_ledger(db, ledger)
+
+
+def test_aggregates_convert_at_the_rate_of_the_transaction_date(db: Session, ledger: Ledger) -> None:
+    # 100 USD + 100 EUR at 1.25, the April rate not being in force yet; ARS has no rate
+    march = get_monthly_expense_summary(db, ledger.user_id, 2023)[2]
+    assert march.total_expenses == 225
+
+    summary = get_user_financial_summary(session=db, user=ledger.user)
+    assert summary["cumulative_expenses"] == 225
+    assert summary["cumulative_income"] == 250
+    assert summary["unconverted_transactions"] == 1
+
+    analytics = get_spending_analytics(
+        session=db, user_id=ledger.user_id, group_by=[AnalyticsDimension.CURRENCY]
+    )
+    by_currency = dict(
+        zip(
+            analytics.data["currency"],
+            zip(analytics.data["expense"], analytics.data["income"], analytics.data["unconverted"], strict=True),
+            strict=True,
+        )
+    )
+    assert by_currency == {
+        CurrencyCode.USD: (100, 0, 0),
+        CurrencyCode.EUR: (125, 250, 0),
+        CurrencyCode.ARS: (0, 0, 1),
+    }
@@ -0,0 +1,102 @@
+import datetime
+from collections.abc import Generator
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from app.crud.forecast import get_cash_flow_forecast, recurring_dates
+from app.models import Account, Debt, Subscription, Transaction, User
+from app.models.enums import AccountType, SubscriptionFrequency, TransactionType
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+TODAY = datetime.date(2024, 5, 15)
+
+
+@pytest.fixture
+def user_with_plans(db: Session) -> Generator[User, None, None]:
+    ledger = create_ledger(db, label="Forecast")
+    user, currency = ledger.user, ledger.currency
+    account = Account(
+        name="Checking",
+        account_type=AccountType.BANK,
+        balance=1000,
+        is_default=True,
+        user_id=user.id,
+        currency_id=currency.id,
+    )
+    subscription = Subscription(
+        service_name="Music",
+        amount=10,
+        frequency=SubscriptionFrequency.MONTHLY,
+        next_payment_date=datetime.date(2024, 5, 20),
+        user_id=user.id,
+        currency_id=currency.id,
+    )
+    db.add_all([account, subscription])
+    db.flush()
+    db.add_all([
+        # Overdue: paid on Jun 1 and Jul 1 (the rest)
+        Debt(
+            creditor_name="Bank", amount=500, remaining_amount=150, minimum_payment=100,
+            due_date=datetime.date(2024, 5, 1), user_id=user.id, currency_id=currency.id,
+            account_id=account.id,
+        ),
+        # One installment left, on May 31
+        Debt(
+            creditor_name="Store", amount=100, remaining_amount=100, minimum_payment=20,
+            due_date=datetime.date(2024, 5, 31), is_installment=True, total_installments=5,
+            remaining_installments=1, user_id=user.id, currency_id=currency.id,
+            account_id=account.id,
+        ),
+    ])
+
+    def transaction(day: datetime.date, amount: float, transaction_type: TransactionType, **extra: object) -> Transaction:
+        return ledger.transaction(day, amount, transaction_type, account_id=account.id, **extra)
+
+    db.add_all([
+        # A salary on the 1st of each of the last 3 months
+        *(transaction(datetime.date(2024, month, 1), 3000, TransactionType.INCOME) for month in (3, 4, 5)),
+        # 300 spent on the 31st once in 3 months: 100 on the last day of every month
+        transaction(datetime.date(2024, 3, 31), 300, TransactionType.EXPENSE),
+        # Subscription charges are projected from the subscription, not from history
+        transaction(datetime.date(2024, 4, 20), 999, TransactionType.EXPENSE, subscription_id=subscription.id),
+        # Older than the history window
+        transaction(datetime.date(2024, 1, 10), 5000, TransactionType.EXPENSE),
+    ])
+    db.commit()
+    yield user
+    delete_ledger(db, ledger)
+
+
+def test_recurring_dates_clamp_to_month_end() -> None:
+    dates = recurring_dates(
+        np.array(["2024-01-31", "2023-11-30"], dtype="datetime64[D]"), np.array([1, 3]), 4
+    )
+    assert dates.astype(str).tolist() == [
+        ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"],
+        ["2023-11-30", "2024-02-29", "2024-05-30", "2024-08-30"],
+    ]
+    # An anchor already clamped to February goes back to its day of month
+    dates = recurring_dates(np.array(["2024-02-29"], dtype="datetime64[D]"), np.array([1]), 3, np.array([31]))
+    assert dates.astype(str).tolist() == [["2024-02-29", "2024-03-31", "2024-04-30"]]
+
+
+def test_forecast_projects_recurring_items_and_history(db: Session, user_with_plans: User) -> None:
+    forecast = get_cash_flow_forecast(session=db, user_id=user_with_plans.id, months=2, today=TODAY)
+
+    assert forecast.start_date == datetime.date(2024, 5, 16)
+    assert forecast.end_date == datetime.date(2024, 7, 15)
+    assert len(forecast.dates) == 61
+    [account] = forecast.accounts
+    assert len(account.balances) == len(forecast.dates)
+    # Salary on Jun 1 and Jul 1
+    assert account.projected_income == 6000
+    # Subscription (May 20, Jun 20), debts (100 + 50, 20) and usual month-end expenses (May 31, Jun 30)
+    assert account.projected_expenses == 20 + 150 + 20 + 200
+    assert account.balances[-1] == 1000 + 6000 - 390
+    assert account.lowest_balance == 1000 - 10 - 20 - 100
+    assert account.lowest_balance_date == datetime.date(2024, 5, 31)
+    balance_on = dict(zip(forecast.dates, account.balances, strict=True))
+    assert balance_on[datetime.date(2024, 5, 20)] == 990
+    assert balance_on[datetime.date(2024, 6, 1)] == 870 + 3000 - 100
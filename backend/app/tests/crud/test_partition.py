@@ -0,0 +1,104 @@
+import datetime
+import re
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import Select, text
+from sqlmodel import Session, delete, func, select
+
+from app.crud.budget import month_expense_conditions
+from app.crud.partition import (
+    DEFAULT_PARTITION,
+    PARTITION_NAME_PATTERN,
+    ensure_transaction_partitions,
+    get_transaction_partitions,
+    transaction_partition_name,
+)
+from app.crud.transaction import description_search, transaction_conditions
+from app.models import Transaction, User
+from app.schemas.transaction import TransactionFilters
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+OLD_YEAR = 1990
+
+
+@pytest.fixture
+def old_transaction(db: Session) -> Generator[Transaction, None, None]:
+    ledger = create_ledger(db, label="Partition")
+    transaction = ledger.transaction(
+        datetime.date(OLD_YEAR, 5, 1), 10, description="Partitioned rent"
+    )
+    db.add(transaction)
+    db.commit()
+    yield transaction
+    db.exec(delete(Transaction).where(Transaction.user_id == ledger.user_id))
+    db.exec(text(f"DROP TABLE IF EXISTS {transaction_partition_name(OLD_YEAR)}"))
+    db.commit()
+    delete_ledger(db, ledger)
+
+
+def _partition_of(db: Session, transaction: Transaction) -> str:
+    return db.exec(
+        text('SELECT tableoid::regclass::text FROM "transaction" WHERE id = :id'),
+        params={"id": transaction.id},
+    ).one()[0]
+
+
+def test_ensure_partitions_moves_rows_out_of_the_default_partition(
+    db: Session, old_transaction: Transaction
+) -> None:
+    assert _partition_of(db, old_transaction) == DEFAULT_PARTITION
+    next_year = datetime.date.today().year + 1
+
+    created = ensure_transaction_partitions(session=db)
+
+    assert transaction_partition_name(OLD_YEAR) in created
+    partitions = get_transaction_partitions(session=db)
+    assert transaction_partition_name(next_year) in partitions
+    assert _partition_of(db, old_transaction) == transaction_partition_name(OLD_YEAR)
+    # Still found through the parent, generated search column included
+    matches_rent, _ = description_search("rent")
+    [found] = db.exec(
+        select(Transaction).where(Transaction.id == old_transaction.id, matches_rent)
+    ).all()
+    assert found.amount == 10
+
+    assert ensure_transaction_partitions(session=db) == []
+
+
+def _scanned_partitions(db: Session, statement: Select) -> set[str]:
+    compiled = statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = "\n".join(db.exec(text(f"EXPLAIN {compiled}")).scalars())
+    return {
+        name for name in re.findall(r"\b(transaction_\w+)", plan) if PARTITION_NAME_PATTERN.match(name)
+    }
+
+
+def test_date_bounded_queries_scan_a_single_partition(db: Session) -> None:
+    year = datetime.date.today().year
+    ensure_transaction_partitions(session=db)
+    statement = select(func.sum(Transaction.amount)).where(
+        *transaction_conditions(
+            user_id=db.exec(select(User.id)).first(),
+            filters=TransactionFilters(
+                date_from=datetime.date(year, 1, 1), date_to=datetime.date(year, 3, 31)
+            ),
+        )
+    )
+
+    assert _scanned_partitions(db, statement) == {transaction_partition_name(year)}
+
+
+def test_budget_month_queries_scan_a_single_partition(db: Session) -> None:
+    year = datetime.date.today().year
+    ensure_transaction_partitions(session=db)
+    statement = (
+        select(Transaction.category_id, func.sum(Transaction.amount))
+        .where(
+            *month_expense_conditions(user_id=db.exec(select(User.id)).first(), year=year, month=12),
+            Transaction.category_id.isnot(None),
+        )
+        .group_by(Transaction.category_id)
+    )
+
+    assert _scanned_partitions(db, statement) == {transaction_partition_name(year)}
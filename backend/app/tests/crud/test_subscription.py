@@ -0,0 +1,111 @@
+import datetime
+from collections.abc import Generator
+
+import numpy as np
+import pytest
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.crud.forecast import recurring_dates
+from app.crud.subscription import create_subscription, renew_due_subscriptions
+from app.models import Account, Subscription, Transaction
+from app.models.enums import AccountType, SubscriptionFrequency
+from app.schemas.subscription import SubscriptionCreate
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+AS_OF = datetime.date(2024, 4, 30)
+
+
+@pytest.fixture
+def subscriptions(db: Session) -> Generator[tuple[Subscription, Subscription], None, None]:
+    """A monthly subscription billed on the 31st from Jan 31 and a quarterly one from Feb 15, on two accounts."""
+    ledger = create_ledger(db, label="Renewal")
+    checking, savings = (
+        Account(
+            name=name, account_type=AccountType.BANK, balance=0,
+            user_id=ledger.user_id, currency_id=ledger.currency.id,
+        )
+        for name in ("Checking", "Savings")
+    )
+    db.add_all([checking, savings])
+    db.commit()
+    monthly, quarterly = (
+        create_subscription(
+            session=db,
+            subscription_in=SubscriptionCreate(
+                service_name=name, amount=amount, frequency=frequency, next_payment_date=first,
+                currency_id=ledger.currency.id, account_id=account.id,
+            ),
+            user_id=ledger.user_id,
+        )
+        for name, amount, frequency, first, account in [
+            ("Music", 10, SubscriptionFrequency.MONTHLY, datetime.date(2024, 1, 31), checking),
+            ("Storage", 25, SubscriptionFrequency.QUARTERLY, datetime.date(2024, 2, 15), savings),
+        ]
+    )
+    yield monthly, quarterly
+    delete_ledger(db, ledger)
+
+
+def _charges(db: Session, subscription: Subscription) -> list[datetime.date]:
+    return list(
+        db.exec(
+            select(Transaction.date)
+            .where(Transaction.subscription_id == subscription.id)
+            .order_by(Transaction.date)
+        ).all()
+    )
+
+
+def _balance(db: Session, subscription: Subscription) -> float:
+    return db.exec(select(Account.balance).where(Account.id == subscription.account_id)).one()
+
+
+def test_renewal_catches_up_missed_periods_on_the_billing_day(
+    db: Session, subscriptions: tuple[Subscription, Subscription]
+) -> None:
+    monthly, quarterly = subscriptions
+
+    created = renew_due_subscriptions(session=db, as_of=AS_OF, batch_size=1)
+
+    assert created >= 5
+    charged = _charges(db, monthly)
+    assert charged == [
+        datetime.date(2024, 1, 31),
+        datetime.date(2024, 2, 29),
+        datetime.date(2024, 3, 31),
+        datetime.date(2024, 4, 30),
+    ]
+    # The same dates as the cash flow forecast projects
+    projected = recurring_dates(np.array([charged[0]], dtype="datetime64[D]"), np.array([1]), 4)
+    assert [day.item() for day in projected[0]] == charged
+    assert _charges(db, quarterly) == [datetime.date(2024, 2, 15)]
+    assert _balance(db, monthly) == -40
+    assert _balance(db, quarterly) == -25
+    db.refresh(monthly)
+    db.refresh(quarterly)
+    assert monthly.next_payment_date == datetime.date(2024, 5, 31)
+    assert quarterly.next_payment_date == datetime.date(2024, 5, 15)
+
+    # Nothing is due any more: running again charges nothing twice
+    assert renew_due_subscriptions(session=db, as_of=AS_OF) == 0
+    assert len(_charges(db, monthly)) == 4
+    assert _balance(db, monthly) == -40
+
+
+def test_renewal_skips_subscriptions_locked_by_another_transaction(
+    db: Session, subscriptions: tuple[Subscription, Subscription]
+) -> None:
+    monthly, quarterly = subscriptions
+
+    with Session(engine) as other:
+        other.exec(select(Subscription).where(Subscription.id == monthly.id).with_for_update()).one()
+        renew_due_subscriptions(session=db, as_of=AS_OF)
+        assert _charges(db, monthly) == []
+        assert _charges(db, quarterly) == [datetime.date(2024, 2, 15)]
+        other.rollback()
+
+    renew_due_subscriptions(session=db, as_of=AS_OF)
+    assert len(_charges(db, monthly)) == 4
+    assert _balance(db, monthly) == -40
+    assert _balance(db, quarterly) == -25
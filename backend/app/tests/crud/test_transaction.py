@@ -0,0 +1,146 @@
+import datetime
+import uuid
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app import crud
+from app.models.category import Category
+from app.models.enums import TransactionType
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.schemas.transaction import TransactionFilters
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+DESCRIPTIONS = [
+    "Netflix subscription",
+    "Netflox typo shop",
+    "Groceries at the market",
+    "Coffee with Ana",
+    None,
+]
+
+
+@pytest.fixture
+def user_with_transactions(db: Session) -> Generator[User, None, None]:
+    ledger = create_ledger(db, label="Search")
+    for day, description in enumerate(DESCRIPTIONS, start=1):
+        db.add(ledger.transaction(datetime.date(2024, 5, day), 10 * day, description=description))
+    db.commit()
+    yield ledger.user
+    delete_ledger(db, ledger)
+
+
+def _descriptions(db: Session, user_id: uuid.UUID, search: str) -> list[str | None]:
+    transactions = crud.get_transactions(
+        session=db, user_id=user_id, filters=TransactionFilters(search=search)
+    )
+    return [transaction.description for transaction in transactions]
+
+
+def test_search_matches_words_partial_words_and_typos(
+    db: Session, user_with_transactions: User
+) -> None:
+    user_id = user_with_transactions.id
+    assert _descriptions(db, user_id, "netflix")[0] == "Netflix subscription"
+    assert "Netflix subscription" in _descriptions(db, user_id, "netf")
+    assert "Netflix subscription" in _descriptions(db, user_id, "netlfix subscription")
+    assert _descriptions(db, user_id, "market groceries") == ["Groceries at the market"]
+    assert _descriptions(db, user_id, "rent") == []
+    assert crud.get_transaction_count(
+        session=db, user_id=user_id, filters=TransactionFilters(search="netflix")
+    ) == len(_descriptions(db, user_id, "netflix"))
+
+
+def test_search_ranks_exact_words_first(db: Session, user_with_transactions: User) -> None:
+    assert _descriptions(db, user_with_transactions.id, "netflix") == [
+        "Netflix subscription",
+        "Netflox typo shop",
+    ]
+
+
+@pytest.mark.usefixtures("user_with_transactions")
+def test_search_is_served_by_the_description_indexes(db: Session) -> None:
+    condition, _ = crud.transaction.description_search("netflix")
+    statement = select(Transaction.id).where(condition)
+    compiled = statement.compile(db.get_bind())
+    connection = db.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = "\n".join(
+        connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars()
+    )
+    db.rollback()
+
+    def used(index_name: str) -> bool:
+        # The table is partitioned: the plan names the indexes of the partitions
+        partition_indexes = db.exec(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:index_name AS regclass)"
+            ),
+            params={"index_name": index_name},
+        ).scalars()
+        return any(name in plan for name in partition_indexes)
+
+    assert used("ix_transaction_description_search")
+    assert used("ix_transaction_description_trgm")
+
+
+def test_filters_combine_ranges_and_ids(db: Session, user_with_transactions: User) -> None:
+    user_id = user_with_transactions.id
+    category_id = db.exec(
+        select(Transaction.category_id).where(Transaction.user_id == user_id)
+    ).first()
+
+    def amounts(filters: TransactionFilters) -> list[float]:
+        transactions = crud.get_transactions(session=db, user_id=user_id, filters=filters)
+        assert crud.get_transaction_count(
+            session=db, user_id=user_id, filters=filters
+        ) == len(transactions)
+        return sorted(transaction.amount for transaction in transactions)
+
+    assert amounts(
+        TransactionFilters(date_from=datetime.date(2024, 5, 2), date_to=datetime.date(2024, 5, 4))
+    ) == [20, 30, 40]
+    assert amounts(TransactionFilters(amount_min=25, amount_max=45)) == [30, 40]
+    assert amounts(TransactionFilters(category_ids=[category_id, uuid.uuid4()], amount_max=10)) == [10]
+    assert amounts(TransactionFilters(category_ids=[uuid.uuid4()])) == []
+    assert len(amounts(TransactionFilters(payment_method_ids=[uuid.uuid4()]))) == 0
+    assert len(amounts(TransactionFilters(is_active=True))) == len(DESCRIPTIONS)
+    assert amounts(TransactionFilters(transaction_type=TransactionType.INCOME)) == []
+
+
+def test_category_name_filter_uses_a_subquery(db: Session, user_with_transactions: User) -> None:
+    user_id = user_with_transactions.id
+    category = db.exec(
+        select(Category).join(Transaction).where(Transaction.user_id == user_id)
+    ).first()
+    filters = TransactionFilters(category_name=category.name)
+    assert crud.get_transaction_count(session=db, user_id=user_id, filters=filters) == len(
+        DESCRIPTIONS
+    )
+    statement = select(Transaction.id).where(
+        *crud.transaction.transaction_conditions(user_id=user_id, filters=filters)
+    )
+    sql = str(statement.compile(db.get_bind()))
+    assert "JOIN" not in sql
+    assert "transaction.category_id IN (SELECT category.id" in sql
+
+
+def test_iter_transaction_rows_yields_export_columns(
+    db: Session, user_with_transactions: User
+) -> None:
+    rows = list(
+        crud.transaction.iter_transaction_rows(
+            session=db,
+            user_id=user_with_transactions.id,
+            filters=TransactionFilters(amount_min=40),
+            batch_size=1,
+        )
+    )
+    assert [row.date for row in rows] == [datetime.date(2024, 5, 5), datetime.date(2024, 5, 4)]
+    assert rows[1].description == "Coffee with Ana"
+    assert rows[1].category.startswith("Search ")
+    assert rows[1].account is None
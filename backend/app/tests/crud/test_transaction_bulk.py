@@ -0,0 +1,189 @@
+import datetime
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.query_stats import QueryStats
+from app.crud.account import calculate_account_balance
+from app.crud.balance_snapshot import backfill_balance_snapshots, get_balance_on
+from app.crud.transaction import (
+    bulk_delete_transactions,
+    bulk_update_transactions,
+    update_transaction,
+)
+from app.models import Account, Debt, Transaction
+from app.models.enums import AccountType, TransactionType
+from app.schemas.transaction import (
+    TransactionFilters,
+    TransactionSelection,
+    TransactionUpdate,
+)
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+SNAPSHOT_DATE = datetime.date(2024, 1, 31)
+
+
+@pytest.fixture
+def accounts(db: Session) -> Generator[tuple[Account, Account, Debt], None, None]:
+    """Two accounts of a user, the first with 20 expenses of 10, the last 5 paying a debt of 100."""
+    ledger = create_ledger(db, label="Bulk")
+    user_id, currency_id = ledger.user_id, ledger.currency.id
+    checking, savings = (
+        Account(name=name, account_type=AccountType.BANK, balance=0, user_id=user_id, currency_id=currency_id)
+        for name in ("Checking", "Savings")
+    )
+    debt = Debt(creditor_name="Bank", amount=100, user_id=user_id, currency_id=currency_id)
+    db.add_all([checking, savings, debt])
+    db.flush()
+    for day in range(1, 21):
+        db.add(
+            ledger.transaction(
+                datetime.date(2024, 1, day), 10, description=f"Bulk {day}",
+                account_id=checking.id, debt_id=debt.id if day > 15 else None,
+            )
+        )
+    checking.balance = -200
+    debt.paid_amount = 50
+    db.commit()
+    backfill_balance_snapshots(session=db, through=SNAPSHOT_DATE, account_ids=[checking.id, savings.id])
+    db.commit()
+    yield checking, savings, debt
+    delete_ledger(db, ledger)
+
+
+def _refreshed(db: Session, *rows):
+    return [db.get(type(row), row.id, populate_existing=True) for row in rows]
+
+
+def test_bulk_update_moves_balances_and_debts(
+    db: Session,
+    accounts: tuple[Account, Account, Debt],
+    query_budget: Callable[[int], AbstractContextManager[QueryStats]],
+) -> None:
+    checking, savings, debt = accounts
+    ids = db.exec(
+        select(Transaction.id).where(Transaction.account_id == checking.id, Transaction.date >= datetime.date(2024, 1, 11))
+    ).all()
+
+    # The same statements whatever the number of transactions
+    with query_budget(8):
+        count = bulk_update_transactions(
+            session=db,
+            user_id=checking.user_id,
+            selection=TransactionSelection(ids=ids),
+            transaction_in=TransactionUpdate(account_id=savings.id, debt_id=None),
+        )
+
+    assert count == 10
+    checking, savings, debt = _refreshed(db, checking, savings, debt)
+    assert checking.balance == -100 == calculate_account_balance(db, checking.id)
+    assert savings.balance == -100 == calculate_account_balance(db, savings.id)
+    assert get_balance_on(session=db, account_id=checking.id, on=SNAPSHOT_DATE) == -100
+    assert get_balance_on(session=db, account_id=savings.id, on=SNAPSHOT_DATE) == -100
+    assert (debt.paid_amount, debt.remaining_amount, debt.payment_progress, debt.is_paid) == (0, 100, 0, False)
+
+    # Turning expenses into incomes moves the balance by twice their amount
+    count = bulk_update_transactions(
+        session=db,
+        user_id=checking.user_id,
+        selection=TransactionSelection(
+            filters=TransactionFilters(account_ids=[savings.id], date_to=datetime.date(2024, 1, 12))
+        ),
+        transaction_in=TransactionUpdate(transaction_type=TransactionType.INCOME, debt_id=debt.id),
+    )
+    assert count == 2
+    savings, debt = _refreshed(db, savings, debt)
+    assert savings.balance == -60 == calculate_account_balance(db, savings.id)
+    assert (debt.paid_amount, debt.payment_progress) == (20, 20)
+
+
+def test_bulk_delete_by_filters(db: Session, accounts: tuple[Account, Account, Debt]) -> None:
+    checking, _, debt = accounts
+
+    count = bulk_delete_transactions(
+        session=db,
+        user_id=checking.user_id,
+        selection=TransactionSelection(filters=TransactionFilters(date_from=datetime.date(2024, 1, 14))),
+    )
+
+    assert count == 7
+    checking, debt = _refreshed(db, checking, debt)
+    assert checking.balance == -130 == calculate_account_balance(db, checking.id)
+    assert get_balance_on(session=db, account_id=checking.id, on=SNAPSHOT_DATE) == -130
+    assert (debt.paid_amount, debt.remaining_amount, debt.payment_progress) == (0, 100, 0)
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"is_active": False},
+        {"transaction_type": TransactionType.TRANSFER},
+        {"transaction_type": TransactionType.INCOME, "amount": 25},
+        {"account_id": "savings", "is_active": False},
+    ],
+)
+def test_single_and_bulk_updates_move_balances_alike(
+    db: Session, accounts: tuple[Account, Account, Debt], changes: dict
+) -> None:
+    checking, savings, _ = accounts
+    if changes.get("account_id") == "savings":
+        changes = {**changes, "account_id": savings.id}
+    transactions = db.exec(
+        select(Transaction).where(Transaction.account_id == checking.id, Transaction.date <= datetime.date(2024, 1, 5))
+    ).all()
+    ids = [transaction.id for transaction in transactions]
+
+    # One at a time, as PATCH /transactions/{id} does...
+    for transaction in transactions:
+        update_transaction(session=db, db_transaction=transaction, transaction_in=TransactionUpdate(**changes))
+    checking, savings = _refreshed(db, checking, savings)
+    single = (checking.balance, savings.balance)
+    assert single == (calculate_account_balance(db, checking.id), calculate_account_balance(db, savings.id))
+
+    # ...back to where they were in bulk...
+    bulk_update_transactions(
+        session=db,
+        user_id=checking.user_id,
+        selection=TransactionSelection(ids=ids),
+        transaction_in=TransactionUpdate(
+            is_active=True, transaction_type=TransactionType.EXPENSE, amount=10, account_id=checking.id
+        ),
+    )
+    checking, savings = _refreshed(db, checking, savings)
+    assert (checking.balance, savings.balance) == (-200, 0)
+
+    # ...and the same changes in bulk land on the same balances
+    bulk_update_transactions(
+        session=db,
+        user_id=checking.user_id,
+        selection=TransactionSelection(ids=ids),
+        transaction_in=TransactionUpdate(**changes),
+    )
+    checking, savings = _refreshed(db, checking, savings)
+    assert (checking.balance, savings.balance) == single
+    assert get_balance_on(session=db, account_id=checking.id, on=SNAPSHOT_DATE) == single[0]
+
+
+def test_bulk_operations_validate_their_input(db: Session, accounts: tuple[Account, Account, Debt]) -> None:
+    checking, _, _ = accounts
+    other_user_account = db.exec(select(Account).where(Account.user_id != checking.user_id)).first()
+    with pytest.raises(ValueError):
+        bulk_delete_transactions(session=db, user_id=checking.user_id, selection=TransactionSelection())
+    with pytest.raises(ValueError):
+        bulk_update_transactions(
+            session=db,
+            user_id=checking.user_id,
+            selection=TransactionSelection(filters=TransactionFilters()),
+            transaction_in=TransactionUpdate(),
+        )
+    if other_user_account:
+        with pytest.raises(ValueError):
+            bulk_update_transactions(
+                session=db,
+                user_id=checking.user_id,
+                selection=TransactionSelection(filters=TransactionFilters()),
+                transaction_in=TransactionUpdate(account_id=other_user_account.id),
+            )
+    assert calculate_account_balance(db, checking.id) == -200
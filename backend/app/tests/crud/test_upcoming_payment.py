@@ -0,0 +1,87 @@
+import datetime
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session
+
+from app.crud.upcoming_payment import iter_payment_reminders, mark_reminders_sent
+from app.models import Debt, Subscription
+from app.models.enums import SubscriptionFrequency
+from app.tests.utils.ledger import Ledger, create_ledger, delete_ledger
+
+TODAY = datetime.date(2024, 3, 10)
+
+
+@pytest.fixture
+def ledger(db: Session) -> Generator[Ledger, None, None]:
+    """
+    A user with five subscriptions whose reminder is due by TODAY (one since the
+    day before, as if that run was missed), one whose reminder is tomorrow, and a
+    debt due in two days.
+    """
+    ledger = create_ledger(db, label="Reminder")
+    due_in_days = [2, 3, 3, 3, 3, 4]
+    db.add_all(
+        Subscription(
+            service_name=f"Service {index}", amount=10, frequency=SubscriptionFrequency.MONTHLY,
+            next_payment_date=TODAY + datetime.timedelta(days=days), reminder_days=3,
+            user_id=ledger.user_id, currency_id=ledger.currency.id,
+        )
+        for index, days in enumerate(due_in_days)
+    )
+    db.add(
+        Debt(
+            creditor_name="Bank", amount=100, due_date=TODAY + datetime.timedelta(days=2),
+            user_id=ledger.user_id, currency_id=ledger.currency.id,
+        )
+    )
+    db.commit()
+    yield ledger
+    delete_ledger(db, ledger)
+
+
+def _reminders(db: Session, ledger: Ledger, page_size: int) -> list[list[tuple[str, datetime.date]]]:
+    """The pages of reminders of the ledger's user as (name, reminder date)."""
+    pages = [
+        [
+            (payment.name, payment.reminder_date)
+            for payment, _ in page
+            if payment.user_id == ledger.user_id
+        ]
+        for page in iter_payment_reminders(session=db, today=TODAY, page_size=page_size)
+    ]
+    return [page for page in pages if page]
+
+
+def test_reminders_are_paged_by_reminder_date(db: Session, ledger: Ledger) -> None:
+    reminders = [reminder for page in _reminders(db, ledger, page_size=2) for reminder in page]
+
+    # Every due reminder once, subscriptions in keyset order then debts, the one
+    # missed yesterday included
+    names = [name for name, _ in reminders]
+    assert len(names) == len(set(names)) == 6
+    assert names[0] == "Service 0"
+    assert set(names[1:5]) == {"Service 1", "Service 2", "Service 3", "Service 4"}
+    assert names[5] == "Bank"
+    assert [reminder_date for _, reminder_date in reminders[:5]] == [
+        TODAY - datetime.timedelta(days=1), TODAY, TODAY, TODAY, TODAY
+    ]
+    assert len(_reminders(db, ledger, page_size=2)) >= 3
+
+
+def test_sent_reminders_are_not_sent_again(db: Session, ledger: Ledger) -> None:
+    payments = [
+        payment
+        for page in iter_payment_reminders(session=db, today=TODAY, page_size=100)
+        for payment, _ in page
+        if payment.user_id == ledger.user_id
+    ]
+    delivered, failed = payments[:-2], payments[-2:]
+
+    mark_reminders_sent(session=db, payments=delivered)
+
+    # Only those that failed are left, for the next run
+    left = [reminder for page in _reminders(db, ledger, page_size=100) for reminder in page]
+    assert left == [(payment.name, payment.reminder_date) for payment in failed]
+    mark_reminders_sent(session=db, payments=failed)
+    assert _reminders(db, ledger, page_size=100) == []
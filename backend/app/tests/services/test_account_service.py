@@ -0,0 +1,30 @@
+import datetime
+
+from sqlmodel import Session
+
+from app.core.cache import aggregate_cache, get_user_data_version
+from app.crud.account import calculate_account_balance
+from app.models import Account
+from app.models.enums import AccountType
+from app.services.account_service import AccountService
+from app.tests.utils.ledger import create_ledger, delete_ledger
+
+
+def test_get_account_caches_the_reconciled_balance(db: Session) -> None:
+    ledger = create_ledger(db, label="Account service")
+    account = Account(
+        name="Drifted", account_type=AccountType.BANK, balance=0,
+        user_id=ledger.user_id, currency_id=ledger.currency.id,
+    )
+    db.add(account)
+    db.flush()
+    db.add(ledger.transaction(datetime.date(2024, 1, 1), 10, account_id=account.id))
+    db.commit()
+
+    details = AccountService.get_account(db=db, account_id=account.id, user_id=ledger.user_id)
+
+    assert details["balance"] == calculate_account_balance(db, account.id) != 0
+    # Cached under the version the balance correction left
+    version = get_user_data_version(session=db, user_id=ledger.user_id)
+    assert aggregate_cache.get((ledger.user_id, version, "account_details", account.id)) == details
+    delete_ledger(db, ledger)
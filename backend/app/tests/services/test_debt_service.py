@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from app.services.debt_service import simulate_payoff
+
+# A small balance without interest and a large one at 24% a year
+BALANCES = np.array([300.0, 1000.0])
+RATES = np.array([0.0, 24.0])
+MINIMUMS = np.array([30.0, 50.0])
+
+
+def test_simulate_payoff_puts_extra_payments_in_priority_order() -> None:
+    avalanche = simulate_payoff(BALANCES, RATES, MINIMUMS, np.array([1, 0]), 200)
+    snowball = simulate_payoff(BALANCES, RATES, MINIMUMS, np.array([0, 1]), 200)
+
+    assert avalanche.payments[0].tolist() == [30, 170]
+    assert snowball.payments[0].tolist() == [150, 50]
+    assert avalanche.interest[0].tolist() == snowball.interest[0].tolist() == [0, 20]
+    for simulation in (avalanche, snowball):
+        assert simulation.paid_off
+        assert simulation.balances[-1].tolist() == [0, 0]
+        # Whatever is paid covers the balances and the interest, and the budget is used in full
+        assert simulation.payments.sum() == pytest.approx(BALANCES.sum() + simulation.interest.sum())
+        assert np.allclose(simulation.payments[:-1].sum(axis=1), 200)
+    # The small debt is paid off in 2 months with snowball, its minimum then rolls over
+    assert snowball.balances[1, 0] == 0
+    assert snowball.payments[2].tolist() == [0, 200]
+    assert avalanche.interest.sum() < snowball.interest.sum()
+
+
+def test_simulate_payoff_requires_the_minimum_payments() -> None:
+    with pytest.raises(ValueError):
+        simulate_payoff(BALANCES, RATES, MINIMUMS, np.array([1, 0]), 79)
+
+
+def test_simulate_payoff_stops_when_interest_outgrows_payments() -> None:
+    simulation = simulate_payoff(
+        np.array([1000.0]), np.array([120.0]), np.array([50.0]), np.array([0]), 50, max_months=24
+    )
+    assert not simulation.paid_off
+    assert len(simulation.payments) == 24
+    assert simulation.balances[-1, 0] > 1000
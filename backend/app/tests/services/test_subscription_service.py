@@ -0,0 +1,23 @@
+from datetime import date
+
+from app.models.enums import SubscriptionFrequency
+from app.services.subscription_service import advance_payment_date
+
+
+def test_advance_payment_date_monthly() -> None:
+    assert advance_payment_date(date(2024, 1, 15), SubscriptionFrequency.MONTHLY) == date(2024, 2, 15)
+    assert advance_payment_date(date(2024, 12, 15), SubscriptionFrequency.MONTHLY) == date(2025, 1, 15)
+
+
+def test_advance_payment_date_clamps_end_of_month() -> None:
+    assert advance_payment_date(date(2024, 1, 31), SubscriptionFrequency.MONTHLY) == date(2024, 2, 29)
+    assert advance_payment_date(date(2023, 11, 30), SubscriptionFrequency.QUARTERLY) == date(2024, 2, 29)
+
+
+def test_advance_payment_date_yearly() -> None:
+    assert advance_payment_date(date(2024, 2, 29), SubscriptionFrequency.YEARLY) == date(2025, 2, 28)
+
+
+def test_advance_payment_date_keeps_billing_day() -> None:
+    assert advance_payment_date(date(2024, 2, 29), SubscriptionFrequency.MONTHLY, 31) == date(2024, 3, 31)
+    assert advance_payment_date(date(2024, 3, 31), SubscriptionFrequency.MONTHLY, 31) == date(2024, 4, 30)
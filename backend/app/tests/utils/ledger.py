@@ -0,0 +1,89 @@
+import datetime
+import uuid
+from dataclasses import dataclass
+
+from sqlmodel import Session, delete, select
+
+from app.models import Category, Currency, PaymentMethod, Transaction, User
+from app.models.enums import CategoryType, TransactionType
+from app.tests.utils.user import delete_user
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+@dataclass
+class Ledger:
+    """A user of their own with the category and payment method their transactions use."""
+
+    user: User
+    currency: Currency
+    categories: list[Category]
+    payment_method: PaymentMethod
+    # Kept apart from `user`, whose attributes can't be loaded once a test deletes it
+    user_id: uuid.UUID
+
+    @property
+    def category(self) -> Category:
+        return self.categories[0]
+
+    def transaction(
+        self,
+        date: datetime.date,
+        amount: float,
+        transaction_type: TransactionType = TransactionType.EXPENSE,
+        **fields: object,
+    ) -> Transaction:
+        """A transaction of the user, not added to the session, in the first category unless given."""
+        values = {
+            "category_id": self.category.id,
+            "payment_method_id": self.payment_method.id,
+            "currency_id": self.currency.id,
+            **fields,
+        }
+        return Transaction(
+            date=date, amount=amount, transaction_type=transaction_type, user_id=self.user_id, **values
+        )
+
+
+def create_ledger(db: Session, *, label: str, categories: int = 1) -> Ledger:
+    """
+    Add (and flush, without committing) a user named after `label`, with `categories`
+    expense categories and a payment method of their own.
+    """
+    currency = db.exec(select(Currency)).first()
+    user = User(
+        email=random_email(),
+        hashed_password=random_lower_string(),
+        first_name=label,
+        last_name="Test",
+        default_currency_id=currency.id,
+    )
+    category_rows = [
+        Category(
+            name=f"{label} {random_lower_string()}",
+            category_type=CategoryType.EXPENSE,
+            color="#000000",
+        )
+        for _ in range(categories)
+    ]
+    payment_method = PaymentMethod(name=f"{label} {random_lower_string()}")
+    db.add_all([user, *category_rows, payment_method])
+    db.flush()
+    return Ledger(
+        user=user,
+        currency=currency,
+        categories=category_rows,
+        payment_method=payment_method,
+        user_id=user.id,
+    )
+
+
+def delete_ledger(db: Session, ledger: Ledger) -> None:
+    """
+    Delete the user with every row they own (whatever a test left of them), their
+    categories and payment method. Changes not committed yet are rolled back first.
+    """
+    db.rollback()
+    delete_user(db, ledger.user_id)
+    db.exec(delete(Category).where(Category.id.in_([category.id for category in ledger.categories])))
+    db.exec(delete(PaymentMethod).where(PaymentMethod.id == ledger.payment_method.id))
+    db.commit()
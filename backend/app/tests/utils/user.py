@@ -1,9 +1,13 @@
+import uuid
+
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, delete
 
 from app import crud
 from app.core.config import settings
-from app.models import User, UserCreate, UserUpdate
+from app.crud.deletion import user_deletion_steps
+from app.models import DeletionJob, User
+from app.schemas.user import UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -22,7 +26,7 @@ def user_authentication_headers(
 def create_random_user(db: Session) -> User:
     email = random_email()
     password = random_lower_string()
-    user_in = UserCreate(email=email, password=password)
+    user_in = UserCreate(email=email, password=password, first_name="Test", last_name="User")
     user = crud.create_user(session=db, user_create=user_in)
     return user
 
@@ -38,12 +42,19 @@ def authentication_token_from_email(
     password = random_lower_string()
     user = crud.get_user_by_email(session=db, email=email)
     if not user:
-        user_in_create = UserCreate(email=email, password=password)
+        user_in_create = UserCreate(email=email, password=password, first_name="Test", last_name="User")
         user = crud.create_user(session=db, user_create=user_in_create)
     else:
-        user_in_update = UserUpdate(password=password)
+        user_in_update = UserUpdate(email=email, password=password)
         if not user.id:
             raise Exception("User id not set")
         user = crud.update_user(session=db, db_user=user, user_in=user_in_update)
 
     return user_authentication_headers(client=client, email=email, password=password)
+
+
+def delete_user(db: Session, user_id: uuid.UUID) -> None:
+    """Delete a user with every row they own and the deletion jobs they asked for, without committing."""
+    db.exec(delete(DeletionJob).where(DeletionJob.requested_by == user_id))
+    for step in user_deletion_steps(user_id):
+        db.exec(delete(step.model).where(step.condition))
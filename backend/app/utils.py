@@ -1,12 +1,10 @@
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
@@ -23,6 +21,10 @@ class EmailData:
 
 
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
+    # Imported on first use, like emails below: most workers never send an email,
+    # and these imports would otherwise weigh on every startup
+    from jinja2 import Template
+
     template_str = (
         Path(__file__).parent / "email-templates" / "build" / template_name
     ).read_text()
@@ -37,6 +39,8 @@ def send_email(
     html_content: str = "",
 ) -> None:
     assert settings.emails_enabled, "no provided configuration for email variables"
+    import emails  # type: ignore
+
     message = emails.Message(
         subject=subject,
         html=html_content,
@@ -100,6 +104,25 @@ def generate_new_account_email(
     return EmailData(html_content=html_content, subject=subject)
 
 
+def generate_payment_reminder_email(
+    email_to: str, name: str, amount: float, due_date: date
+) -> EmailData:
+    project_name = settings.PROJECT_NAME
+    subject = f"{project_name} - Upcoming payment: {name}"
+    html_content = render_email_template(
+        template_name="payment_reminder.html",
+        context={
+            "project_name": settings.PROJECT_NAME,
+            "email": email_to,
+            "name": name,
+            "amount": f"{amount:,.2f}",
+            "due_date": due_date.isoformat(),
+            "link": settings.FRONTEND_HOST,
+        },
+    )
+    return EmailData(html_content=html_content, subject=subject)
+
+
 def generate_password_reset_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.now(timezone.utc)
@@ -0,0 +1,7 @@
+#! /usr/bin/env bash
+
+set -e
+set -x
+
+# Seeds synthetic data: point it at a disposable database
+python -m app.benchmarks.api "$@"
@@ -9,5 +9,8 @@ python app/backend_pre_start.py
 # Run migrations
 alembic upgrade head
 
+# Create the transaction partitions of the coming year
+python app/maintain_partitions.py
+
 # Create initial data in DB
 python app/initial_data.py
\ No newline at end of file